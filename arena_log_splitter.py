@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Arena Log Splitter
+
+Materializes every ARENA_MATCH_START..ARENA_MATCH_END segment of a session log as its
+own small combat log, so analyses open one match (a few MB) instead of re-finding it
+inside a multi-GB session log.
+
+Each segment file starts with the session's COMBAT_LOG_VERSION header and the latest
+pre-match SPELL_SUMMON line of every player (pets summoned before the gates opened),
+followed by the segment's lines unchanged. Files are named like a combat log after the
+segment's start time (WoWCombatLog-050625_182642.txt), so the split directory can be
+passed anywhere a Logs directory is expected.
+
+segments_manifest.csv in the output directory links each segment file to its source
+log, byte range, arena info and - when an enhanced index is given - the video filename
+whose match the production parser resolves to that segment.
+
+Usage:
+  python arena_log_splitter.py --logs-dir Logs --output-dir Logs/Segments
+  python arena_log_splitter.py --logs-dir Logs --output-dir Logs/Segments --index master_index_enhanced.csv
+"""
+
+import argparse
+import csv
+import os
+import sys
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from arena_segment_catalog import get_segment_catalog
+from combat_log_io import find_combat_logs, open_combat_log
+from development_standards import SafeLogger
+
+
+MANIFEST_NAME = 'segments_manifest.csv'
+MANIFEST_COLUMNS = [
+    'segment_file', 'filename', 'log_file', 'log_size', 'log_mtime', 'start_time', 'end_time',
+    'duration', 'zone_id', 'bracket', 'start_offset', 'end_offset'
+]
+
+# Boundary search padding per matching reliability (same as the production parser)
+RELIABILITY_TIME_WINDOWS = {'high': 30, 'medium': 120, 'low': 300}
+
+
+def segment_file_name(segment: Dict, taken: set) -> str:
+    """Combat-log style file name for a segment, unique within the output directory."""
+    stem = segment['start_time'].strftime('WoWCombatLog-%m%d%y_%H%M%S')
+    name = f"{stem}.txt"
+    suffix = 2
+    while name in taken:
+        name = f"{stem}-{suffix}.txt"
+        suffix += 1
+    taken.add(name)
+    return name
+
+
+def split_log_segments(log_file: Path, output_dir: Path, taken: set) -> List[Dict]:
+    """
+    Write every complete arena segment of a log to its own file in a single read.
+
+    Returns one manifest row per segment written.
+    """
+    log_file = Path(log_file)
+    catalog = get_segment_catalog(log_file)
+    segments = [segment for segment in catalog.segments if segment['end_offset'] is not None]
+    if not segments:
+        return []
+
+    pending = sorted(segments, key=lambda segment: segment['start_offset'])
+    rows = []
+    active = []           # (segment, file handle)
+    header = b''
+    summons: Dict[bytes, bytes] = {}   # summoning player GUID -> latest SPELL_SUMMON line
+
+    offset = 0
+    with open_combat_log(log_file, 'rb') as f:
+        for raw_line in f:
+            while pending and pending[0]['start_offset'] <= offset:
+                segment = pending.pop(0)
+                name = segment_file_name(segment, taken)
+                out = open(output_dir / name, 'wb')
+                out.write(header)
+                out.writelines(summons.values())
+                active.append((segment, out))
+                rows.append(_manifest_row(segment, name, catalog))
+
+            for _, out in active:
+                out.write(raw_line)
+
+            # Tracked on every line - a pet summoned during one match is still out in the next
+            if b'COMBAT_LOG_VERSION' in raw_line:
+                header = raw_line
+                summons = {}
+            elif b'SPELL_SUMMON' in raw_line:
+                source_guid = raw_line.split(b',', 2)[1] if raw_line.count(b',') >= 2 else b''
+                if source_guid.startswith(b'Player-'):
+                    summons.pop(source_guid, None)
+                    summons[source_guid] = raw_line
+
+            offset += len(raw_line)
+            if active:
+                still_active = []
+                for segment, out in active:
+                    if offset >= segment['end_offset']:
+                        out.close()
+                    else:
+                        still_active.append((segment, out))
+                active = still_active
+
+            if not active and not pending:
+                break
+
+    for _, out in active:
+        out.close()
+    return rows
+
+
+def _manifest_row(segment: Dict, segment_file: str, catalog) -> Dict:
+    return {
+        'segment_file': segment_file,
+        'filename': '',
+        'log_file': catalog.log_file.name,
+        'log_size': catalog.log_size,
+        'log_mtime': catalog.log_mtime,
+        'start_time': segment['start_time'].isoformat(),
+        'end_time': segment['end_time'].isoformat(),
+        'duration': segment['duration'],
+        'zone_id': segment['zone_id'],
+        'bracket': segment['bracket'],
+        'start_offset': segment['start_offset'],
+        'end_offset': segment['end_offset']
+    }
+
+
+def link_videos_to_segments(rows: List[Dict], index_csv: str, log_files: List[Path], parser) -> int:
+    """
+    Fill each row's 'filename' with the video whose match the production parser resolves
+    to that segment. Returns the number of linked videos.
+    """
+    index_df = pd.read_csv(index_csv)
+    index_df = parser._clean_timestamps_in_df(index_df)
+    index_df = index_df.dropna(subset=['precise_start_time'])
+
+    rows_by_start = {(row['log_file'], row['start_time']): row for row in rows}
+    linked = 0
+
+    for _, match in index_df.iterrows():
+        log_file = parser.find_combat_log_for_match(match, log_files)
+        if log_file is None:
+            continue
+
+        match_start = match['precise_start_time']
+        match_duration = float(match.get('duration_s', 300))
+        time_window = RELIABILITY_TIME_WINDOWS.get(str(match.get('matching_reliability', '')).lower(), 300)
+        buffer = timedelta(seconds=time_window)
+
+        try:
+            arena_start, _ = parser.find_verified_arena_boundaries(
+                log_file, match_start - buffer, match_start + timedelta(seconds=match_duration) + buffer,
+                match_start, match['filename'], match_duration
+            )
+        except Exception:
+            continue
+
+        row = rows_by_start.get((log_file.name, arena_start.isoformat())) if arena_start else None
+        if row is not None and not row['filename']:
+            row['filename'] = match['filename']
+            linked += 1
+
+    return linked
+
+
+def load_segment_manifest(manifest_path: Path) -> List[Dict]:
+    """Read the manifest rows (empty list if it does not exist yet)."""
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        return []
+    with open(manifest_path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def segment_file_for_video(manifest_path: Path, video_filename: str) -> Optional[Path]:
+    """Segment file linked to a video in the manifest, or None."""
+    for row in load_segment_manifest(manifest_path):
+        if row['filename'] == video_filename:
+            return Path(manifest_path).parent / row['segment_file']
+    return None
+
+
+def write_segment_manifest(rows: List[Dict], manifest_path: Path):
+    """Write the manifest atomically."""
+    tmp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, manifest_path)
+
+
+def split_logs(logs_dir: Path, output_dir: Path, index_csv: Optional[str] = None, base_dir: str = '.',
+               force: bool = False) -> List[Dict]:
+    """Split every log in logs_dir (logs already split at their current size/mtime are kept)."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+
+    log_files = sorted(find_combat_logs(logs_dir, 'WoWCombatLog-*.txt'))
+    existing = {}
+    for row in load_segment_manifest(manifest_path):
+        existing.setdefault(row['log_file'], []).append(row)
+
+    rows = []
+    taken = set()
+    for log_file in log_files:
+        stat = log_file.stat()
+        previous = existing.get(log_file.name, [])
+        if previous and not force and all(
+                int(row['log_size']) == stat.st_size and float(row['log_mtime']) == stat.st_mtime
+                and (output_dir / row['segment_file']).exists() for row in previous):
+            rows.extend(previous)
+            taken.update(row['segment_file'] for row in previous)
+            continue
+
+        for row in previous:
+            stale = output_dir / row['segment_file']
+            if stale.exists():
+                stale.unlink()
+
+        log_rows = split_log_segments(log_file, output_dir, taken)
+        SafeLogger.info(f"{log_file.name}: {len(log_rows)} arena segments")
+        rows.extend(log_rows)
+
+    if index_csv:
+        # Imported here: the production parser is only needed to link videos
+        from enhanced_combat_parser_production_ENHANCED import EnhancedProductionCombatParser
+
+        for row in rows:
+            row['filename'] = ''
+        parser = EnhancedProductionCombatParser(base_dir)
+        linked = link_videos_to_segments(rows, index_csv, log_files, parser)
+        SafeLogger.info(f"Linked {linked} videos to segments")
+
+    write_segment_manifest(rows, manifest_path)
+    SafeLogger.success(f"Wrote {len(rows)} segments and {manifest_path}")
+    return rows
+
+
+def main():
+    """Split session logs into per-match segment files"""
+    arg_parser = argparse.ArgumentParser(description="Split combat logs into per-arena-match files")
+    arg_parser.add_argument('--logs-dir', type=Path, required=True, help='Directory of WoWCombatLog-*.txt files')
+    arg_parser.add_argument('--output-dir', type=Path, required=True, help='Directory for segment files')
+    arg_parser.add_argument('--index', help='Enhanced index CSV used to link segments to video filenames')
+    arg_parser.add_argument('--base-dir', default='.', help='Directory holding player_pet_index.json and the JSON metadata')
+    arg_parser.add_argument('--force', action='store_true', help='Re-split logs that are already split')
+    args = arg_parser.parse_args()
+
+    split_logs(args.logs_dir, args.output_dir, args.index, args.base_dir, args.force)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,14 @@ from datetime import datetime
 from enum import Enum
 
 
+# Unit flag bits of the player who is writing the combat log
+AFFILIATION_MINE = 0x1
+TYPE_PLAYER = 0x400
+
+# Unit flag bit of units outside the logging player's group (never the logging player)
+AFFILIATION_OUTSIDER = 0x8
+
+
 class ArenaSize(Enum):
     """Arena bracket sizes"""
     TWO_V_TWO = "2v2"
@@ -126,6 +134,87 @@ class TeamComposition:
         return None
 
 
+def unit_base_name(name_field: str) -> str:
+    """Base name of a combat log unit name field ('"Phlargus-Eredar-US"' -> 'Phlargus')."""
+    return name_field.strip('"').split('-', 1)[0]
+
+
+class UnitIdentityTable:
+    """
+    GUID-keyed identities of the units in one match.
+
+    The primary player's GUID is resolved once - from a unit flagged as the logging player
+    or from the player's first cast, skipping units flagged as outside the logging player's
+    group and, once COMBATANT_INFO was seen, non-participants - and pets are tracked by the
+    GUIDs the player summons. From then on
+    "is this the player / one of their pets" is a GUID comparison instead of name parsing,
+    and a same-named player from another realm is no longer counted. Until the GUID is
+    resolved, base-name matches still count.
+
+    Other players can be registered as PlayerInfo; ArenaMatchModel keeps its GUID lookup
+    in this table.
+    """
+
+    def __init__(self, player_name: str = ''):
+        self.player_name = player_name
+        self.player_guid: Optional[str] = None
+        self.pet_guids: Set[str] = set()
+        self.participant_guids: Set[str] = set()
+        self.players: Dict[str, PlayerInfo] = {}
+
+    def add_participant(self, guid: str):
+        """Record a COMBATANT_INFO participant GUID."""
+        self.participant_guids.add(guid)
+
+    def add_player(self, player: PlayerInfo):
+        """Register a player; the primary player's GUID is taken from it."""
+        self.players[player.guid] = player
+        if player.guid and self.player_guid is None and \
+                player.name.lower() == self.player_name.lower():
+            self.player_guid = player.guid
+        if player.pet_guid:
+            self.players.setdefault(player.pet_guid, player)
+
+    def get_player(self, guid: str) -> Optional[PlayerInfo]:
+        """Registered player (or pet owner) of a GUID."""
+        return self.players.get(guid)
+
+    def is_player(self, guid: str, name_field: str, flags_field: str = '', first_cast: bool = False) -> bool:
+        """True if the unit (GUID, quoted name, hex flags fields) is the primary player."""
+        if self.player_guid is not None:
+            return guid == self.player_guid
+        if not guid.startswith('Player-') or unit_base_name(name_field) != self.player_name:
+            return False
+
+        if self.participant_guids and guid not in self.participant_guids:
+            return False
+        flags = self._parse_flags(flags_field)
+        if flags is not None and flags & AFFILIATION_OUTSIDER:
+            return False
+        if first_cast or (flags is not None and flags & AFFILIATION_MINE and flags & TYPE_PLAYER):
+            self.player_guid = guid
+        return True
+
+    def is_pet(self, guid: str) -> bool:
+        """True if the GUID is a known pet of the primary player."""
+        return guid in self.pet_guids
+
+    def add_pet(self, guid: str):
+        """Record a pet GUID of the primary player."""
+        self.pet_guids.add(guid)
+        player = self.players.get(self.player_guid) if self.player_guid else None
+        if player is not None:
+            player.pet_guid = guid
+            self.players.setdefault(guid, player)
+
+    @staticmethod
+    def _parse_flags(flags_field: str) -> Optional[int]:
+        try:
+            return int(flags_field, 16)
+        except ValueError:
+            return None
+
+
 @dataclass 
 class SoloShuffleRound:
     """Solo Shuffle round information"""
@@ -135,7 +224,16 @@ class SoloShuffleRound:
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     outcome: Optional[str] = None  # "Win", "Loss", "Draw"
-    duration_seconds: Optional[int] = None
+    duration_seconds: Optional[int] = None  # From gates opening to the round's end
+    gates_open_time: Optional[datetime] = None  # Arena Preparation removed
+    start_offset: Optional[int] = None  # Byte range [start_offset, end_offset) of the round's lines
+    end_offset: Optional[int] = None
+    death_guid: Optional[str] = None  # Unit whose death ended the round (None: no death)
+
+    def contains(self, event_time: datetime) -> bool:
+        """True if event_time falls within this round."""
+        return self.start_time is not None and self.end_time is not None and \
+            self.start_time <= event_time <= self.end_time
 
 
 @dataclass
@@ -161,6 +259,9 @@ class ArenaMatchModel:
     arena_start_time: Optional[datetime] = None
     arena_end_time: Optional[datetime] = None
     combat_log_file: Optional[str] = None
+
+    # GUID-keyed identities shared with the combat log parser (created if not given)
+    identity: Optional[UnitIdentityTable] = None
     
     # Match state tracking
     _all_players: Dict[str, PlayerInfo] = field(default_factory=dict)
@@ -168,6 +269,9 @@ class ArenaMatchModel:
     
     def __post_init__(self):
         """Initialize player lookups"""
+        if self.identity is None:
+            self.identity = UnitIdentityTable(self.primary_player)
+        self._guid_to_player = self.identity.players
         self._build_player_lookups()
     
     def _build_player_lookups(self):
@@ -176,7 +280,14 @@ class ArenaMatchModel:
         
         for player in all_players:
             self._all_players[player.name.lower()] = player
-            self._guid_to_player[player.guid] = player
+            self.identity.add_player(player)
+
+    def use_identity_table(self, identity: UnitIdentityTable):
+        """Share a parser's identity table (its player and pet GUIDs) as this match's GUID lookup."""
+        for player in self._guid_to_player.values():
+            identity.add_player(player)
+        self.identity = identity
+        self._guid_to_player = identity.players
     
     def get_player_by_name(self, name: str) -> Optional[PlayerInfo]:
         """Get player by name from either team"""
@@ -229,6 +340,13 @@ class ArenaMatchModel:
         
         return healers + dps + tanks
     
+    def round_at(self, event_time: datetime) -> Optional[SoloShuffleRound]:
+        """Solo Shuffle round in progress at event_time (None between rounds or if not segmented)."""
+        for solo_round in self.solo_shuffle_rounds:
+            if solo_round.contains(event_time):
+                return solo_round
+        return None
+
     @property
     def is_solo_shuffle(self) -> bool:
         """Check if this is a Solo Shuffle match"""
@@ -0,0 +1,221 @@
+"""
+Arena Segment Catalog
+
+Per-log catalog of ARENA_MATCH_START / ARENA_MATCH_END segments, built in a single
+scan and persisted as a JSON sidecar next to the combat log
+(WoWCombatLog-050625_182406.txt.segments.json).
+
+Each segment records its start/end timestamps and byte offsets, zone_id, bracket,
+UNIT_DIED counts per unit and the participant GUIDs from COMBATANT_INFO, so arena
+boundary resolution and death correlation become in-memory lookups instead of
+re-reading the log for every match.
+"""
+
+import bisect
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from combat_log_io import parse_combat_log_timestamp
+from combat_log_scanner import iter_marker_lines
+
+
+CATALOG_VERSION = 1
+CATALOG_SUFFIX = '.segments.json'
+SEGMENT_MARKERS = (b'ARENA_MATCH_', b'UNIT_DIED', b'COMBATANT_INFO')
+
+
+class ArenaSegmentCatalog:
+    """All arena segments of a single combat log, sorted by start time."""
+
+    def __init__(self, log_file: Path, log_size: int, log_mtime: float, segments: List[Dict]):
+        self.log_file = Path(log_file)
+        self.log_size = log_size
+        self.log_mtime = log_mtime
+        self.segments = segments
+        self._start_times = [segment['start_time'] for segment in segments]
+
+    @staticmethod
+    def sidecar_path(log_file: Path) -> Path:
+        """Location of the catalog sidecar for a combat log."""
+        log_file = Path(log_file)
+        return log_file.with_name(log_file.name + CATALOG_SUFFIX)
+
+    @classmethod
+    def load_or_build(cls, log_file: Path) -> 'ArenaSegmentCatalog':
+        """Load the sidecar catalog if it is current, otherwise build and persist a new one."""
+        catalog = cls.load(log_file)
+        if catalog is not None and catalog.is_current():
+            return catalog
+
+        catalog = cls.build(log_file)
+        catalog.save()
+        return catalog
+
+    @classmethod
+    def load(cls, log_file: Path) -> Optional['ArenaSegmentCatalog']:
+        """Load the sidecar catalog for a log, or None if missing/unreadable."""
+        catalog_path = cls.sidecar_path(log_file)
+        if not catalog_path.exists():
+            return None
+
+        try:
+            with open(catalog_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CATALOG_VERSION:
+                return None
+
+            segments = []
+            for segment in data['segments']:
+                segment['start_time'] = datetime.fromisoformat(segment['start_time'])
+                if segment['end_time']:
+                    segment['end_time'] = datetime.fromisoformat(segment['end_time'])
+                segments.append(segment)
+
+            return cls(log_file, data['log_size'], data['log_mtime'], segments)
+        except Exception:
+            return None
+
+    @classmethod
+    def build(cls, log_file: Path) -> 'ArenaSegmentCatalog':
+        """Scan a combat log once and pair every ARENA_MATCH_START with its ARENA_MATCH_END."""
+        log_file = Path(log_file)
+        stat = log_file.stat()
+
+        starts = []      # (time, offset, zone_id, bracket, line)
+        ends = []        # (time, offset after END line)
+        deaths = []      # (time, died unit base name)
+        combatants = []  # (time, GUID)
+
+        # Only the marker lines are decoded; everything else stays raw bytes in the mmap
+        for marker_line in iter_marker_lines(log_file, SEGMENT_MARKERS):
+            line = marker_line.text
+            event_time = parse_combat_log_timestamp(line)
+            if not event_time:
+                continue
+
+            parts = line.strip().split(',')
+            if 'ARENA_MATCH_START' in line:
+                if len(parts) >= 5:
+                    starts.append((event_time, marker_line.offset, parts[1].strip(), parts[3].strip(),
+                                   line.strip()))
+            elif 'ARENA_MATCH_END' in line:
+                ends.append((event_time, marker_line.next_offset))
+
+            if 'UNIT_DIED' in line and len(parts) >= 7:
+                deaths.append((event_time, parts[6].strip('"').split('-', 1)[0]))
+
+            if 'COMBATANT_INFO' in line and len(parts) >= 2:
+                combatants.append((event_time, parts[1].strip()))
+
+        # Logs are chronological; a stable sort keeps file order for equal timestamps
+        starts.sort(key=lambda x: x[0])
+        ends.sort(key=lambda x: x[0])
+        deaths.sort(key=lambda x: x[0])
+        combatants.sort(key=lambda x: x[0])
+
+        end_times = [end[0] for end in ends]
+        death_times = [death[0] for death in deaths]
+        combatant_times = [combatant[0] for combatant in combatants]
+
+        segments = []
+        for start_time, start_offset, zone_id, bracket, start_line in starts:
+            # Same pairing rule as the boundary search: first END strictly after the START
+            end_pos = bisect.bisect_right(end_times, start_time)
+            end_time, end_offset = ends[end_pos] if end_pos < len(ends) else (None, None)
+
+            death_counts = {}
+            participants = []
+            duration = None
+            if end_time is not None:
+                lo = bisect.bisect_left(death_times, start_time)
+                hi = bisect.bisect_right(death_times, end_time)
+                death_counts = dict(Counter(name for _, name in deaths[lo:hi]))
+
+                lo = bisect.bisect_left(combatant_times, start_time)
+                hi = bisect.bisect_right(combatant_times, end_time)
+                participants = list(dict.fromkeys(guid for _, guid in combatants[lo:hi]))
+
+                duration = (end_time - start_time).total_seconds()
+
+            segments.append({
+                'start_time': start_time,
+                'end_time': end_time,
+                'start_offset': start_offset,
+                'end_offset': end_offset,
+                'zone_id': zone_id,
+                'bracket': bracket,
+                'duration': duration,
+                'deaths': death_counts,
+                'participants': participants,
+                'start_line': start_line
+            })
+
+        return cls(log_file, stat.st_size, stat.st_mtime, segments)
+
+    def save(self):
+        """Persist the catalog next to the log (best effort - logs dir may be read-only)."""
+        catalog_path = self.sidecar_path(self.log_file)
+        segments = []
+        for segment in self.segments:
+            segment = dict(segment)
+            segment['start_time'] = segment['start_time'].isoformat()
+            segment['end_time'] = segment['end_time'].isoformat() if segment['end_time'] else None
+            segments.append(segment)
+
+        data = {
+            'version': CATALOG_VERSION,
+            'log_file': self.log_file.name,
+            'log_size': self.log_size,
+            'log_mtime': self.log_mtime,
+            'segments': segments
+        }
+        try:
+            tmp_path = catalog_path.with_name(catalog_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, catalog_path)
+        except Exception as e:
+            print(f"WARNING: Could not save segment catalog for {self.log_file.name}: {e}")
+
+    def is_current(self) -> bool:
+        """Check the catalog still describes the log on disk (size and mtime)."""
+        try:
+            stat = self.log_file.stat()
+        except OSError:
+            return False
+        return stat.st_size == self.log_size and stat.st_mtime == self.log_mtime
+
+    def segments_starting_between(self, window_start: datetime, window_end: datetime) -> List[Dict]:
+        """Segments whose ARENA_MATCH_START falls inside [window_start, window_end]."""
+        lo = bisect.bisect_left(self._start_times, window_start)
+        hi = bisect.bisect_right(self._start_times, window_end)
+        return self.segments[lo:hi]
+
+
+def death_counts_from_segment(segment: Dict, player_name: str) -> Dict:
+    """Death summary in the count_deaths_in_arena_window format from precomputed segment counts."""
+    total_deaths = sum(segment['deaths'].values())
+    player_deaths = segment['deaths'].get(player_name, 0)
+    return {
+        'player_deaths': player_deaths,
+        'enemy_deaths': total_deaths - player_deaths,
+        'total_deaths': total_deaths
+    }
+
+
+# Process-level cache so every match in a log shares one catalog
+_CATALOG_CACHE: Dict[str, ArenaSegmentCatalog] = {}
+
+
+def get_segment_catalog(log_file: Path) -> ArenaSegmentCatalog:
+    """Return a current segment catalog for the log, loading or building it once per process."""
+    key = str(log_file)
+    catalog = _CATALOG_CACHE.get(key)
+    if catalog is None or not catalog.is_current():
+        catalog = ArenaSegmentCatalog.load_or_build(Path(log_file))
+        _CATALOG_CACHE[key] = catalog
+    return catalog
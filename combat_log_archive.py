@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Compressed Combat Log Archive
+
+Range reads of archived combat logs (WoWCombatLog-050625_182406.txt.zst or .txt.gz)
+and an archival command that compresses a raw log as a sequence of
+independently compressed frames.
+
+Every frame holds whole lines (DEFAULT_FRAME_BYTES of raw text by default) and is a
+complete zstd frame / gzip member, so the archive is still an ordinary .zst/.gz file
+that zstd, gzip and any streaming reader decompress end to end. Alongside it a JSON
+frame index (WoWCombatLog-050625_182406.txt.zst.frames.json) records each frame's
+compressed and raw byte ranges and the first/last log second it contains, so a
+single-match window read only decompresses the frames overlapping the window.
+
+zstd support requires zstandard (pip install zstandard); gzip uses the standard library.
+
+Usage:
+  python combat_log_archive.py --archive Logs/ --codec zst
+  python combat_log_archive.py --archive Logs/WoWCombatLog-050625_182406.txt --codec gz --remove-source
+  python combat_log_archive.py --verify Logs/WoWCombatLog-050625_182406.txt.zst
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from combat_log_io import (
+    COMPRESSED_SUFFIXES,
+    MONOTONIC_TOLERANCE_S,
+    import_zstandard,
+    open_combat_log,
+    parse_grid_second,
+    to_grid_second
+)
+
+
+FRAME_INDEX_VERSION = 1
+FRAME_INDEX_SUFFIX = '.frames.json'
+
+# Raw bytes per frame: a match window typically touches one or two frames
+DEFAULT_FRAME_BYTES = 4 * 1024 * 1024
+DEFAULT_LEVELS = {'zst': 10, 'gz': 6}
+
+
+def _compress_frame(codec: str, data: bytes, compressor) -> bytes:
+    if codec == 'gz':
+        return gzip.compress(data, compresslevel=compressor, mtime=0)
+    return compressor.compress(data)
+
+
+def _decompress_frame(codec: str, data: bytes) -> bytes:
+    if codec == 'gz':
+        return gzip.decompress(data)
+
+    zstandard = import_zstandard()
+    if zstandard is None:
+        raise ImportError("zstandard is required to read .zst archives")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+class CombatLogFrameIndex:
+    """Frame table of an archived combat log: compressed/raw byte ranges and log seconds per frame."""
+
+    def __init__(self, archive: Path, archive_size: int, archive_mtime: float, codec: str,
+                 raw_size: int, raw_sha256: str, frames: List[List]):
+        self.archive = Path(archive)
+        self.archive_size = archive_size
+        self.archive_mtime = archive_mtime
+        self.codec = codec
+        self.raw_size = raw_size
+        self.raw_sha256 = raw_sha256
+        # [offset, size, raw_offset, raw_size, first_second, last_second]
+        self.frames = frames
+
+    @staticmethod
+    def sidecar_path(archive: Path) -> Path:
+        """Location of the frame index for an archive."""
+        archive = Path(archive)
+        return archive.with_name(archive.name + FRAME_INDEX_SUFFIX)
+
+    @classmethod
+    def load(cls, archive: Path) -> Optional['CombatLogFrameIndex']:
+        """Load the frame index for an archive, or None if missing/unreadable."""
+        index_path = cls.sidecar_path(archive)
+        if not index_path.exists():
+            return None
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != FRAME_INDEX_VERSION:
+                return None
+            return cls(archive, data['archive_size'], data['archive_mtime'], data['codec'],
+                       data['raw_size'], data['raw_sha256'], data['frames'])
+        except Exception:
+            return None
+
+    def save(self):
+        """Persist the frame index next to the archive."""
+        index_path = self.sidecar_path(self.archive)
+        data = {
+            'version': FRAME_INDEX_VERSION,
+            'archive': self.archive.name,
+            'archive_size': self.archive_size,
+            'archive_mtime': self.archive_mtime,
+            'codec': self.codec,
+            'raw_size': self.raw_size,
+            'raw_sha256': self.raw_sha256,
+            'frames': self.frames
+        }
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, index_path)
+
+    def is_current(self) -> bool:
+        """Check the index still describes the archive on disk (size and mtime)."""
+        try:
+            stat = self.archive.stat()
+        except OSError:
+            return False
+        return stat.st_size == self.archive_size and stat.st_mtime == self.archive_mtime
+
+    def frames_for_window(self, start_time: datetime, end_time: datetime) -> List[List]:
+        """Frames whose log seconds overlap [start_time, end_time] (padded by the monotonic tolerance)."""
+        start_second = to_grid_second(start_time) - MONOTONIC_TOLERANCE_S
+        end_second = to_grid_second(end_time) + MONOTONIC_TOLERANCE_S
+        return [frame for frame in self.frames
+                if frame[4] is not None and frame[4] <= end_second and frame[5] >= start_second]
+
+    def read_frame(self, f, frame: List) -> bytes:
+        """Decompress one frame from an open archive handle."""
+        f.seek(frame[0])
+        return _decompress_frame(self.codec, f.read(frame[1]))
+
+    def iter_window_lines(self, start_time: datetime, end_time: datetime) -> Iterator[str]:
+        """
+        Yield decoded lines from the frames covering [start_time, end_time].
+
+        Frames are whole lines, so callers still apply their own timestamp
+        comparison to each line (as with CombatLogTimeIndex.iter_window_lines).
+        """
+        frames = self.frames_for_window(start_time, end_time)
+        if not frames:
+            return
+
+        with open(self.archive, 'rb') as f:
+            for frame in frames:
+                for raw_line in io.BytesIO(self.read_frame(f, frame)):
+                    yield raw_line.decode('utf-8', errors='ignore')
+
+
+# Process-level cache so repeated window reads of the same archive share one index
+_FRAME_INDEX_CACHE: Dict[str, CombatLogFrameIndex] = {}
+
+
+def get_frame_index(archive: Path) -> Optional[CombatLogFrameIndex]:
+    """Current frame index of an archive, or None when it has none (e.g. compressed by another tool)."""
+    key = str(archive)
+    index = _FRAME_INDEX_CACHE.get(key)
+    if index is None or not index.is_current():
+        index = CombatLogFrameIndex.load(archive)
+        if index is None or not index.is_current():
+            return None
+        _FRAME_INDEX_CACHE[key] = index
+    return index
+
+
+def iter_archive_window_lines(archive: Path, start_time: datetime, end_time: datetime) -> Iterator[str]:
+    """Yield the lines of an archived log that may fall inside [start_time, end_time]."""
+    index = get_frame_index(archive)
+    if index is not None:
+        yield from index.iter_window_lines(start_time, end_time)
+        return
+
+    # No frame index: stream the whole archive
+    with open_combat_log(archive) as f:
+        yield from f
+
+
+def archive_path_for_log(log_file: Path, codec: str) -> Path:
+    """Location of the archive for a raw combat log."""
+    log_file = Path(log_file)
+    return log_file.with_name(log_file.name + '.' + codec)
+
+
+def archive_combat_log(log_file: Path, codec: str = 'zst', frame_bytes: int = DEFAULT_FRAME_BYTES,
+                       level: Optional[int] = None, remove_source: bool = False) -> Optional[Path]:
+    """
+    Compress a raw combat log into independently compressed frames plus a frame index.
+
+    With remove_source the raw log is deleted only after the archive decompresses
+    back to the same SHA-256.
+    """
+    log_file = Path(log_file)
+    level = DEFAULT_LEVELS[codec] if level is None else level
+
+    if codec == 'zst':
+        zstandard = import_zstandard()
+        if zstandard is None:
+            return None
+        compressor = zstandard.ZstdCompressor(level=level)
+    else:
+        compressor = level
+
+    archive = archive_path_for_log(log_file, codec)
+    tmp_archive = archive.with_name(archive.name + '.tmp')
+    frames = []
+    digest = hashlib.sha256()
+    date_cache: Dict[bytes, int] = {}
+
+    try:
+        with open(log_file, 'rb') as src, open(tmp_archive, 'wb') as dst:
+            raw_offset = 0
+            pending: List[bytes] = []
+            pending_size = 0
+            seconds: List[int] = []
+
+            def flush_frame():
+                data = b''.join(pending)
+                compressed = _compress_frame(codec, data, compressor)
+                frames.append([dst.tell(), len(compressed), raw_offset, len(data),
+                               min(seconds) if seconds else None, max(seconds) if seconds else None])
+                dst.write(compressed)
+                digest.update(data)
+
+            for raw_line in src:
+                pending.append(raw_line)
+                pending_size += len(raw_line)
+                line_second = parse_grid_second(raw_line, date_cache)
+                if line_second is not None:
+                    seconds.append(line_second)
+
+                if pending_size >= frame_bytes:
+                    flush_frame()
+                    raw_offset += pending_size
+                    pending, pending_size, seconds = [], 0, []
+
+            if pending:
+                flush_frame()
+                raw_offset += pending_size
+
+        os.replace(tmp_archive, archive)
+    except Exception as e:
+        print(f"ERROR: Could not archive {log_file.name}: {e}")
+        if tmp_archive.exists():
+            tmp_archive.unlink()
+        return None
+
+    stat = archive.stat()
+    index = CombatLogFrameIndex(archive, stat.st_size, stat.st_mtime, codec, raw_offset,
+                                digest.hexdigest(), frames)
+    index.save()
+
+    ratio = stat.st_size / max(raw_offset, 1)
+    print(f"SUCCESS: Archived {log_file.name}: {raw_offset:,} -> {stat.st_size:,} bytes "
+          f"({ratio:.1%}, {len(frames)} frames)")
+
+    if remove_source:
+        if verify_archive(archive):
+            log_file.unlink()
+            print(f"INFO: Removed raw log {log_file.name}")
+        else:
+            print(f"WARNING: Kept raw log {log_file.name} - archive failed verification")
+    return archive
+
+
+def verify_archive(archive: Path) -> bool:
+    """Decompress every frame and check sizes and the SHA-256 recorded at archive time."""
+    index = CombatLogFrameIndex.load(archive)
+    if index is None or not index.is_current():
+        print(f"ERROR: No current frame index for {Path(archive).name}")
+        return False
+
+    digest = hashlib.sha256()
+    raw_offset = 0
+    try:
+        with open(archive, 'rb') as f:
+            for frame in index.frames:
+                data = index.read_frame(f, frame)
+                if frame[2] != raw_offset or len(data) != frame[3]:
+                    print(f"ERROR: {Path(archive).name}: frame at raw offset {frame[2]:,} is inconsistent")
+                    return False
+                digest.update(data)
+                raw_offset += len(data)
+    except Exception as e:
+        print(f"ERROR: {Path(archive).name}: {e}")
+        return False
+
+    if raw_offset != index.raw_size or digest.hexdigest() != index.raw_sha256:
+        print(f"ERROR: {Path(archive).name}: decompressed content does not match the source log")
+        return False
+    return True
+
+
+def main():
+    """Archive raw combat logs or verify existing archives"""
+    parser = argparse.ArgumentParser(description="Frame-indexed compressed archives of WoW combat logs")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--archive', type=Path, help='Combat log file or directory of WoWCombatLog-*.txt files')
+    action.add_argument('--verify', type=Path, help='Archive file or directory of archives to verify')
+    parser.add_argument('--codec', choices=sorted(DEFAULT_LEVELS), default='zst', help='Compression codec')
+    parser.add_argument('--level', type=int, help='Compression level (default: zst 10, gz 6)')
+    parser.add_argument('--frame-mb', type=float, default=DEFAULT_FRAME_BYTES / (1024 * 1024),
+                        help='Raw megabytes per independently compressed frame')
+    parser.add_argument('--remove-source', action='store_true',
+                        help='Delete each raw log once its archive verifies')
+    args = parser.parse_args()
+
+    if args.archive:
+        log_files = sorted(args.archive.glob('WoWCombatLog-*.txt')) if args.archive.is_dir() else [args.archive]
+        frame_bytes = max(1, int(args.frame_mb * 1024 * 1024))
+        failures = sum(1 for log_file in log_files
+                       if archive_combat_log(log_file, args.codec, frame_bytes, args.level,
+                                             args.remove_source) is None)
+        return 1 if failures else 0
+
+    if args.verify.is_dir():
+        archives = sorted(path for suffix in COMPRESSED_SUFFIXES
+                          for path in args.verify.glob('WoWCombatLog-*.txt' + suffix))
+    else:
+        archives = [args.verify]
+
+    failures = 0
+    for archive in archives:
+        if verify_archive(archive):
+            print(f"SUCCESS: {archive.name} verified")
+        else:
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""
+Combat Log Capabilities
+
+Per-log record of what a combat log can be used for, built once and persisted as a JSON
+sidecar next to the log (WoWCombatLog-050625_182406.txt.advlog.json).
+
+Every COMBAT_LOG_VERSION header starts a recording section: WoW writes one when logging
+starts and again when advanced logging is switched on or off mid-session. For each
+section the record keeps the header's log version, ADVANCED_LOG_ENABLED flag and build,
+the field counts observed per coordinate event type and the number of position samples
+that pass coordinate validation - all from the first SAMPLE_LINES lines after the header.
+Whether a log (or a match window inside it) has usable coordinates is then a lookup
+instead of a re-sample of the log for every match.
+"""
+
+import bisect
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from combat_log_positions import COORDINATE_EVENTS, extract_position_arrays
+from combat_log_scanner import iter_marker_lines
+from development_standards import parse_combat_log_timestamp
+
+
+CAPABILITIES_VERSION = 2
+CAPABILITIES_SUFFIX = '.advlog.json'
+
+HEADER_MARKER = b'COMBAT_LOG_VERSION'
+SAMPLE_MARKERS = tuple(event_type.encode('ascii') for event_type in COORDINATE_EVENTS) + (b'ZONE_CHANGE',)
+
+# Lines sampled after each header for field counts and position samples
+SAMPLE_LINES = 5000
+
+# Position samples kept per log for reporting
+MAX_SAMPLE_COORDINATES = 10
+
+
+def parse_log_header(line: str) -> Dict:
+    """COMBAT_LOG_VERSION,21,ADVANCED_LOG_ENABLED,1,BUILD_VERSION,11.1.5,... -> header fields."""
+    event_data = line.split('  ', 1)[-1].strip()
+    fields = [field.strip() for field in event_data.split(',')]
+    values = dict(zip(fields[0::2], fields[1::2]))
+    try:
+        version = int(values.get('COMBAT_LOG_VERSION', ''))
+    except ValueError:
+        version = None
+    return {
+        'log_version': version,
+        'advanced': values.get('ADVANCED_LOG_ENABLED') == '1',
+        'build': values.get('BUILD_VERSION', '')
+    }
+
+
+class LogCapabilities:
+    """Recording sections of a single combat log and what each of them can provide."""
+
+    def __init__(self, log_file: Path, log_size: int, log_mtime: float, sections: List[Dict]):
+        self.log_file = Path(log_file)
+        self.log_size = log_size
+        self.log_mtime = log_mtime
+        self.sections = sections
+        self._section_times = [section['time'] or datetime.min for section in sections]
+
+    @staticmethod
+    def sidecar_path(log_file: Path) -> Path:
+        """Location of the capabilities sidecar for a combat log."""
+        log_file = Path(log_file)
+        return log_file.with_name(log_file.name + CAPABILITIES_SUFFIX)
+
+    @classmethod
+    def load_or_build(cls, log_file: Path) -> 'LogCapabilities':
+        """Load the sidecar record if it is current, otherwise build and persist a new one."""
+        capabilities = cls.load(log_file)
+        if capabilities is not None and capabilities.is_current():
+            return capabilities
+
+        capabilities = cls.build(log_file)
+        capabilities.save()
+        return capabilities
+
+    @classmethod
+    def load(cls, log_file: Path) -> Optional['LogCapabilities']:
+        """Load the sidecar record for a log, or None if missing/unreadable."""
+        record_path = cls.sidecar_path(log_file)
+        if not record_path.exists():
+            return None
+
+        try:
+            with open(record_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CAPABILITIES_VERSION:
+                return None
+
+            sections = []
+            for section in data['sections']:
+                section['time'] = datetime.fromisoformat(section['time']) if section['time'] else None
+                section['field_counts'] = {event_type: {int(count): n for count, n in counts.items()}
+                                           for event_type, counts in section['field_counts'].items()}
+                sections.append(section)
+
+            return cls(log_file, data['log_size'], data['log_mtime'], sections)
+        except Exception:
+            return None
+
+    @classmethod
+    def build(cls, log_file: Path) -> 'LogCapabilities':
+        """Find every header in one marker scan, then sample the lines after each of them."""
+        log_file = Path(log_file)
+        stat = log_file.stat()
+
+        headers = [(marker_line.offset, marker_line.text)
+                   for marker_line in iter_marker_lines(log_file, (HEADER_MARKER,))]
+        if not headers or headers[0][0] > 0:
+            # Lines before the first header (a log cut by a rotation) form a section of their own
+            headers.insert(0, (0, None))
+
+        sections = []
+        for position, (offset, header_line) in enumerate(headers):
+            end_offset = headers[position + 1][0] if position + 1 < len(headers) else None
+            section = parse_log_header(header_line) if header_line else \
+                {'log_version': None, 'advanced': None, 'build': ''}
+            section['offset'] = offset
+            section['time'] = parse_combat_log_timestamp(header_line) if header_line else None
+            section.update(cls._sample_section(log_file, offset, end_offset))
+            sections.append(section)
+
+        # A headerless leading section takes its time from its first sampled line
+        if sections[0]['time'] is None and sections[0]['first_time']:
+            sections[0]['time'] = datetime.fromisoformat(sections[0]['first_time'])
+        if sections[0]['time'] is None and len(sections) > 1:
+            sections.pop(0)
+
+        return cls(log_file, stat.st_size, stat.st_mtime, sections)
+
+    @staticmethod
+    def _sample_section(log_file: Path, start_offset: int, end_offset: Optional[int]) -> Dict:
+        field_counts: Dict[str, Counter] = {}
+        sample_lines = []
+        zone = None
+        first_time = None
+
+        for marker_line in iter_marker_lines(log_file, SAMPLE_MARKERS, start_offset, end_offset,
+                                             max_lines=SAMPLE_LINES):
+            line = marker_line.text
+            separator = line.find('  ')
+            if separator < 0:
+                continue
+            event_data = line[separator + 2:]
+            event_type = event_data.split(',', 1)[0]
+
+            if first_time is None:
+                event_time = parse_combat_log_timestamp(line)
+                first_time = event_time.isoformat() if event_time else None
+
+            if event_type == 'ZONE_CHANGE':
+                if zone is None:
+                    parts = event_data.split(',')
+                    if len(parts) >= 3:
+                        zone_name = parts[2].strip().strip('"')
+                        zone = f"{parts[1].strip()}:{zone_name}"
+            elif event_type in COORDINATE_EVENTS:
+                # Raw comma count, as the COORDINATE_EVENTS positions are counted
+                field_counts.setdefault(event_type, Counter())[event_data.count(',') + 1] += 1
+                sample_lines.append((event_type, line))
+
+        positions = extract_position_arrays((line for _, line in sample_lines),
+                                            capacity=max(1, len(sample_lines)))
+
+        # The reported samples keep the event type they were read from
+        sample_coordinates = []
+        for event_type, line in sample_lines:
+            if len(sample_coordinates) >= MAX_SAMPLE_COORDINATES:
+                break
+            sample = extract_position_arrays((line,), capacity=1)
+            if len(sample):
+                sample_coordinates.append({'x': float(sample.x[0]), 'y': float(sample.y[0]),
+                                           'facing': round(float(sample.facing[0]), 4), 'event': event_type})
+        return {
+            'field_counts': {event_type: dict(counts) for event_type, counts in field_counts.items()},
+            'position_samples': len(positions),
+            'sample_coordinates': sample_coordinates,
+            'zone': zone,
+            'first_time': first_time
+        }
+
+    def save(self):
+        """Persist the record next to the log (best effort - logs dir may be read-only)."""
+        record_path = self.sidecar_path(self.log_file)
+        sections = []
+        for section in self.sections:
+            section = dict(section)
+            section['time'] = section['time'].isoformat() if section['time'] else None
+            sections.append(section)
+
+        data = {
+            'version': CAPABILITIES_VERSION,
+            'log_file': self.log_file.name,
+            'log_size': self.log_size,
+            'log_mtime': self.log_mtime,
+            'sections': sections
+        }
+        try:
+            tmp_path = record_path.with_name(record_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, record_path)
+        except Exception as e:
+            print(f"WARNING: Could not save log capabilities for {self.log_file.name}: {e}")
+
+    def is_current(self) -> bool:
+        """Check the record still describes the log on disk (size and mtime)."""
+        try:
+            stat = self.log_file.stat()
+        except OSError:
+            return False
+        return stat.st_size == self.log_size and stat.st_mtime == self.log_mtime
+
+    @staticmethod
+    def section_has_coordinates(section: Dict) -> bool:
+        return bool(section['advanced'] is not False and section['position_samples'])
+
+    @property
+    def advanced_logging(self) -> bool:
+        """True if any section was recorded with advanced logging enabled."""
+        return any(section['advanced'] for section in self.sections)
+
+    @property
+    def toggles(self) -> List[Dict]:
+        """Sections where ADVANCED_LOG_ENABLED changed from the previous section."""
+        return [section for previous, section in zip(self.sections, self.sections[1:])
+                if section['advanced'] != previous['advanced']]
+
+    @property
+    def movement_capable(self) -> bool:
+        """True if any section has validated position samples."""
+        return any(self.section_has_coordinates(section) for section in self.sections)
+
+    def coordinate_layouts(self) -> Dict[str, bool]:
+        """Observed coordinate event types -> their usual field count matches COORDINATE_EVENTS."""
+        totals: Dict[str, Counter] = {}
+        for section in self.sections:
+            for event_type, counts in section['field_counts'].items():
+                totals.setdefault(event_type, Counter()).update(counts)
+        return {event_type: counts.most_common(1)[0][0] == COORDINATE_EVENTS[event_type]['count']
+                for event_type, counts in totals.items()}
+
+    def sections_between(self, start_time: datetime, end_time: datetime) -> List[Dict]:
+        """Sections in effect at any time in [start_time, end_time]."""
+        if not self.sections:
+            return []
+        lo = max(0, bisect.bisect_right(self._section_times, start_time) - 1)
+        hi = max(lo + 1, bisect.bisect_right(self._section_times, end_time))
+        return self.sections[lo:hi]
+
+    def movement_capable_between(self, start_time: datetime, end_time: datetime) -> bool:
+        """True if every section in effect during the window has validated position samples."""
+        sections = self.sections_between(start_time, end_time)
+        return bool(sections) and all(self.section_has_coordinates(section) for section in sections)
+
+    def detection_result(self) -> Dict:
+        """Summary in the detect_advanced_logging format."""
+        samples = [coordinate for section in self.sections
+                   for coordinate in section['sample_coordinates']][:MAX_SAMPLE_COORDINATES]
+        sample_count = sum(section['position_samples'] for section in self.sections)
+        layouts = self.coordinate_layouts()
+        return {
+            'has_coordinates': self.movement_capable,
+            'coordinate_events': [event_type for event_type, valid in layouts.items() if valid],
+            'sample_coordinates': samples,
+            'arena_zone': next((section['zone'] for section in self.sections if section['zone']), 'unknown'),
+            'confidence': min(1.0, sample_count / 20.0),
+            'advanced_logging': self.advanced_logging,
+            'toggles': len(self.toggles)
+        }
+
+
+# Process-level cache so every match in a log shares one record
+_CAPABILITIES_CACHE: Dict[str, LogCapabilities] = {}
+
+
+def get_log_capabilities(log_file: Path) -> LogCapabilities:
+    """Return a current capabilities record for the log, loading or building it once per process."""
+    key = str(log_file)
+    capabilities = _CAPABILITIES_CACHE.get(key)
+    if capabilities is None or not capabilities.is_current():
+        capabilities = LogCapabilities.load_or_build(Path(log_file))
+        _CAPABILITIES_CACHE[key] = capabilities
+    return capabilities
+
+
+class MovementCapableLogs:
+    """Set-like view over the persisted records: log_file in movement_capable_logs."""
+
+    def __contains__(self, log_file) -> bool:
+        try:
+            return get_log_capabilities(Path(log_file)).movement_capable
+        except OSError:
+            return False
+
+
+class CoordinateValidationCache:
+    """Mapping view over the persisted records: log_file -> {event type: layout matches}."""
+
+    def __getitem__(self, log_file) -> Dict[str, bool]:
+        return get_log_capabilities(Path(log_file)).coordinate_layouts()
+
+    def get(self, log_file, default=None):
+        try:
+            return self[log_file]
+        except OSError:
+            return default
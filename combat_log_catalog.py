@@ -0,0 +1,179 @@
+"""
+Combat Log Catalog
+
+Sorted table of the combat logs in a directory, keyed by the start time in their names
+(WoWCombatLog-050625_182406.txt -> 2025-05-06 18:24:06). File names are parsed once per
+catalog, so "which log holds time T" is a bisect over the start times instead of a regex
+over every log per match.
+
+Each log's first and last event timestamps are read on demand (a small read at the head
+and tail of a raw log, the frame index of an archive) and cached. A time inside the event
+span of one of its two neighbouring logs resolves to that log - even when the other one,
+started by a rotation in the middle of the match, has a closer start time, or when a log
+was named well after its first event. Times outside both spans fall back to the
+nearest-start rule the production parser has always used.
+"""
+
+import bisect
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from combat_log_archive import get_frame_index
+from combat_log_io import find_combat_logs, is_compressed_log, parse_grid_second, to_grid_second
+
+
+LOG_NAME_PATTERN = re.compile(r'(\d{6})_(\d{6})')
+
+# A log that starts this soon after a time may still hold it (recording began before /combatlog)
+START_TOLERANCE = timedelta(seconds=600)
+
+# The log started before a time is only considered within this many calendar days
+MAX_DAYS_BEFORE = 1
+
+# Bytes read at each end of a raw log to find its first/last timestamped line
+SPAN_PROBE_BYTES = 64 * 1024
+
+
+def parse_log_start_from_filename(log_filename: str) -> Optional[datetime]:
+    """Start time encoded in a combat log file name (MMDDYY_HHMMSS), or None."""
+    match = LOG_NAME_PATTERN.search(log_filename)
+    if not match:
+        return None
+    date_str, time_str = match.groups()
+    try:
+        return datetime(2000 + int(date_str[4:6]), int(date_str[:2]), int(date_str[2:4]),
+                        int(time_str[:2]), int(time_str[2:4]), int(time_str[4:6]))
+    except ValueError:
+        return None
+
+
+def read_event_span(log_file: Path) -> Optional[Tuple[int, int]]:
+    """(first, last) grid second of the timestamped lines in a log, or None if unknown."""
+    log_file = Path(log_file)
+    if is_compressed_log(log_file):
+        # Archives are only probed through their frame index - never decompressed whole
+        frame_index = get_frame_index(log_file)
+        if frame_index is None or not frame_index.frames:
+            return None
+        return frame_index.frames[0][4], frame_index.frames[-1][5]
+
+    date_cache: Dict[bytes, int] = {}
+    with open(log_file, 'rb') as f:
+        head = f.read(SPAN_PROBE_BYTES)
+        size = f.seek(0, 2)
+        f.seek(max(0, size - SPAN_PROBE_BYTES))
+        tail = f.read(SPAN_PROBE_BYTES)
+
+    first = next((second for second in (parse_grid_second(line, date_cache) for line in head.splitlines())
+                  if second is not None), None)
+    last = next((second for second in (parse_grid_second(line, date_cache) for line in reversed(tail.splitlines()))
+                 if second is not None), None)
+    if first is None or last is None:
+        return None
+    return first, last
+
+
+class LogCatalog:
+    """Combat logs sorted by the start time in their file names."""
+
+    def __init__(self, log_files: List[Path]):
+        entries = []
+        for position, log_file in enumerate(log_files):
+            start = parse_log_start_from_filename(Path(log_file).name)
+            if start is not None:
+                entries.append((start, position, Path(log_file)))
+        # Logs with the same start keep their listed order
+        entries.sort(key=lambda entry: entry[:2])
+
+        self.starts: List[datetime] = [entry[0] for entry in entries]
+        self.logs: List[Path] = [entry[2] for entry in entries]
+        self._spans: Dict[Path, Tuple[Tuple[int, float], Optional[Tuple[int, int]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.logs)
+
+    def event_span(self, log_file: Path) -> Optional[Tuple[int, int]]:
+        """Cached (first, last) event grid second of a log; re-read when the log changed."""
+        try:
+            stat = log_file.stat()
+        except OSError:
+            return None
+        version = (stat.st_size, stat.st_mtime)
+        cached = self._spans.get(log_file)
+        if cached is None or cached[0] != version:
+            try:
+                span = read_event_span(log_file)
+            except OSError:
+                span = None
+            cached = (version, span)
+            self._spans[log_file] = cached
+        return cached[1]
+
+    def latest_started_before(self, when: datetime) -> Optional[int]:
+        """Position of the last log started at or before when (first listed of equal starts)."""
+        after = bisect.bisect_right(self.starts, when)
+        if after == 0:
+            return None
+        return bisect.bisect_left(self.starts, self.starts[after - 1])
+
+    def find_log(self, when: datetime) -> Optional[Path]:
+        """
+        The log holding time when: whichever of the logs started just before and just after
+        it has events spanning that time, otherwise the nearest start - the last log started
+        at most MAX_DAYS_BEFORE calendar days earlier or the first one started within
+        START_TOLERANCE after it.
+        """
+        if not self.logs or pd.isna(when):
+            return None
+
+        before = self.latest_started_before(when)
+        after = bisect.bisect_right(self.starts, when)
+
+        # The neighbours' event spans settle rotations and logs named later than their first event
+        when_second = to_grid_second(when)
+        for position in (before, after):
+            if position is None or position >= len(self.logs):
+                continue
+            span = self.event_span(self.logs[position])
+            if span is not None and span[0] <= when_second <= span[1]:
+                return self.logs[position]
+
+        before_gap = when - self.starts[before] if before is not None else None
+        after_gap = self.starts[after] - when if after < len(self.starts) else None
+
+        before_ok = before_gap is not None and (when.date() - self.starts[before].date()).days <= MAX_DAYS_BEFORE
+        after_ok = after_gap is not None and after_gap <= START_TOLERANCE
+
+        if before_ok and (not after_ok or before_gap <= after_gap):
+            return self.logs[before]
+        if after_ok:
+            return self.logs[after]
+        return None
+
+    def find_logs(self, times: pd.Series) -> pd.Series:
+        """find_log for every time in a Series (same index, None where no log holds it)."""
+        return pd.Series([self.find_log(when) for when in times], index=times.index, dtype=object)
+
+
+# Directory catalogs, reused until the directory changes (files added, removed or renamed)
+_DIRECTORY_CATALOGS: Dict[Tuple[str, str], Tuple[int, LogCatalog]] = {}
+
+
+def get_log_catalog(logs_dir: Path, pattern: str = '*.txt') -> LogCatalog:
+    """Catalog of the combat logs in a directory, globbed once per directory change."""
+    key = (str(logs_dir), pattern)
+    try:
+        dir_mtime = Path(logs_dir).stat().st_mtime_ns
+    except OSError:
+        # Missing or unreadable directory - no logs, and nothing worth caching
+        _DIRECTORY_CATALOGS.pop(key, None)
+        return LogCatalog([])
+    cached = _DIRECTORY_CATALOGS.get(key)
+    if cached is None or cached[0] != dir_mtime:
+        cached = (dir_mtime, LogCatalog(find_combat_logs(Path(logs_dir), pattern)))
+        _DIRECTORY_CATALOGS[key] = cached
+    return cached[1]
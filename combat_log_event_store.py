@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Combat Log Event Store
+
+Converts raw WoWCombatLog-*.txt files into a columnar Parquet event store so
+analyses can load just the columns and time range they need instead of
+re-tokenizing multi-GB text logs line by line.
+
+Columns:
+  timestamp_ms                          UTC epoch milliseconds (timezone suffix applied)
+  event_type                            dictionary-encoded
+  source_guid/source_name/dest_guid/dest_name   dictionary-encoded
+  spell_id, spell_name, amount          nullable
+  current_hp, max_hp, position_x, position_y, facing   advanced-log fields, nullable
+
+Each row group covers ROW_GROUP_SECONDS of log time, so a window read only touches
+the row groups whose timestamp statistics overlap the window.
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+  python combat_log_event_store.py --convert Logs/
+  python combat_log_event_store.py --convert Logs/WoWCombatLog-050625_182406.txt --output-dir EventStore
+"""
+
+import argparse
+import csv
+import numbers
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from combat_log_io import CombatLogTimestampDecoder, find_combat_logs, open_combat_log
+from development_standards import SafeLogger
+
+
+STORE_SUFFIX = '.events.parquet'
+STORE_VERSION = '1'
+
+# Log time covered by one Parquet row group
+ROW_GROUP_SECONDS = 60
+
+# Advanced logging block: 19 fields starting after the event prefix
+ADVANCED_BLOCK_SIZE = 19
+ADVANCED_HP_OFFSET = 2
+ADVANCED_MAX_HP_OFFSET = 3
+ADVANCED_POSITION_X_OFFSET = 14
+ADVANCED_POSITION_Y_OFFSET = 15
+ADVANCED_FACING_OFFSET = 17
+
+# Field index where the advanced block (or, without advanced logging, the suffix) starts
+EVENT_PREFIX_END = {
+    'SWING_DAMAGE': 9,
+    'SWING_DAMAGE_LANDED': 9,
+    'SWING_MISSED': 9,
+    'ENVIRONMENTAL_DAMAGE': 9
+}
+SPELL_PREFIX_END = 12
+
+# Event suffixes whose first suffix field is an amount
+AMOUNT_SUFFIXES = ('_DAMAGE', '_DAMAGE_LANDED', '_HEAL', '_ENERGIZE', '_DRAIN', '_LEECH', 'DAMAGE_SPLIT')
+
+DICTIONARY_COLUMNS = ['event_type', 'source_guid', 'source_name', 'dest_guid', 'dest_name']
+
+STORE_COLUMNS = [
+    'timestamp_ms', 'event_type', 'source_guid', 'source_name', 'dest_guid', 'dest_name',
+    'spell_id', 'spell_name', 'amount', 'current_hp', 'max_hp', 'position_x', 'position_y', 'facing'
+]
+
+
+def import_pyarrow():
+    """Import pyarrow lazily so the rest of the system works without it."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        SafeLogger.error("pyarrow not installed - run: pip install pyarrow")
+        return None
+
+
+def store_path_for_log(log_file: Path, output_dir: Optional[Path] = None) -> Path:
+    """Location of the event store for a combat log."""
+    log_file = Path(log_file)
+    directory = Path(output_dir) if output_dir else log_file.parent
+    return directory / (log_file.name + STORE_SUFFIX)
+
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _strip_name(value: str) -> Optional[str]:
+    return None if value in ('nil', '') else value
+
+
+def parse_event_row(event_type: str, fields: List[str]) -> Dict:
+    """Map the comma-separated fields of one event (quotes already removed) to store columns."""
+    # Special events (COMBAT_LOG_VERSION, ZONE_CHANGE, COMBATANT_INFO, ...) have no unit fields
+    has_units = len(fields) > 8 and fields[3].startswith('0x')
+    row = {
+        'event_type': event_type,
+        'source_guid': fields[1] if has_units else None,
+        'source_name': _strip_name(fields[2]) if has_units else None,
+        'dest_guid': fields[5] if has_units else None,
+        'dest_name': _strip_name(fields[6]) if has_units else None,
+        'spell_id': None,
+        'spell_name': None,
+        'amount': None,
+        'current_hp': None,
+        'max_hp': None,
+        'position_x': None,
+        'position_y': None,
+        'facing': None
+    }
+
+    is_spell_event = (event_type.startswith('SPELL_') or event_type.startswith('RANGE_')
+                      or event_type == 'DAMAGE_SPLIT')
+    if not has_units:
+        return row
+
+    if is_spell_event and len(fields) > 10:
+        row['spell_id'] = _to_int(fields[9])
+        row['spell_name'] = fields[10]
+
+    prefix_end = EVENT_PREFIX_END.get(event_type, SPELL_PREFIX_END if is_spell_event else None)
+    if prefix_end is None:
+        return row
+
+    # Advanced block present when enough fields follow the prefix and it opens with a GUID
+    suffix_start = prefix_end
+    info_guid = fields[prefix_end] if len(fields) >= prefix_end + ADVANCED_BLOCK_SIZE else ''
+    if '-' in info_guid or info_guid == '0000000000000000':
+        row['current_hp'] = _to_int(fields[prefix_end + ADVANCED_HP_OFFSET])
+        row['max_hp'] = _to_int(fields[prefix_end + ADVANCED_MAX_HP_OFFSET])
+        row['position_x'] = _to_float(fields[prefix_end + ADVANCED_POSITION_X_OFFSET])
+        row['position_y'] = _to_float(fields[prefix_end + ADVANCED_POSITION_Y_OFFSET])
+        row['facing'] = _to_float(fields[prefix_end + ADVANCED_FACING_OFFSET])
+        suffix_start = prefix_end + ADVANCED_BLOCK_SIZE
+
+    if event_type.endswith(AMOUNT_SUFFIXES) and len(fields) > suffix_start:
+        row['amount'] = _to_int(fields[suffix_start])
+
+    return row
+
+
+def _store_schema(pa):
+    """Arrow schema for the event store."""
+    dictionary_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('timestamp_ms', pa.int64()),
+        ('event_type', dictionary_string),
+        ('source_guid', dictionary_string),
+        ('source_name', dictionary_string),
+        ('dest_guid', dictionary_string),
+        ('dest_name', dictionary_string),
+        ('spell_id', pa.int32()),
+        ('spell_name', pa.string()),
+        ('amount', pa.int64()),
+        ('current_hp', pa.int64()),
+        ('max_hp', pa.int64()),
+        ('position_x', pa.float32()),
+        ('position_y', pa.float32()),
+        ('facing', pa.float32())
+    ])
+
+
+def _columns_to_table(pa, schema, columns: Dict[str, list]):
+    """Build an Arrow table (one row group) from buffered column lists."""
+    arrays = []
+    for field in schema:
+        if field.name in DICTIONARY_COLUMNS:
+            arrays.append(pa.array(columns[field.name], type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[field.name], type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def convert_log_to_store(log_file: Path, output_dir: Optional[Path] = None, force: bool = False) -> Optional[Path]:
+    """Convert one combat log into a Parquet event store (skipped if already current)."""
+    pa = import_pyarrow()
+    if pa is None:
+        return None
+
+    log_file = Path(log_file)
+    store_path = store_path_for_log(log_file, output_dir)
+    stat = log_file.stat()
+
+    if not force and store_is_current(store_path, log_file):
+        SafeLogger.info(f"Event store up to date: {store_path.name}")
+        return store_path
+
+    schema = _store_schema(pa)
+    decoder = CombatLogTimestampDecoder()
+    columns = {name: [] for name in STORE_COLUMNS}
+    row_group_end_ms = None
+    utc_offset_ms = None
+    rows_written = 0
+
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = store_path.with_name(store_path.name + '.tmp')
+    writer = pa.parquet.ParquetWriter(str(tmp_path), schema, compression='zstd')
+
+    try:
+        with open_combat_log(log_file) as f:
+            for line in f:
+                timestamp_ms = decoder.decode_ms(line)
+                if timestamp_ms is None or '  ' not in line:
+                    continue
+                if utc_offset_ms is None:
+                    utc_offset_ms = decoder.utc_offset_ms
+
+                # Close the row group once it covers ROW_GROUP_SECONDS of log time
+                if row_group_end_ms is None:
+                    row_group_end_ms = timestamp_ms + ROW_GROUP_SECONDS * 1000
+                elif timestamp_ms >= row_group_end_ms and columns['timestamp_ms']:
+                    writer.write_table(_columns_to_table(pa, schema, columns))
+                    rows_written += len(columns['timestamp_ms'])
+                    columns = {name: [] for name in STORE_COLUMNS}
+                    row_group_end_ms = timestamp_ms + ROW_GROUP_SECONDS * 1000
+
+                event_data = line.split('  ', 1)[1].rstrip('\r\n')
+                fields = next(csv.reader([event_data]))
+                if not fields:
+                    continue
+
+                row = parse_event_row(fields[0], fields)
+                columns['timestamp_ms'].append(timestamp_ms)
+                for name, value in row.items():
+                    columns[name].append(value)
+
+        if columns['timestamp_ms']:
+            writer.write_table(_columns_to_table(pa, schema, columns))
+            rows_written += len(columns['timestamp_ms'])
+
+        writer.add_key_value_metadata({
+            'store_version': STORE_VERSION,
+            'source_log': log_file.name,
+            'source_size': str(stat.st_size),
+            'source_mtime': repr(stat.st_mtime),
+            'utc_offset_ms': str(utc_offset_ms or 0)
+        })
+        writer.close()
+        tmp_path.replace(store_path)
+
+    except Exception as e:
+        writer.close()
+        tmp_path.unlink(missing_ok=True)
+        SafeLogger.error(f"Could not convert {log_file.name}: {e}")
+        return None
+
+    SafeLogger.success(f"Converted {log_file.name}: {rows_written:,} events -> {store_path.name}")
+    return store_path
+
+
+def read_store_metadata(store_path: Path) -> Dict[str, str]:
+    """Key/value metadata recorded at conversion time."""
+    pa = import_pyarrow()
+    if pa is None:
+        return {}
+    metadata = pa.parquet.ParquetFile(str(store_path)).metadata.metadata or {}
+    return {key.decode(): value.decode() for key, value in metadata.items()
+            if not key.startswith(b'ARROW:')}
+
+
+def store_is_current(store_path: Path, log_file: Path) -> bool:
+    """Check an event store was converted from the log as it is on disk now."""
+    if not Path(store_path).exists():
+        return False
+    try:
+        metadata = read_store_metadata(store_path)
+        stat = Path(log_file).stat()
+        return (metadata.get('store_version') == STORE_VERSION and
+                metadata.get('source_size') == str(stat.st_size) and
+                metadata.get('source_mtime') == repr(stat.st_mtime))
+    except Exception:
+        return False
+
+
+def _window_to_ms(value: Union[int, datetime, None], utc_offset_ms: int) -> Optional[int]:
+    """Accept epoch ms or a naive log-clock datetime (converted with the log's offset)."""
+    if value is None:
+        return None
+    if isinstance(value, numbers.Integral):
+        # numpy integers (e.g. from a window_bounds_ms array) are epoch ms too
+        return int(value)
+    decoder = CombatLogTimestampDecoder()
+    decoder.utc_offset_ms = utc_offset_ms
+    return int(decoder.log_time_to_ms(value))
+
+
+def load_event_window(store_path: Path, start: Union[int, datetime, None] = None,
+                      end: Union[int, datetime, None] = None, columns: Optional[List[str]] = None,
+                      event_types: Optional[List[str]] = None, as_pandas: bool = True):
+    """
+    Load events in [start, end] from an event store, reading only the needed columns
+    and the row groups whose timestamp range overlaps the window.
+
+    start/end may be UTC epoch ms or naive log-clock datetimes (as used by the parser).
+    """
+    pa = import_pyarrow()
+    if pa is None:
+        return None
+    import pyarrow.compute as pc
+
+    parquet_file = pa.parquet.ParquetFile(str(store_path))
+    metadata = read_store_metadata(store_path)
+    utc_offset_ms = int(metadata.get('utc_offset_ms', 0))
+    start_ms = _window_to_ms(start, utc_offset_ms)
+    end_ms = _window_to_ms(end, utc_offset_ms)
+
+    read_columns = list(columns) if columns else list(STORE_COLUMNS)
+    for required in ('timestamp_ms', 'event_type') if event_types else ('timestamp_ms',):
+        if required not in read_columns:
+            read_columns.append(required)
+
+    # Row group pruning using the timestamp_ms column statistics
+    timestamp_col = parquet_file.schema_arrow.get_field_index('timestamp_ms')
+    row_groups = []
+    for i in range(parquet_file.num_row_groups):
+        stats = parquet_file.metadata.row_group(i).column(timestamp_col).statistics
+        if stats is not None and stats.has_min_max:
+            if start_ms is not None and stats.max < start_ms:
+                continue
+            if end_ms is not None and stats.min > end_ms:
+                continue
+        row_groups.append(i)
+
+    if row_groups:
+        table = parquet_file.read_row_groups(row_groups, columns=read_columns)
+    else:
+        table = _store_schema(pa).empty_table().select(read_columns)
+
+    mask = None
+    if start_ms is not None:
+        mask = pc.greater_equal(table['timestamp_ms'], start_ms)
+    if end_ms is not None:
+        end_mask = pc.less_equal(table['timestamp_ms'], end_ms)
+        mask = end_mask if mask is None else pc.and_(mask, end_mask)
+    if event_types:
+        type_mask = pc.is_in(table['event_type'].cast(pa.string()), value_set=pa.array(event_types))
+        mask = type_mask if mask is None else pc.and_(mask, type_mask)
+    if mask is not None:
+        table = table.filter(mask)
+
+    if columns:
+        table = table.select(list(columns))
+
+    return table.to_pandas() if as_pandas else table
+
+
+def main():
+    """Convert combat logs to the columnar event store"""
+    parser = argparse.ArgumentParser(description="Columnar event store for WoW combat logs")
+    parser.add_argument('--convert', type=Path, required=True,
+                        help='Combat log file or directory of WoWCombatLog-*.txt files')
+    parser.add_argument('--output-dir', type=Path, help='Directory for .events.parquet files (default: next to logs)')
+    parser.add_argument('--force', action='store_true', help='Reconvert even if the store is current')
+    args = parser.parse_args()
+
+    if import_pyarrow() is None:
+        return 1
+
+    if args.convert.is_dir():
+        log_files = sorted(find_combat_logs(args.convert, 'WoWCombatLog-*.txt'))
+    else:
+        log_files = [args.convert]
+
+    SafeLogger.info(f"Converting {len(log_files)} combat log(s)")
+    failures = 0
+    for log_file in log_files:
+        if convert_log_to_store(log_file, args.output_dir, args.force) is None:
+            failures += 1
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
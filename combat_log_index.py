@@ -0,0 +1,220 @@
+"""
+Combat Log Time Index
+
+Persistent byte-offset index for WoWCombatLog files. Maps a one-second timestamp
+grid to the byte offset of the first line logged in that second, so time-window
+reads can seek straight to an arena match instead of scanning from the first line.
+
+The index is stored as a small JSON sidecar next to the log
+(WoWCombatLog-050625_182406.txt.tsidx.json) and is rebuilt automatically when the
+log's size or mtime no longer match the values recorded at build time.
+"""
+
+import bisect
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from combat_log_archive import iter_archive_window_lines
+from combat_log_io import (
+    MONOTONIC_TOLERANCE_S,
+    is_compressed_log,
+    open_combat_log,
+    parse_grid_second,
+    to_grid_second
+)
+
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.tsidx.json'
+
+
+class CombatLogTimeIndex:
+    """One-second timestamp grid -> byte offset index for a single combat log."""
+
+    def __init__(self, log_file: Path, log_size: int, log_mtime: float,
+                 seconds: List[int], offsets: List[int], monotonic: bool = True):
+        self.log_file = Path(log_file)
+        self.log_size = log_size
+        self.log_mtime = log_mtime
+        self.seconds = seconds
+        self.offsets = offsets
+        self.monotonic = monotonic
+
+    @staticmethod
+    def sidecar_path(log_file: Path) -> Path:
+        """Location of the index sidecar for a combat log."""
+        log_file = Path(log_file)
+        return log_file.with_name(log_file.name + INDEX_SUFFIX)
+
+    @classmethod
+    def load_or_build(cls, log_file: Path) -> 'CombatLogTimeIndex':
+        """Load the sidecar index if it is current, otherwise build and persist a new one."""
+        index = cls.load(log_file)
+        if index is not None and index.is_current():
+            return index
+
+        index = cls.build(log_file)
+        index.save()
+        return index
+
+    @classmethod
+    def load(cls, log_file: Path) -> Optional['CombatLogTimeIndex']:
+        """Load the sidecar index for a log, or None if missing/unreadable."""
+        index_path = cls.sidecar_path(log_file)
+        if not index_path.exists():
+            return None
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                return None
+            return cls(
+                log_file=log_file,
+                log_size=data['log_size'],
+                log_mtime=data['log_mtime'],
+                seconds=data['seconds'],
+                offsets=data['offsets'],
+                monotonic=data.get('monotonic', True)
+            )
+        except Exception:
+            return None
+
+    @classmethod
+    def build(cls, log_file: Path) -> 'CombatLogTimeIndex':
+        """Scan a combat log once and record the first byte offset of every logged second."""
+        log_file = Path(log_file)
+        stat = log_file.stat()
+
+        seconds = []
+        offsets = []
+        monotonic = True
+        last_second = None
+        date_cache: Dict[bytes, int] = {}
+
+        offset = 0
+        with open(log_file, 'rb') as f:
+            for raw_line in f:
+                line_second = parse_grid_second(raw_line, date_cache)
+                if line_second is not None:
+                    if last_second is None or line_second > last_second:
+                        seconds.append(line_second)
+                        offsets.append(offset)
+                        last_second = line_second
+                    elif line_second < last_second - MONOTONIC_TOLERANCE_S:
+                        monotonic = False
+                offset += len(raw_line)
+
+        return cls(log_file, stat.st_size, stat.st_mtime, seconds, offsets, monotonic)
+
+    def save(self):
+        """Persist the index next to the log (best effort - logs dir may be read-only)."""
+        index_path = self.sidecar_path(self.log_file)
+        data = {
+            'version': INDEX_VERSION,
+            'log_file': self.log_file.name,
+            'log_size': self.log_size,
+            'log_mtime': self.log_mtime,
+            'monotonic': self.monotonic,
+            'seconds': self.seconds,
+            'offsets': self.offsets
+        }
+        try:
+            tmp_path = index_path.with_name(index_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, index_path)
+        except Exception as e:
+            print(f"WARNING: Could not save time index for {self.log_file.name}: {e}")
+
+    def is_current(self) -> bool:
+        """Check the index still describes the log on disk (size and mtime)."""
+        try:
+            stat = self.log_file.stat()
+        except OSError:
+            return False
+        return stat.st_size == self.log_size and stat.st_mtime == self.log_mtime
+
+    def byte_range(self, start_time: datetime, end_time: datetime) -> Optional[tuple]:
+        """
+        Byte range [start, end) that contains every line timestamped within the window.
+
+        Returns None when the log is not monotonic and cannot be range-read safely.
+        """
+        if not self.monotonic:
+            return None
+
+        start_second = to_grid_second(start_time) - MONOTONIC_TOLERANCE_S
+        end_second = to_grid_second(end_time) + MONOTONIC_TOLERANCE_S
+
+        start_pos = bisect.bisect_left(self.seconds, start_second)
+        end_pos = bisect.bisect_right(self.seconds, end_second)
+
+        start_offset = self.offsets[start_pos] if start_pos < len(self.offsets) else self.log_size
+        end_offset = self.offsets[end_pos] if end_pos < len(self.offsets) else self.log_size
+        return start_offset, end_offset
+
+    def iter_window_lines(self, start_time: datetime, end_time: datetime) -> Iterator[str]:
+        """
+        Yield decoded lines from the part of the log covering [start_time, end_time].
+
+        The range is padded by the monotonic tolerance, so callers must still apply
+        their own timestamp comparison to each line.
+        """
+        byte_range = self.byte_range(start_time, end_time)
+        if byte_range is None:
+            yield from _iter_all_lines(self.log_file)
+            return
+
+        start_offset, end_offset = byte_range
+        if start_offset >= end_offset:
+            return
+
+        with open(self.log_file, 'rb') as f:
+            f.seek(start_offset)
+            position = start_offset
+            for raw_line in f:
+                if position >= end_offset:
+                    break
+                position += len(raw_line)
+                yield raw_line.decode('utf-8', errors='ignore')
+
+
+def _iter_all_lines(log_file: Path) -> Iterator[str]:
+    """Fallback full read, matching the parser's historic open() settings."""
+    with open_combat_log(log_file) as f:
+        yield from f
+
+
+# Process-level cache so repeated window reads of the same log share one index
+_INDEX_CACHE: Dict[str, CombatLogTimeIndex] = {}
+
+
+def get_time_index(log_file: Path) -> CombatLogTimeIndex:
+    """Return a current time index for the log, loading or building it once per process."""
+    key = str(log_file)
+    index = _INDEX_CACHE.get(key)
+    if index is None or not index.is_current():
+        index = CombatLogTimeIndex.load_or_build(Path(log_file))
+        _INDEX_CACHE[key] = index
+    return index
+
+
+def iter_log_window_lines(log_file: Path, start_time: datetime, end_time: datetime) -> Iterator[str]:
+    """Yield the lines of a combat log that may fall inside [start_time, end_time]."""
+    # Archived logs are range-read through their frame index instead of a byte-offset index
+    if is_compressed_log(log_file):
+        yield from iter_archive_window_lines(Path(log_file), start_time, end_time)
+        return
+
+    try:
+        index = get_time_index(log_file)
+    except Exception as e:
+        print(f"WARNING: Time index unavailable for {Path(log_file).name}, full scan: {e}")
+        yield from _iter_all_lines(Path(log_file))
+        return
+
+    yield from index.iter_window_lines(start_time, end_time)
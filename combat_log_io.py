@@ -0,0 +1,318 @@
+"""
+Combat Log I/O
+
+Primitives shared by every module that reads combat logs: opening raw and archived
+(.txt.zst/.txt.gz) logs, the fast timestamp decoder, and the whole-second "grid" parsing
+the byte-offset and frame indexes are keyed on.
+
+This module imports nothing from the repo, so the index, archive, catalog and
+development_standards modules all import it at module level.
+"""
+
+import gzip
+import io
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Compression suffix -> codec name
+COMPRESSED_SUFFIXES = {'.zst': 'zst', '.gz': 'gz'}
+
+# Tolerated backwards clock movement (seconds) before a log is treated as non-monotonic
+MONOTONIC_TOLERANCE_S = 2
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MS = timedelta(milliseconds=1)
+_MS_PER_HOUR = 3600000
+
+
+def import_zstandard():
+    """Import zstandard lazily so gzip archives and raw logs work without it."""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        print("ERROR: zstandard not installed - run: pip install zstandard")
+        return None
+
+
+def log_codec(log_file: Path) -> Optional[str]:
+    """Codec of a combat log from its suffix ('zst', 'gz'), or None for a raw log."""
+    return COMPRESSED_SUFFIXES.get(Path(log_file).suffix.lower())
+
+
+def is_compressed_log(log_file: Path) -> bool:
+    """True for .txt.zst/.txt.gz archives."""
+    return log_codec(log_file) is not None
+
+
+def find_combat_logs(logs_dir: Path, pattern: str = '*.txt') -> List[Path]:
+    """
+    Combat logs in a directory matching pattern, raw or archived.
+
+    An archive is skipped when its raw log is still next to it, so a log is never
+    processed twice while it is being archived.
+    """
+    logs_dir = Path(logs_dir)
+    log_files = list(logs_dir.glob(pattern))
+    raw_names = {log_file.name for log_file in log_files}
+
+    for suffix in COMPRESSED_SUFFIXES:
+        for archive in logs_dir.glob(pattern + suffix):
+            if archive.name[:-len(suffix)] not in raw_names:
+                log_files.append(archive)
+    return log_files
+
+
+def _open_binary_stream(log_file: Path):
+    codec = log_codec(log_file)
+    if codec == 'gz':
+        return gzip.open(log_file, 'rb')
+
+    zstandard = import_zstandard()
+    if zstandard is None:
+        raise ImportError(f"zstandard is required to read {Path(log_file).name}")
+    return zstandard.ZstdDecompressor().stream_reader(open(log_file, 'rb'), read_across_frames=True)
+
+
+def open_combat_log(log_file: Path, mode: str = 'r', encoding: str = 'utf-8'):
+    """
+    Open a raw or compressed combat log for sequential reading.
+
+    mode 'r' gives text with the parser's usual settings (errors='ignore'); 'rb' gives
+    the decompressed bytes.
+    """
+    if not is_compressed_log(log_file):
+        if mode == 'rb':
+            return open(log_file, 'rb')
+        return open(log_file, 'r', encoding=encoding, errors='ignore')
+
+    stream = _open_binary_stream(log_file)
+    if mode == 'rb':
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding, errors='ignore')
+
+
+def to_grid_second(when: datetime) -> int:
+    """Convert a naive log-clock datetime to an integer grid second."""
+    return int((when - _EPOCH).total_seconds() // 1)
+
+
+def parse_grid_second(raw_line: bytes, date_cache: Dict[bytes, int]) -> Optional[int]:
+    """Parse the grid second of a raw log line ("5/6/2025 22:14:29.304-4  ...")."""
+    space = raw_line.find(b' ')
+    if space <= 0:
+        return None
+
+    date_part = raw_line[:space]
+    day_second = date_cache.get(date_part)
+    if day_second is None:
+        try:
+            month, day, year = date_part.split(b'/')
+            day_second = to_grid_second(datetime(int(year), int(month), int(day)))
+        except ValueError:
+            return None
+        date_cache[date_part] = day_second
+
+    # "HH:MM:SS.fff-4" - hour may be a single digit, fraction and timezone are optional
+    time_part = raw_line[space + 1:space + 16].split(b'.', 1)[0].split(b'-', 1)[0].split(b' ', 1)[0]
+    try:
+        hour, minute, second = time_part.split(b':')
+        return day_second + int(hour) * 3600 + int(minute) * 60 + int(second)
+    except ValueError:
+        return None
+
+
+class CombatLogTimestampDecoder:
+    """
+    Fast decoder for combat log timestamps ("5/6/2025 22:14:29.304-4").
+
+    Caches the M/D/YYYY date prefix and the timezone suffix, and reads HH:MM:SS.fff by
+    fixed-offset slicing, so the common line costs a few integer conversions instead of
+    a datetime.strptime call. decode_ms() returns UTC epoch milliseconds with the
+    timezone suffix applied; datetime objects are only built for lines that are kept.
+    Lines that do not match the fixed layout fall back to the strptime parser.
+    """
+
+    def __init__(self):
+        self._date_prefix = None
+        self._date_ms = 0
+        self._date_parts = (1970, 1, 1)
+        self._tz_text = None
+        self._tz_offset_ms = 0
+
+        # Second-level cache for the hot path: "5/6/2025 22:14:29" -> UTC ms of that second
+        self._second_key = None
+        self._second_key_len = 0
+        self._second_utc_ms = 0
+        self._tz_suffix = ''
+        self._tz_len = 0
+
+        # UTC offset of the most recently decoded line ("-4" -> -14400000)
+        self.utc_offset_ms = 0
+
+    def decode_ms(self, line: str) -> Optional[int]:
+        """UTC epoch milliseconds for a combat log line, or None if it has no timestamp."""
+        # Hot path: same second as the previous line ("5/6/2025 22:14:29" + ".fff" + tz)
+        key_len = self._second_key_len
+        if key_len and line.startswith(self._second_key) and line[key_len:key_len + 1] == '.':
+            millis_text = line[key_len + 1:key_len + 4]
+            tz_start = key_len + 4
+            tz_end = tz_start + self._tz_len
+            if (millis_text.isdigit() and line[tz_start:tz_end] == self._tz_suffix
+                    and line[tz_end:tz_end + 1] == ' '):
+                return self._second_utc_ms + int(millis_text)
+
+        local = self._decode_local(line)
+        if local is None:
+            return None
+        return local[0] - self.utc_offset_ms
+
+    def decode_datetime(self, line: str) -> Optional[datetime]:
+        """Naive log-clock datetime for a line (same result as the strptime parser)."""
+        local = self._decode_local(line)
+        if local is None:
+            return None
+
+        local_ms, micro = local
+        if micro is not None:
+            year, month, day = self._date_parts
+            day_ms = local_ms - self._date_ms
+            return datetime(year, month, day, day_ms // _MS_PER_HOUR, (day_ms // 60000) % 60,
+                            (day_ms // 1000) % 60, micro)
+        return parse_combat_log_timestamp_strptime(line)
+
+    def log_time_to_ms(self, log_time: datetime) -> float:
+        """Convert a naive log-clock datetime to UTC epoch milliseconds (may be fractional)."""
+        return (log_time - _EPOCH) / _ONE_MS - self.utc_offset_ms
+
+    def window_bounds_ms(self, start_time: datetime, end_time: datetime) -> Tuple[int, int]:
+        """Integer bounds so that start <= t <= end becomes start_ms <= decode_ms(line) <= end_ms."""
+        return math.ceil(self.log_time_to_ms(start_time)), math.floor(self.log_time_to_ms(end_time))
+
+    def ms_to_log_time(self, epoch_ms: int) -> datetime:
+        """Convert UTC epoch milliseconds back to a naive log-clock datetime."""
+        return _EPOCH + timedelta(milliseconds=epoch_ms + self.utc_offset_ms)
+
+    def _decode_local(self, line: str) -> Optional[Tuple[int, Optional[int]]]:
+        """Return (local epoch ms, microsecond or None for fallback-parsed lines)."""
+        space = line.find(' ')
+        if space <= 0:
+            return self._decode_fallback(line)
+
+        date_prefix = line[:space]
+        if date_prefix != self._date_prefix:
+            try:
+                month, day, year = date_prefix.split('/')
+                date_parts = (int(year), int(month), int(day))
+                date_ms = (datetime(*date_parts) - _EPOCH) // _ONE_MS
+            except ValueError:
+                return self._decode_fallback(line)
+            self._date_prefix = date_prefix
+            self._date_parts = date_parts
+            self._date_ms = date_ms
+
+        # Fixed layout "HH:MM:SS.fff" followed by an optional timezone suffix
+        t = space + 1
+        if (line[t + 2:t + 3] != ':' or line[t + 5:t + 6] != ':' or line[t + 8:t + 9] != '.'
+                or line[t + 12:t + 13].isdigit()):
+            return self._decode_fallback(line)
+        try:
+            hour = int(line[t:t + 2])
+            minute = int(line[t + 3:t + 5])
+            second = int(line[t + 6:t + 8])
+            millis = int(line[t + 9:t + 12])
+        except ValueError:
+            return self._decode_fallback(line)
+        if hour > 23 or minute > 59 or second > 59:
+            return self._decode_fallback(line)
+
+        tz_start = t + 12
+        tz_char = line[tz_start:tz_start + 1]
+        tz_text = ''
+        if tz_char == '-' or tz_char == '+':
+            tz_end = line.find(' ', tz_start)
+            tz_text = line[tz_start:tz_end] if tz_end != -1 else line[tz_start:].rstrip()
+            if tz_text != self._tz_text:
+                try:
+                    self._tz_offset_ms = int(float(tz_text) * _MS_PER_HOUR)
+                except ValueError:
+                    return self._decode_fallback(line)
+                self._tz_text = tz_text
+            self.utc_offset_ms = self._tz_offset_ms
+        elif tz_char.strip():
+            return self._decode_fallback(line)
+        else:
+            self.utc_offset_ms = 0
+
+        second_local_ms = self._date_ms + hour * _MS_PER_HOUR + minute * 60000 + second * 1000
+
+        # Remember this second for the hot path in decode_ms
+        self._second_key = line[:t + 8]
+        self._second_key_len = t + 8
+        self._second_utc_ms = second_local_ms - self.utc_offset_ms
+        self._tz_suffix = tz_text
+        self._tz_len = len(tz_text)
+
+        return second_local_ms + millis, millis * 1000
+
+    def _decode_fallback(self, line: str) -> Optional[Tuple[int, Optional[int]]]:
+        """Slow path for lines outside the fixed layout - delegates to the strptime parser."""
+        timestamp = parse_combat_log_timestamp_strptime(line)
+        if timestamp is None:
+            return None
+
+        tz_offset_ms = 0
+        parts = line.strip().split(None, 2)
+        time_token = parts[1] if len(parts) >= 2 else ''
+        for sign in ('-', '+'):
+            if sign in time_token:
+                try:
+                    tz_offset_ms = int(float(sign + time_token.split(sign, 1)[1]) * _MS_PER_HOUR)
+                except ValueError:
+                    tz_offset_ms = 0
+                break
+        self.utc_offset_ms = tz_offset_ms
+        return (timestamp - _EPOCH) // _ONE_MS, None
+
+
+def parse_combat_log_timestamp_strptime(line: str) -> Optional[datetime]:
+    """
+    Reference strptime-based timestamp parser (original implementation).
+    Kept as the decoder's fallback and as the micro-benchmark baseline.
+    """
+    try:
+        parts = line.strip().split(None, 2)
+        if len(parts) < 2:
+            return None
+
+        # Extract timestamp portion (before first comma or space)
+        full_timestamp = f"{parts[0]} {parts[1]}"
+        timestamp_clean = full_timestamp.split('-')[0].strip()  # Remove timezone
+
+        # Try microseconds first, then seconds only
+        try:
+            return datetime.strptime(timestamp_clean, "%m/%d/%Y %H:%M:%S.%f")
+        except ValueError:
+            try:
+                return datetime.strptime(timestamp_clean, "%m/%d/%Y %H:%M:%S")
+            except ValueError:
+                return None
+    except Exception:
+        return None
+
+
+_TIMESTAMP_DECODER = CombatLogTimestampDecoder()
+
+
+def parse_combat_log_timestamp(line: str) -> Optional[datetime]:
+    """
+    Standard method for parsing WoW combat log timestamps
+    Handles formats: "5/6/2025 22:14:29.304-4" and variations
+    """
+    try:
+        return _TIMESTAMP_DECODER.decode_datetime(line)
+    except Exception:
+        return None
@@ -0,0 +1,179 @@
+"""
+Combat Log Positions
+
+Bulk extraction of the unit positions carried by advanced-logging events. Instead of a
+dict per position sample, a match's samples are decoded straight into NumPy arrays:
+
+    timestamp_ms  int64    UTC epoch milliseconds (CombatLogTimestampDecoder.decode_ms)
+    unit          int32    index into units - the advanced-info unit GUIDs, interned
+    x, y          float64  world coordinates
+    facing        float32  radians (NaN when the field is not a number)
+
+Field positions come from COORDINATE_EVENTS, the table validated against real arena
+logs. Like extract_validated_coordinates, positions and field counts are counted in raw
+commas, coordinates must look like ####.## and the range check drops |x| or |y| >= 50000
+and (0, 0) samples - the range check runs as one vector operation over the whole match.
+"""
+
+import re
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from combat_log_io import CombatLogTimestampDecoder
+
+
+# Event type -> x/y field positions and the field count of a line that carries them
+COORDINATE_EVENTS = {
+    'SPELL_CAST_SUCCESS': {'params': (26, 27), 'count': 31},
+    'SPELL_HEAL': {'params': (26, 27), 'count': 36},
+    'SPELL_DAMAGE': {'params': (26, 27), 'count': 42},
+    'SPELL_PERIODIC_DAMAGE': {'params': (26, 27), 'count': 42},
+    'DAMAGE_SPLIT': {'params': (26, 27), 'count': 42},
+    'SPELL_ENERGIZE': {'params': (26, 27), 'count': 35},
+    'SPELL_PERIODIC_HEAL': {'params': (26, 27), 'count': 36},
+    'SPELL_PERIODIC_ENERGIZE': {'params': (26, 27), 'count': 35},
+    'SPELL_DRAIN': {'params': (26, 27), 'count': 35},
+    'SWING_DAMAGE': {'params': (23, 24), 'count': 38},
+    'SWING_DAMAGE_LANDED': {'params': (23, 24), 'count': 38}
+}
+
+# Advanced-info block: the unit GUID sits 14 fields before x, facing 3 fields after it
+# (x, y, uiMapID, facing)
+UNIT_FIELD_OFFSET = 14
+FACING_FIELD_OFFSET = 3
+
+COORDINATE_FORMAT = re.compile(r'-?\d+\.\d{2}')
+COORDINATE_LIMIT = 50000.0
+MIN_COORDINATE = 0.01
+
+DEFAULT_CAPACITY = 4096
+
+
+class PositionArrays:
+    """Position samples of one match as parallel arrays."""
+
+    def __init__(self, timestamp_ms: np.ndarray, unit: np.ndarray, x: np.ndarray, y: np.ndarray,
+                 facing: np.ndarray, units: List[str]):
+        self.timestamp_ms = timestamp_ms
+        self.unit = unit
+        self.x = x
+        self.y = y
+        self.facing = facing
+        self.units = units
+
+    def __len__(self) -> int:
+        return len(self.timestamp_ms)
+
+    def take(self, selector) -> 'PositionArrays':
+        """Subset by boolean mask or index array (units are kept as they are)."""
+        return PositionArrays(self.timestamp_ms[selector], self.unit[selector], self.x[selector],
+                              self.y[selector], self.facing[selector], self.units)
+
+    def unit_id(self, guid: str) -> Optional[int]:
+        """Interned id of a unit GUID, or None if it has no samples."""
+        try:
+            return self.units.index(guid)
+        except ValueError:
+            return None
+
+    def for_unit(self, guid: str) -> 'PositionArrays':
+        """Samples of one unit, in log order."""
+        unit_id = self.unit_id(guid)
+        if unit_id is None:
+            return self.take(np.zeros(len(self), dtype=bool))
+        return self.take(self.unit == unit_id)
+
+
+def _event_layouts(coordinate_events: dict) -> dict:
+    """Event type -> (x, y, unit, facing, last field to split, expected comma count)."""
+    layouts = {}
+    for event_type, event_info in coordinate_events.items():
+        x_idx, y_idx = event_info['params']
+        facing_idx = x_idx + FACING_FIELD_OFFSET
+        layouts[event_type] = (x_idx, y_idx, max(0, x_idx - UNIT_FIELD_OFFSET), facing_idx,
+                               max(y_idx, facing_idx) + 1, event_info['count'] - 1)
+    return layouts
+
+
+def extract_position_arrays(lines: Iterable[str], coordinate_events: dict = None,
+                            capacity: int = DEFAULT_CAPACITY, start_time: Optional[datetime] = None,
+                            end_time: Optional[datetime] = None) -> PositionArrays:
+    """
+    Decode the position samples of a sequence of log lines (typically one match window).
+
+    Lines are rejected on their event token and comma count before any split, and only
+    the fields up to facing are split. Arrays start at capacity samples and double as
+    needed; the result is trimmed to the samples that pass the range check and, when
+    start_time/end_time are given, fall inside [start_time, end_time] - window readers
+    such as iter_log_window_lines pad their byte range, so the caller's lines may not.
+    """
+    layouts = _event_layouts(coordinate_events or COORDINATE_EVENTS)
+    is_coordinate = COORDINATE_FORMAT.fullmatch
+    decoder = CombatLogTimestampDecoder()
+
+    capacity = max(1, capacity)
+    timestamp_ms = np.empty(capacity, dtype=np.int64)
+    unit = np.empty(capacity, dtype=np.int32)
+    x = np.empty(capacity, dtype=np.float64)
+    y = np.empty(capacity, dtype=np.float64)
+    facing = np.empty(capacity, dtype=np.float32)
+    unit_ids = {}
+    count = 0
+
+    for line in lines:
+        separator = line.find('  ')
+        if separator < 0:
+            continue
+        token_start = separator + 2
+        token_end = line.find(',', token_start)
+        layout = layouts.get(line[token_start:token_end])
+        if layout is None:
+            continue
+        x_idx, y_idx, unit_idx, facing_idx, split_fields, expected_commas = layout
+        if line.count(',', token_start) != expected_commas:
+            continue
+
+        fields = line[token_start:].split(',', split_fields)
+        x_text = fields[x_idx].strip()
+        y_text = fields[y_idx].strip()
+        if not (is_coordinate(x_text) and is_coordinate(y_text)):
+            continue
+        line_ms = decoder.decode_ms(line)
+        if line_ms is None:
+            continue
+
+        if count == capacity:
+            capacity *= 2
+            timestamp_ms = np.resize(timestamp_ms, capacity)
+            unit = np.resize(unit, capacity)
+            x = np.resize(x, capacity)
+            y = np.resize(y, capacity)
+            facing = np.resize(facing, capacity)
+
+        guid = fields[unit_idx].strip()
+        unit_id = unit_ids.get(guid)
+        if unit_id is None:
+            unit_id = unit_ids[guid] = len(unit_ids)
+
+        timestamp_ms[count] = line_ms
+        unit[count] = unit_id
+        x[count] = float(x_text)
+        y[count] = float(y_text)
+        try:
+            facing[count] = float(fields[facing_idx])
+        except ValueError:
+            facing[count] = np.nan
+        count += 1
+
+    abs_x = np.abs(x[:count])
+    abs_y = np.abs(y[:count])
+    valid = ((abs_x < COORDINATE_LIMIT) & (abs_y < COORDINATE_LIMIT)
+             & ((abs_x > MIN_COORDINATE) | (abs_y > MIN_COORDINATE)))
+    if start_time is not None and end_time is not None:
+        start_ms, end_ms = decoder.window_bounds_ms(start_time, end_time)
+        valid &= (timestamp_ms[:count] >= start_ms) & (timestamp_ms[:count] <= end_ms)
+
+    return PositionArrays(timestamp_ms[:count][valid], unit[:count][valid], x[:count][valid],
+                          y[:count][valid], facing[:count][valid], list(unit_ids))
@@ -0,0 +1,164 @@
+"""
+Combat Log Marker Scanner
+
+Memory-mapped scanner for the handful of marker events (ARENA_MATCH_START,
+ARENA_MATCH_END, UNIT_DIED, SPELL_SUMMON, ZONE_CHANGE, ...) that boundary detection
+and pet discovery care about. Instead of decoding every line to str and running
+substring tests, it runs bytes.find over the raw file buffer, backs up to the start
+of each hit's line and decodes only the matching lines.
+
+Archived logs (.txt.zst/.txt.gz) cannot be memory-mapped; they are decompressed as a
+stream and scanned in line-aligned blocks, reporting offsets in the raw log.
+"""
+
+import mmap
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from combat_log_io import is_compressed_log, open_combat_log
+
+
+# Newline counting is done in chunks so huge gaps between hits never copy the whole file
+_COUNT_CHUNK = 16 * 1024 * 1024
+
+# Decompressed bytes scanned per block for archived logs
+_STREAM_BLOCK = 16 * 1024 * 1024
+
+
+class MarkerLine(NamedTuple):
+    """A log line containing at least one marker token."""
+    offset: int               # byte offset of the line start
+    next_offset: int          # byte offset of the following line
+    line_num: Optional[int]   # 1-based line number (only when counted)
+    text: str                 # decoded line without its line terminator
+
+
+def _count_newlines(buf, start: int, end: int) -> int:
+    count = 0
+    for chunk_start in range(start, end, _COUNT_CHUNK):
+        count += buf[chunk_start:min(chunk_start + _COUNT_CHUNK, end)].count(b'\n')
+    return count
+
+
+def _line_limit_offset(buf, start: int, max_lines: int) -> int:
+    """Byte offset just past the first max_lines lines that begin at start."""
+    position = start
+    for _ in range(max_lines):
+        newline = buf.find(b'\n', position)
+        if newline < 0:
+            return len(buf)
+        position = newline + 1
+    return position
+
+
+def scan_marker_lines(buf, markers: Iterable[bytes], start_offset: int = 0, end_offset: Optional[int] = None,
+                      max_lines: Optional[int] = None, count_lines: bool = False) -> Iterator[MarkerLine]:
+    """
+    Yield every line of a bytes-like buffer that contains any of the marker tokens.
+
+    start_offset/end_offset must fall on line boundaries. max_lines restricts the scan
+    to the first max_lines lines from start_offset.
+    """
+    size = len(buf)
+    limit = size if end_offset is None else min(end_offset, size)
+    if max_lines is not None:
+        limit = min(limit, _line_limit_offset(buf, start_offset, max_lines))
+
+    next_hits = {marker: buf.find(marker, start_offset, limit) for marker in markers}
+
+    line_num = 1
+    counted_to = 0
+
+    while True:
+        hits = [hit for hit in next_hits.values() if hit >= 0]
+        if not hits:
+            return
+        hit = min(hits)
+
+        line_start = max(buf.rfind(b'\n', start_offset, hit) + 1, start_offset)
+        line_end = buf.find(b'\n', hit, size)
+        next_offset = size if line_end < 0 else line_end + 1
+
+        if count_lines:
+            line_num += _count_newlines(buf, counted_to, line_start)
+            counted_to = line_start
+
+        text = buf[line_start:next_offset].decode('utf-8', errors='ignore').rstrip('\r\n')
+        yield MarkerLine(line_start, next_offset, line_num if count_lines else None, text)
+
+        if next_offset >= limit:
+            return
+
+        # Any marker that also occurred later on the same line is searched again past it
+        for marker, marker_hit in next_hits.items():
+            if 0 <= marker_hit < next_offset:
+                next_hits[marker] = buf.find(marker, next_offset, limit)
+
+
+def scan_marker_stream(stream, markers: List[bytes], start_offset: int = 0, end_offset: Optional[int] = None,
+                       max_lines: Optional[int] = None, count_lines: bool = False) -> Iterator[MarkerLine]:
+    """
+    scan_marker_lines over a binary stream, one line-aligned block at a time.
+
+    Offsets and line numbers are reported relative to the start of the stream.
+    """
+    base = 0           # stream offset of block[0]
+    lines_before = 0   # newlines before block[0]
+    lines_scanned = 0  # newlines between start_offset and block[0]
+    carry = b''
+
+    while True:
+        data = stream.read(_STREAM_BLOCK)
+        if data:
+            block = carry + data
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                carry = block
+                continue
+            block, carry = block[:cut], block[cut:]
+        else:
+            block, carry = carry, b''
+            if not block:
+                return
+
+        block_end = base + len(block)
+        if block_end > start_offset:
+            local_start = max(start_offset - base, 0)
+            local_end = None if end_offset is None else end_offset - base
+            local_max = None if max_lines is None else max_lines - lines_scanned
+            if (local_end is not None and local_end <= 0) or (local_max is not None and local_max <= 0):
+                return
+
+            for marker_line in scan_marker_lines(block, markers, local_start, local_end, local_max, count_lines):
+                yield MarkerLine(marker_line.offset + base, marker_line.next_offset + base,
+                                 marker_line.line_num + lines_before if count_lines else None, marker_line.text)
+
+            if max_lines is not None:
+                lines_scanned += block.count(b'\n', local_start)
+
+        if count_lines:
+            lines_before += block.count(b'\n')
+        base = block_end
+        if not data:
+            return
+
+
+def iter_marker_lines(log_file: Path, markers: Iterable[Union[str, bytes]], start_offset: int = 0,
+                      end_offset: Optional[int] = None, max_lines: Optional[int] = None,
+                      count_lines: bool = False) -> Iterator[MarkerLine]:
+    """Memory-map a combat log and yield the lines containing any of the marker tokens."""
+    markers = [marker.encode('utf-8') if isinstance(marker, str) else marker for marker in markers]
+
+    if is_compressed_log(log_file):
+        with open_combat_log(log_file, 'rb') as stream:
+            yield from scan_marker_stream(stream, markers, start_offset, end_offset, max_lines, count_lines)
+        return
+
+    with open(log_file, 'rb') as f:
+        # mmap cannot map an empty file
+        f.seek(0, 2)
+        if f.tell() == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield from scan_marker_lines(buf, markers, start_offset, end_offset, max_lines, count_lines)
@@ -13,7 +13,7 @@ def import_parser_functions():
     try:
         # Import from existing enhanced parser
         from enhanced_combat_parser_production_ENHANCED import (
-            EnhancedCombatParser, 
+            EnhancedProductionCombatParser,
             main as production_main
         )
         from run_enhanced_parser_selective import main as selective_main
@@ -21,7 +21,7 @@ def import_parser_functions():
         return {
             'production_main': production_main,
             'selective_main': selective_main,
-            'EnhancedCombatParser': EnhancedCombatParser
+            'EnhancedProductionCombatParser': EnhancedProductionCombatParser
         }
     except ImportError as e:
         print(f"ERROR: Missing required parser modules: {e}")
@@ -52,6 +52,24 @@ def test_specific_features(test_type: str = 'all'):
         return False
     return True
 
+def follow_live_log(args) -> int:
+    """Tail the newest combat log and write a feature row as each arena match ends"""
+    try:
+        from live_combat_parser import main as follow_main
+    except ImportError:
+        print("ERROR: Live follow module not found")
+        return 1
+
+    follow_argv = ['--base-dir', args.base_dir, '--logs-dir', args.logs_dir, '--output', args.output,
+                   '--poll-interval', str(args.poll_interval)]
+    if args.player:
+        follow_argv += ['--player', args.player]
+    if args.from_start:
+        follow_argv.append('--from-start')
+    if args.extractors:
+        follow_argv += ['--extractors', args.extractors]
+    return follow_main(follow_argv)
+
 def main():
     """Main unified parser interface"""
     parser = argparse.ArgumentParser(
@@ -60,7 +78,11 @@ def main():
         epilog="""
 Examples:
   %(prog)s --mode production                    # Run full production parser
+  %(prog)s --mode production --workers 16       # Production parser on 16 processes
+  %(prog)s --mode production --extractors casts,interrupts   # Only these feature columns
+  %(prog)s --mode production --metrics run.jsonl --profile-rate 0.05   # Stage timings, 5%% profiled
   %(prog)s --mode selective                     # Run selective parsing menu
+  %(prog)s --mode follow --logs-dir Logs        # Live rows as arena matches end
   %(prog)s --mode debug --match match.mp4      # Debug specific match
   %(prog)s --mode test --feature timestamps    # Test specific features
   %(prog)s --mode validate                      # Validate parser setup
@@ -68,7 +90,7 @@ Examples:
     )
     
     parser.add_argument('--mode', 
-                       choices=['production', 'selective', 'debug', 'test', 'validate'],
+                       choices=['production', 'selective', 'follow', 'debug', 'test', 'validate'],
                        required=True,
                        help='Parser operation mode')
     
@@ -84,6 +106,49 @@ Examples:
                        action='store_true',
                        help='Enable detailed logging for debug mode')
     
+    parser.add_argument('--workers', 
+                       type=int,
+                       default=1,
+                       help='Worker processes for production/selective modes (shards by combat log)')
+    
+    parser.add_argument('--extractors', 
+                       help='Production/follow modes: comma-separated feature extractors to run (default: all default ones)')
+    
+    parser.add_argument('--metrics', 
+                       nargs='?',
+                       const='',
+                       help='Production mode: append per-stage timings and counters as JSONL '
+                            '(default path: parser_metrics.jsonl in the data directory)')
+    
+    parser.add_argument('--profile-rate', 
+                       type=float,
+                       default=0.0,
+                       help='Production mode with --metrics: fraction of matches to run under cProfile')
+    
+    parser.add_argument('--base-dir', 
+                       default='.',
+                       help='Follow mode: directory holding player_pet_index.json')
+    
+    parser.add_argument('--logs-dir', 
+                       default='Logs',
+                       help='Follow mode: directory WoW writes combat logs to')
+    
+    parser.add_argument('--output', 
+                       default='match_features_live.csv',
+                       help='Follow mode: CSV to append match rows to')
+    
+    parser.add_argument('--player', 
+                       help='Follow mode: log owner character name (default: detect from unit flags)')
+    
+    parser.add_argument('--poll-interval', 
+                       type=float,
+                       default=1.0,
+                       help='Follow mode: seconds between polls when the log is idle')
+    
+    parser.add_argument('--from-start', 
+                       action='store_true',
+                       help='Follow mode: process the newest log from its beginning')
+    
     args = parser.parse_args()
     
     # Load parser functions
@@ -97,11 +162,18 @@ Examples:
     try:
         if args.mode == 'production':
             print("Running production parser...")
-            parser_funcs['production_main']()
+            extractors = args.extractors.split(',') if args.extractors else None
+            parser_funcs['production_main'](workers=args.workers, extractors=extractors,
+                                            metrics=args.metrics, profile_rate=args.profile_rate)
             
         elif args.mode == 'selective':
             print("Running selective parser menu...")
-            parser_funcs['selective_main']()
+            parser_funcs['selective_main'](workers=args.workers)
+            
+        elif args.mode == 'follow':
+            print(f"Following newest combat log in {args.logs_dir} (Ctrl+C to stop)...")
+            if follow_live_log(args):
+                return 1
             
         elif args.mode == 'debug':
             if not args.match:
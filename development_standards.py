@@ -11,6 +11,11 @@ from pathlib import Path
 from typing import Optional, Tuple, List, Dict
 import traceback
 
+from arena_segment_catalog import death_counts_from_segment, get_segment_catalog
+from combat_log_catalog import get_log_catalog
+from combat_log_index import iter_log_window_lines
+from combat_log_io import find_combat_logs, open_combat_log, parse_combat_log_timestamp
+
 
 class SafeLogger:
     """Safe logging for arena analysis system - no Unicode characters"""
@@ -37,41 +42,76 @@ class SafeLogger:
             print(f"DEBUG: {message}")
 
 
-def parse_combat_log_timestamp(line: str) -> Optional[datetime]:
+def get_combat_log_event_type(line: str) -> str:
+    """Event token sliced right after the double-space timestamp separator ('' if absent)."""
+    separator = line.find('  ')
+    if separator < 0:
+        return ''
+    token_start = separator + 2
+    token_end = line.find(',', token_start)
+    return line[token_start:token_end] if token_end >= 0 else line[token_start:].strip()
+
+
+def split_combat_log_fields(text: str, max_fields: Optional[int] = None) -> List[str]:
     """
-    Standard method for parsing WoW combat log timestamps
-    Handles formats: "5/6/2025 22:14:29.304-4" and variations
+    Quote-aware split of comma-separated combat log fields.
+
+    Commas inside double-quoted names do not split a field, and quotes are kept so callers'
+    existing .strip('"') handling still applies. With max_fields only the first max_fields
+    fields are returned and the rest of the line is never split or searched for quotes.
     """
-    try:
-        parts = line.strip().split(None, 2)
-        if len(parts) < 2:
-            return None
+    # Fast path: a plain (bounded) split is exact unless a quoted name (an odd segment
+    # between quotes) in the split part of the line contains a comma
+    if max_fields is None:
+        if '"' not in text or ',' not in ''.join(text.split('"')[1::2]):
+            return text.split(',')
+    else:
+        fields = text.split(',', max_fields)
+        prefix = text
+        if len(fields) > max_fields:
+            prefix = text[:len(text) - len(fields.pop())]
+        if '"' not in prefix or ',' not in ''.join(prefix.split('"')[1::2]):
+            return fields
+
+    # A quoted name runs to the first part holding its closing quote; the field ends at
+    # the comma after it
+    fields = []
+    quoted = None
+    for part in text.split(','):
+        if quoted is not None:
+            quoted.append(part)
+            if '"' not in part:
+                continue
+            part = ','.join(quoted)
+            quoted = None
+        elif part.startswith('"') and part.find('"', 1) < 0:
+            quoted = [part]
+            continue
 
-        # Extract timestamp portion (before first comma or space)
-        full_timestamp = f"{parts[0]} {parts[1]}"
-        timestamp_clean = full_timestamp.split('-')[0].strip()  # Remove timezone
+        fields.append(part)
+        if len(fields) == max_fields:
+            return fields
+
+    if quoted is not None:
+        fields.append(','.join(quoted))
+    return fields
 
-        # Try microseconds first, then seconds only
-        try:
-            return datetime.strptime(timestamp_clean, "%m/%d/%Y %H:%M:%S.%f")
-        except ValueError:
-            try:
-                return datetime.strptime(timestamp_clean, "%m/%d/%Y %H:%M:%S")
-            except ValueError:
-                return None
-    except Exception:
-        return None
+
+def get_combat_log_fields(text: str, indices: Tuple[int, ...]) -> Tuple[Optional[str], ...]:
+    """Fields at specific indices (None if the line is shorter), tokenizing only up to the last one."""
+    fields = split_combat_log_fields(text, max(indices) + 1)
+    return tuple(fields[index] if index < len(fields) else None for index in indices)
 
 
 def read_combat_log_safely(file_path: Path) -> str:
-    """Standard method for reading combat log files"""
+    """Standard method for reading combat log files (raw or .txt.zst/.txt.gz archives)"""
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        with open_combat_log(file_path) as f:
             return f.read()
     except UnicodeDecodeError:
         # Fallback to latin-1 for problematic files
         try:
-            with open(file_path, 'r', encoding='latin-1', errors='ignore') as f:
+            with open_combat_log(file_path, encoding='latin-1') as f:
                 return f.read()
         except Exception as e:
             SafeLogger.error(f"Could not read {file_path}: {str(e)}")
@@ -103,50 +143,27 @@ def select_combat_log_file(match_timestamp: datetime, logs_directory: Path) -> O
     """
     Standard method for selecting the correct combat log file
     """
-    available_logs = list(logs_directory.glob("WoWCombatLog-*.txt"))
-    
-    if not available_logs:
-        SafeLogger.error(f"No combat log files found in {logs_directory}")
-        return None
-    
-    # Parse log file timestamps from filenames
-    log_times = []
-    for log_file in available_logs:
-        try:
-            # Extract timestamp from filename: WoWCombatLog-050625_182406.txt
-            date_part = log_file.stem.split('-')[1]  # 050625_182406
-            date_str, time_str = date_part.split('_')
-            
-            # Parse: 050625 = May 6, 2025; 182406 = 18:24:06
-            month = int(date_str[:2])
-            day = int(date_str[2:4]) 
-            year = 2000 + int(date_str[4:6])
-            hour = int(time_str[:2])
-            minute = int(time_str[2:4])
-            second = int(time_str[4:6])
-            
-            log_start_time = datetime(year, month, day, hour, minute, second)
-            log_times.append((log_file, log_start_time))
-            
-        except Exception as e:
-            SafeLogger.debug(f"Could not parse timestamp from {log_file.name}: {e}")
-            continue
-    
-    if not log_times:
+    catalog = get_log_catalog(logs_directory, "WoWCombatLog-*.txt")
+
+    if not catalog:
+        available_logs = find_combat_logs(logs_directory, "WoWCombatLog-*.txt")
+        if not available_logs:
+            SafeLogger.error(f"No combat log files found in {logs_directory}")
+            return None
         SafeLogger.warning("No parseable log file timestamps, using first available")
         return available_logs[0]
-    
+
     # Find log file that starts before match time and is closest
-    suitable_logs = [(log, start) for log, start in log_times if start <= match_timestamp]
-    
-    if suitable_logs:
+    latest = catalog.latest_started_before(match_timestamp)
+
+    if latest is not None:
         # Choose the log that starts closest to (but before) the match
-        chosen_log = max(suitable_logs, key=lambda x: x[1])[0]
+        chosen_log = catalog.logs[latest]
         SafeLogger.info(f"Selected log file: {chosen_log.name} (starts before match)")
         return chosen_log
     else:
         # No log starts before match - use earliest log
-        chosen_log = min(log_times, key=lambda x: x[1])[0]
+        chosen_log = catalog.logs[0]
         SafeLogger.warning(f"No log starts before match, using earliest: {chosen_log.name}")
         return chosen_log
 
@@ -355,45 +372,29 @@ def find_verified_arena_boundaries(log_file: Path, window_start: datetime, windo
     # Load JSON death data for verification
     death_data = load_death_data_from_json(filename, base_dir)
     
-    arena_events = []
     extended_start = window_start - timedelta(minutes=10)
     extended_end = window_end + timedelta(minutes=10)
     
-    # Collect all arena events in extended window
-    with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            event_time = parse_combat_log_timestamp(line)
-            if not event_time or not (extended_start <= event_time <= extended_end):
-                continue
-                
-            if 'ARENA_MATCH_START' in line:
-                arena_info = parse_arena_start_line(line, event_time)
-                if arena_info:
-                    arena_events.append(('START', event_time, arena_info))
-            elif 'ARENA_MATCH_END' in line:
-                arena_events.append(('END', event_time, None))
-    
-    arena_events.sort(key=lambda x: x[1])
+    # Look up arena segments in the log's precomputed catalog (one scan per log)
+    catalog = get_segment_catalog(log_file)
     
     # Find ALL matching arena start candidates
     matching_starts = []
-    for event_type, event_time, info in arena_events:
-        if event_type == 'START' and arena_info_matches(info, expected_bracket, expected_map):
-            # Find corresponding end
-            arena_end = None
-            for end_type, end_time, _ in arena_events:
-                if end_type == 'END' and end_time > event_time:
-                    arena_end = end_time
-                    break
-                    
-            if arena_end:
-                duration = (arena_end - event_time).total_seconds()
-                matching_starts.append({
-                    'start': event_time,
-                    'end': arena_end,
-                    'duration': duration,
-                    'time_diff_to_video': abs((event_time - video_start).total_seconds())
-                })
+    for segment in catalog.segments_starting_between(extended_start, extended_end):
+        arena_info = parse_arena_start_line(segment['start_line'], segment['start_time'])
+        if not arena_info_matches(arena_info, expected_bracket, expected_map):
+            continue
+            
+        # Corresponding end must be the first END after the start, inside the search window
+        arena_end = segment['end_time']
+        if arena_end and arena_end <= extended_end:
+            matching_starts.append({
+                'start': segment['start_time'],
+                'end': arena_end,
+                'duration': segment['duration'],
+                'time_diff_to_video': abs((segment['start_time'] - video_start).total_seconds()),
+                'segment': segment
+            })
     
     if not matching_starts:
         SafeLogger.warning("No matching arena boundaries found")
@@ -500,13 +501,10 @@ def verify_match_with_death_correlation(matching_starts: List[Dict], death_data:
     best_match = None
     best_correlation = -1
     
-    for match_candidate in matching_starts:
+    candidate_deaths = candidate_death_counts(matching_starts, log_file, player_name)
+    
+    for match_candidate, combat_deaths in zip(matching_starts, candidate_deaths):
         try:
-            # Count deaths in this arena match window
-            combat_deaths = count_deaths_in_arena_window(
-                log_file, match_candidate['start'], match_candidate['end'], player_name
-            )
-            
             # Calculate correlation score
             json_total = death_data['total_deaths']
             combat_total = combat_deaths['total_deaths']
@@ -526,43 +524,84 @@ def verify_match_with_death_correlation(matching_starts: List[Dict], death_data:
     return best_match
 
 
-def count_deaths_in_arena_window(log_file: Path, start_time: datetime, end_time: datetime,
-                                 player_name: str) -> Dict:
-    """Count deaths within a specific arena time window."""
-    death_counts = {
-        'player_deaths': 0,
-        'enemy_deaths': 0,
-        'total_deaths': 0
-    }
+def candidate_death_counts(matching_starts: List[Dict], log_file: Path, player_name: str) -> List[Dict]:
+    """
+    Death counts of every arena candidate, in candidate order.
+    
+    Candidates from the segment catalog read their precomputed per-segment summary; the
+    rest share one pass over the log (count_deaths_in_arena_windows).
+    """
+    counts = [death_counts_from_segment(candidate['segment'], player_name) if 'segment' in candidate else None
+              for candidate in matching_starts]
+    uncataloged = [position for position, deaths in enumerate(counts) if deaths is None]
+    if uncataloged:
+        windows = [(matching_starts[position]['start'], matching_starts[position]['end']) for position in uncataloged]
+        for position, deaths in zip(uncataloged, count_deaths_in_arena_windows(log_file, windows, player_name)):
+            counts[position] = deaths
+    return counts
+
+
+def count_deaths_in_arena_windows(log_file: Path, windows: List[Tuple[datetime, datetime]],
+                                  player_name: str) -> List[Dict]:
+    """
+    Count deaths in several arena time windows of one log with a single read.
+    
+    The log is read once over the span covering every window (seeking through its time
+    index) and each UNIT_DIED line is assigned to every window containing it; only
+    UNIT_DIED lines are timestamp-decoded.
+    """
+    death_counts = [{'player_deaths': 0, 'enemy_deaths': 0, 'total_deaths': 0} for _ in windows]
+    if not windows:
+        return death_counts
+    
+    span_start = min(start for start, _ in windows)
+    span_end = max(end for _, end in windows)
     
     try:
-        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                event_time = parse_combat_log_timestamp(line)
-                if not event_time or not (start_time <= event_time <= end_time):
-                    continue
-                    
-                if 'UNIT_DIED' in line:
-                    parts = line.strip().split(',')
-                    if len(parts) >= 7:
-                        died_unit = parts[6].strip('"').split('-', 1)[0]
-                        death_counts['total_deaths'] += 1
+        for line in iter_log_window_lines(log_file, span_start, span_end):
+            if 'UNIT_DIED' not in line:
+                continue
+            event_time = parse_combat_log_timestamp(line)
+            if not event_time:
+                continue
+            
+            parts = line.strip().split(',')
+            if len(parts) < 7:
+                continue
+            died_unit = parts[6].strip('"').split('-', 1)[0]
+            
+            for (start_time, end_time), counts in zip(windows, death_counts):
+                if start_time <= event_time <= end_time:
+                    counts['total_deaths'] += 1
+                    if died_unit == player_name:
+                        counts['player_deaths'] += 1
+                    else:
+                        counts['enemy_deaths'] += 1
                         
-                        if died_unit == player_name:
-                            death_counts['player_deaths'] += 1
-                        else:
-                            death_counts['enemy_deaths'] += 1
-                            
     except Exception as e:
         SafeLogger.debug(f"Error counting deaths: {e}")
         
     return death_counts
 
 
+def count_deaths_in_arena_window(log_file: Path, start_time: datetime, end_time: datetime,
+                                 player_name: str) -> Dict:
+    """Count deaths within a specific arena time window."""
+    return count_deaths_in_arena_windows(log_file, [(start_time, end_time)], player_name)[0]
+
+
+# Log owner per combat log path (the first 100 lines of a log never change)
+_PLAYER_NAME_CACHE: Dict[str, str] = {}
+
+
 def extract_player_name_from_combat_log(log_file: Path) -> Optional[str]:
-    """Extract player name from combat log (first player that appears)."""
+    """Extract player name from combat log (first player that appears), read once per log."""
+    cached = _PLAYER_NAME_CACHE.get(str(log_file))
+    if cached is not None:
+        return cached
+
     try:
-        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+        with open_combat_log(log_file) as f:
             for line_num, line in enumerate(f, 1):
                 if line_num > 100:  # Check first 100 lines
                     break
@@ -571,6 +610,8 @@ def extract_player_name_from_combat_log(log_file: Path) -> Optional[str]:
                     if len(parts) >= 3:
                         src = parts[2].strip('"').split('-', 1)[0]
                         if src and len(src) > 2:  # Basic name validation
+                            # Only found names are cached: a log still being written may have none yet
+                            _PLAYER_NAME_CACHE[str(log_file)] = src
                             return src
     except:
         pass
@@ -3,42 +3,103 @@
 
 import os
 import csv
+import shutil
 import json
 import pandas as pd
-from datetime import datetime, timedelta, time
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Set, Optional, Tuple, List
+from typing import Dict, FrozenSet, Set, Optional, Tuple, List, Iterator
 import re
 
+from arena_match_model import UnitIdentityTable, unit_base_name
+from arena_segment_catalog import get_segment_catalog
+from combat_log_capabilities import CoordinateValidationCache, MovementCapableLogs, get_log_capabilities
+from combat_log_catalog import LogCatalog, parse_log_start_from_filename
+from combat_log_index import iter_log_window_lines
+from combat_log_io import CombatLogTimestampDecoder, find_combat_logs
+from combat_log_positions import COORDINATE_EVENTS, COORDINATE_FORMAT, PositionArrays, extract_position_arrays
+from combat_log_scanner import iter_marker_lines
+from development_standards import (
+    candidate_death_counts,
+    count_deaths_in_arena_windows,
+    extract_player_name_from_combat_log,
+    get_combat_log_event_type,
+    parse_combat_log_timestamp,
+    split_combat_log_fields
+)
+from feature_extractors import (
+    FEATURE_EXTRACTORS,
+    IDENTITY_KEY,
+    build_event_handlers,
+    feature_columns,
+    resolve_extractor_names
+)
+from feature_output_sink import FeatureOutputSink, format_feature_row, open_feature_sink
+from parser_instrumentation import METRICS_FILENAME, NullInstrumentation, ParserInstrumentation, open_instrumentation
+from processing_manifest import MANIFEST_FILENAME, ProcessingManifest
+
+
+# Grace period before an expired match window stops receiving lines in a shared pass
+SPAN_SLACK = timedelta(seconds=2)
+
+# Finished matches are committed to the processing manifest every N matches
+PROCESSED_SAVE_INTERVAL = 25
+
+# Recorded with every finished match; bump when extracted features change so old results re-run
+PARSER_VERSION = 'enhanced-3'
+
+# Boundary search padding (seconds) per matching reliability
+RELIABILITY_TIME_WINDOWS = {'high': 30, 'medium': 120, 'low': 300}
+DEFAULT_TIME_WINDOW = 120
+
+# Pet lookup entry of a player missing from the pet index
+NO_PETS: Tuple[FrozenSet[str], FrozenSet[str]] = (frozenset(), frozenset())
+
 
 class EnhancedProductionCombatParser:
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, workers: int = 1, extractors: Optional[List[str]] = None,
+                 instrumentation: Optional[ParserInstrumentation] = None):
         self.base_dir = Path(base_dir)
-        self.processed_logs = set()
-        self.processed_file = self.base_dir / "parsed_logs_enhanced.json"
+        self.workers = max(1, workers)
+
+        # Stage timers and counters (parser_instrumentation); a no-op unless one is passed in
+        self.instrumentation = instrumentation or NullInstrumentation()
+        self.manifest_file = self.base_dir / MANIFEST_FILENAME
+        self.manifest: Optional[ProcessingManifest] = None
+        self.output_sink: Optional[FeatureOutputSink] = None
+
+        # Sorted log start table, rebuilt when a different log list is passed in
+        self._log_catalog: Optional[LogCatalog] = None
+        self._log_catalog_files = None
+        self._log_catalog_size = 0
         
         # Load pet index for comprehensive pet detection
         self.pet_index = self.load_pet_index()
-        self.load_processed_logs()
-        
-        # Movement tracking capabilities with validated coordinate parsing
-        self.movement_capable_logs = set()
-        self.coordinate_validation_cache = {}
+        self.pet_lookup = self.build_pet_lookup()
+
+        # Movement tracking capabilities - lookups over the persisted per-log capability records
+        self.movement_capable_logs = MovementCapableLogs()
+        self.coordinate_validation_cache = CoordinateValidationCache()
         
         # Validated coordinate event types and parameter positions
-        self.COORDINATE_EVENTS = {
-            'SPELL_CAST_SUCCESS': {'params': (26, 27), 'count': 31},
-            'SPELL_HEAL': {'params': (26, 27), 'count': 36}, 
-            'SPELL_DAMAGE': {'params': (26, 27), 'count': 42},
-            'SPELL_PERIODIC_DAMAGE': {'params': (26, 27), 'count': 42},
-            'DAMAGE_SPLIT': {'params': (26, 27), 'count': 42},
-            'SPELL_ENERGIZE': {'params': (26, 27), 'count': 35},
-            'SPELL_PERIODIC_HEAL': {'params': (26, 27), 'count': 36},
-            'SPELL_PERIODIC_ENERGIZE': {'params': (26, 27), 'count': 35},
-            'SPELL_DRAIN': {'params': (26, 27), 'count': 35},
-            'SWING_DAMAGE': {'params': (23, 24), 'count': 38},
-            'SWING_DAMAGE_LANDED': {'params': (23, 24), 'count': 38}
-        }
+        self.COORDINATE_EVENTS = COORDINATE_EVENTS
+
+        # Enabled feature extractors (feature_extractors registry) define the output schema
+        self.extractor_names = resolve_extractor_names(extractors)
+        self.extractors = [FEATURE_EXTRACTORS[name](self) for name in self.extractor_names]
+        self.feature_columns = feature_columns(type(extractor) for extractor in self.extractors)
+        # Manifest entries only hold for the extractor set that wrote them
+        self.manifest_version = f"{PARSER_VERSION}:{'+'.join(self.extractor_names)}"
+
+        # Feature handlers keyed on the event token; lines with any other event are
+        # rejected before tokenizing (add features with @register_feature_extractor)
+        self.event_handlers = build_event_handlers(self.extractors)
+        # Leading fields the handlers read - the rest of a line is never split
+        self.event_fields_needed = max((extractor.fields_needed for extractor in self.extractors
+                                        if extractor.event_types), default=3)
 
     def load_pet_index(self) -> Dict:
         """Load the comprehensive pet index."""
@@ -51,6 +112,7 @@ class EnhancedProductionCombatParser:
         try:
             with open(index_file, 'r', encoding='utf-8') as f:
                 pet_index = json.load(f)
+                self.instrumentation.count('json_files_loaded')
                 print(f"Loaded pet index with {len(pet_index['player_pets'])} players")
                 return pet_index
         except Exception as e:
@@ -61,33 +123,73 @@ class EnhancedProductionCombatParser:
         """Get all known pets for a specific player from the index."""
         return self.pet_index.get('player_pets', {}).get(player_name, {}).get('pet_names', [])
 
+    def build_pet_lookup(self) -> Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]:
+        """Per player: frozen sets of full and base (pre-'-') pet names from the pet index."""
+        lookup = {}
+        for player_name, player_info in self.pet_index.get('player_pets', {}).items():
+            pet_names = frozenset(player_info.get('pet_names', []))
+            lookup[player_name] = (pet_names, frozenset(name.split('-', 1)[0] for name in pet_names))
+        return lookup
+
     def is_player_pet(self, potential_pet_name: str, player_name: str) -> bool:
         """Check if a potential pet name belongs to the specified player."""
-        player_pets = self.get_player_pets(player_name)
-
-        # Direct match
-        if potential_pet_name in player_pets:
-            return True
+        pet_names, base_names = self.pet_lookup.get(player_name, NO_PETS)
 
-        # Partial match (pet names can have suffixes like "Felhunter-1234")
-        base_pet_name = potential_pet_name.split('-')[0] if '-' in potential_pet_name else potential_pet_name
-        for known_pet in player_pets:
-            known_base = known_pet.split('-')[0] if '-' in known_pet else known_pet
-            if base_pet_name == known_base:
-                return True
+        # Direct match, or partial match (pet names can have suffixes like "Felhunter-1234")
+        return potential_pet_name in pet_names or potential_pet_name.split('-', 1)[0] in base_names
 
+    def is_owned_pet(self, identity: UnitIdentityTable, unit_guid: str, name_field: str) -> bool:
+        """
+        True for a pet of the identity's player: a GUID summoned or already confirmed in this
+        match, else a pet index name match (whose GUID is then remembered).
+        """
+        if identity.is_pet(unit_guid):
+            return True
+        if self.is_player_pet(unit_base_name(name_field), identity.player_name):
+            identity.add_pet(unit_guid)
+            return True
         return False
 
-    def load_processed_logs(self):
-        """Load list of already processed combat logs."""
-        if self.processed_file.exists():
-            with open(self.processed_file, 'r', encoding='utf-8') as f:
-                self.processed_logs = set(json.load(f))
-
-    def save_processed_logs(self):
-        """Save list of processed combat logs."""
-        with open(self.processed_file, 'w', encoding='utf-8') as f:
-            json.dump(list(self.processed_logs), f)
+    def open_manifest(self) -> ProcessingManifest:
+        """Open the processing manifest of finished matches (once per parser)."""
+        if self.manifest is None:
+            self.manifest = ProcessingManifest(self.manifest_file, self.manifest_version, PROCESSED_SAVE_INTERVAL)
+            if self.output_sink is not None:
+                self.manifest.before_commit = self.output_sink.checkpoint
+        return self.manifest
+
+    def clear_manifest(self):
+        """Forget every finished match - its rows are not in a freshly created output."""
+        manifest = self.open_manifest()
+        if len(manifest):
+            manifest.clear()
+            print(f"   Cleared processing manifest: {self.manifest_file}")
+
+    def close_manifest(self):
+        """Commit outstanding manifest entries (output rows are made durable first) and close it."""
+        if self.manifest is not None:
+            self.manifest.close()
+            self.manifest = None
+
+    def open_output_sink(self, output_path: str) -> FeatureOutputSink:
+        """Buffered writer for the output (CSV file or partitioned Parquet dataset), kept open across groups."""
+        if self.output_sink is not None and self.output_sink.path == Path(output_path):
+            return self.output_sink
+
+        self.close_output_sink()
+        self.output_sink = open_feature_sink(output_path, columns=self.feature_columns)
+        if self.manifest is not None:
+            # Rows reach disk (fsync) before the manifest records their matches
+            self.manifest.before_commit = self.output_sink.checkpoint
+        return self.output_sink
+
+    def close_output_sink(self):
+        """Flush, fsync and release the output writer."""
+        if self.output_sink is not None:
+            self.output_sink.close()
+            self.output_sink = None
+            if self.manifest is not None:
+                self.manifest.before_commit = None
 
     def parse_enhanced_matches_selective(self, enhanced_index_csv: str, logs_dir: str, output_csv: str):
         """Selectively re-process matches with zero interrupts and continue with unparsed matches."""
@@ -97,6 +199,16 @@ class EnhancedProductionCombatParser:
         print(f"Output file: {output_csv}")
         print(f"Pet index players: {len(self.pet_index.get('player_pets', {}))}")
 
+        try:
+            updated_count = self._run_selective_phases(enhanced_index_csv, logs_dir, output_csv)
+        finally:
+            # Matches recorded since the last batch commit must not be lost, even on an error
+            self.close_manifest()
+            self.close_output_sink()
+        self.instrumentation.finish_run(mode='selective', workers=self.workers, matches_updated=updated_count)
+
+    def _run_selective_phases(self, enhanced_index_csv: str, logs_dir: str, output_csv: str) -> int:
+        """Phase 1 (re-extract zero-interrupt rows) and Phase 2 (unparsed matches); returns rows updated."""
         # Load enhanced index
         index_df = pd.read_csv(enhanced_index_csv)
         index_df = self._clean_timestamps_in_df(index_df)
@@ -107,72 +219,59 @@ class EnhancedProductionCombatParser:
         print(f"📊 Total matches available for processing: {len(index_df)}")
 
         # Get combat logs
-        log_files = list(Path(logs_dir).glob('*.txt'))
+        log_files = find_combat_logs(Path(logs_dir))
         print(f"📁 Found {len(log_files)} combat log files")
 
         # PHASE 1: Load existing results and re-process zero interrupt matches
         updated_count = 0
         if os.path.exists(output_csv):
-            existing_df = pd.read_csv(output_csv)
+            existing_df = self.open_output_sink(output_csv).load_rows()
             print(f"\n📊 PHASE 1: Re-processing existing matches with zero interrupts")
             print(f"   Loaded {len(existing_df)} existing match results")
 
-            # Find matches with zero interrupts
-            zero_interrupt_matches = existing_df[existing_df['interrupt_success_own'] == 0]
+            # Re-extraction targets zero-interrupt rows and compares only the enabled columns
+            compared_columns = {column: label for column, label in
+                                (('interrupt_success_own', 'Interrupts'), ('purges_own', 'Purges'))
+                                if column in self.feature_columns}
+            if 'interrupt_success_own' in compared_columns:
+                zero_interrupt_matches = existing_df[existing_df['interrupt_success_own'] == 0]
+            else:
+                print("   Interrupts extractor not enabled - nothing to re-process")
+                zero_interrupt_matches = existing_df.iloc[:0]
             print(f"   🎯 Found {len(zero_interrupt_matches)} matches with zero interrupts to re-process")
 
             if len(zero_interrupt_matches) > 0:
-                for idx, (original_idx, match_result) in enumerate(zero_interrupt_matches.iterrows(), 1):
-                    filename = match_result['filename']
-                    
-                    if idx % 10 == 0:
-                        print(f"      📊 Progress: {idx}/{len(zero_interrupt_matches)} ({updated_count} updated)")
-
-                    # Find corresponding match in index
-                    index_match = index_df[index_df['filename'] == filename]
-                    if index_match.empty:
-                        continue
+                work_by_log = self.plan_reprocessing(zero_interrupt_matches, index_df, log_files)
+                print(f"   📊 Planned {sum(len(work) for work in work_by_log.values())} matches "
+                      f"across {len(work_by_log)} combat logs")
 
-                    match_data = index_match.iloc[0]
-                    
-                    # Re-process with enhanced pet logic
-                    relevant_log = self.find_combat_log_for_match(match_data, log_files)
-                    if not relevant_log:
-                        continue
-
-                    # Determine time window based on reliability
-                    reliability = match_data.get('matching_reliability', 'medium')
-                    time_window = {'high': 30, 'medium': 120, 'low': 300}.get(reliability, 120)
-
-                    # Extract features with enhanced pet detection
-                    new_features = self.extract_combat_features_enhanced(match_data, relevant_log, time_window)
-                    if not new_features:
-                        continue
+                updated_rows = []
+                for original_idx, new_features in self._iter_reprocessed_features(work_by_log):
+                    match_result = existing_df.loc[original_idx]
+                    filename = match_result['filename']
 
                     # Check if we found interrupts OR purges now
-                    new_interrupts = new_features.get('interrupt_success_own', 0)
-                    new_purges = new_features.get('purges_own', 0)
-                    old_interrupts = match_result['interrupt_success_own']
-                    old_purges = match_result['purges_own']
+                    changes = {label: (match_result[column], new_features.get(column, 0))
+                               for column, label in compared_columns.items()}
 
-                    if new_interrupts > old_interrupts or new_purges > old_purges:
+                    if any(new > old for old, new in changes.values()):
                         print(f"      SUCCESS: UPDATED: {filename}")
-                        print(f"         Interrupts: {old_interrupts} → {new_interrupts}")
-                        print(f"         Purges: {old_purges} → {new_purges}")
-                        
-                        # Update the row in existing_df using .loc with the original index
-                        for key, value in new_features.items():
-                            if key in existing_df.columns:
-                                if key in ['spells_cast', 'spells_purged']:
-                                    existing_df.at[original_idx, key] = '; '.join(value) if value else ''
-                                else:
-                                    existing_df.at[original_idx, key] = value
+                        for label, (old, new) in changes.items():
+                            print(f"         {label}: {old} → {new}")
                         
+                        # Keyed upsert: the existing row with the re-extracted columns replaced
+                        updated_row = match_result.to_dict()
+                        updated_row.update({key: value for key, value in new_features.items()
+                                            if key in existing_df.columns})
+                        updated_rows.append(updated_row)
+
                         updated_count += 1
 
                 # Save updated results after Phase 1
                 if updated_count > 0:
-                    existing_df.to_csv(output_csv, index=False)
+                    output_sink = self.open_output_sink(output_csv)
+                    output_sink.upsert(updated_rows)
+                    output_sink.checkpoint()
                     print(f"   SUCCESS: Phase 1 complete: Updated {updated_count} matches")
             else:
                 print("   SUCCESS: No zero-interrupt matches found to re-process")
@@ -192,6 +291,7 @@ class EnhancedProductionCombatParser:
             remaining_matches = index_df
             # Setup CSV if it doesn't exist
             self.setup_output_csv(output_csv)
+            self.clear_manifest()
 
         print(f"   📊 Found {len(remaining_matches)} matches to process")
 
@@ -230,6 +330,68 @@ class EnhancedProductionCombatParser:
         if len(remaining_matches) > 0:
             print(f"📈 New matches processed: {new_processed if 'new_processed' in locals() else 0}")
         print(f"💾 Results saved to: {output_csv}")
+        return updated_count
+
+    def plan_reprocessing(self, results_df: pd.DataFrame, index_df: pd.DataFrame,
+                          log_files: list) -> Dict[Path, pd.DataFrame]:
+        """
+        Work list for re-extracting existing result rows, grouped by combat log.
+
+        The rows are joined to the enhanced index on filename (first index entry per
+        filename), resolved to their log through one sorted log-start table and given their
+        reliability time window. Each group keeps the result row index in 'original_idx'.
+        """
+        plan = (results_df[['filename']]
+                .rename_axis('original_idx').reset_index()
+                .merge(index_df.drop_duplicates('filename'), on='filename', how='inner', validate='many_to_one'))
+        if plan.empty:
+            return {}
+
+        plan['log_file'] = self.resolve_match_logs(plan['precise_start_time'], log_files).to_numpy()
+        plan = plan[plan['log_file'].notna()].copy()
+        plan['time_window'] = (plan['matching_reliability'].map(RELIABILITY_TIME_WINDOWS)
+                               .fillna(DEFAULT_TIME_WINDOW).astype(int))
+
+        return {log_file: work for log_file, work in plan.groupby('log_file', sort=False)}
+
+    def resolve_match_logs(self, match_times: pd.Series, log_files: list) -> pd.Series:
+        """find_combat_log_for_match for every match time (None where no log holds it)."""
+        with self.instrumentation.stage('log_lookup'):
+            return self.log_catalog(log_files).find_logs(match_times)
+
+    def log_catalog(self, log_files: list) -> LogCatalog:
+        """Catalog of log_files, built once and reused while the same list is passed in."""
+        if self._log_catalog is None or self._log_catalog_files is not log_files \
+                or self._log_catalog_size != len(log_files):
+            self._log_catalog = LogCatalog(log_files)
+            self._log_catalog_files = log_files
+            self._log_catalog_size = len(log_files)
+        return self._log_catalog
+
+    def _iter_reprocessed_features(self, work_by_log: Dict[Path, pd.DataFrame]) -> Iterator[Tuple[int, Dict]]:
+        """Re-extract a reprocessing plan; yields (original_idx, new_features) for extracted matches."""
+        if self.workers > 1:
+            jobs = [{'original_idx': match['original_idx'], 'filename': match['filename'], 'match': match,
+                     'log_file': log_file, 'time_window': match['time_window']}
+                    for log_file, work in work_by_log.items() for _, match in work.iterrows()]
+            for job, result in self.run_sharded_extraction(jobs):
+                if result['error']:
+                    self.log_parsing_error(job['filename'], result['error'])
+                elif result['features']:
+                    yield job['original_idx'], result['features']
+            return
+
+        # One streaming pass per log covers every match planned for it
+        for done, (log_file, work) in enumerate(work_by_log.items(), 1):
+            shard = [(match['original_idx'], match, match['time_window']) for _, match in work.iterrows()]
+            filenames = dict(zip(work['original_idx'], work['filename']))
+            for original_idx, result in self.extract_log_shard(log_file, shard).items():
+                if result['error']:
+                    self.log_parsing_error(filenames[original_idx], result['error'])
+                elif result['features']:
+                    yield original_idx, result['features']
+            if done % 10 == 0:
+                print(f"      📊 Progress: {done}/{len(work_by_log)} combat logs")
 
     def _clean_timestamps_in_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean timestamps in dataframe."""
@@ -257,10 +419,6 @@ class EnhancedProductionCombatParser:
             if os.path.exists(output_csv):
                 os.remove(output_csv)
                 print(f"   Deleted existing CSV: {output_csv}")
-            if self.processed_file.exists():
-                self.processed_file.unlink()
-                print(f"   Deleted existing processed log: {self.processed_file}")
-            self.processed_logs = set()
 
         # Load enhanced index with precise timestamps
         df = pd.read_csv(enhanced_index_csv)
@@ -296,11 +454,13 @@ class EnhancedProductionCombatParser:
         print(f"   Medium reliability: {len(medium_reliability)} matches")
         print(f"   Low reliability: {len(low_reliability)} matches")
 
-        # Prepare output CSV with COMPLETE schema
-        self.setup_output_csv(output_csv)
+        # Prepare output CSV with COMPLETE schema (a resumed run appends to the rows it already wrote)
+        if force_rebuild or not os.path.exists(output_csv):
+            self.setup_output_csv(output_csv)
+            self.clear_manifest()
 
         # Get available combat logs
-        log_files = list(Path(logs_dir).glob('*.txt'))
+        log_files = find_combat_logs(Path(logs_dir))
         log_files.sort()
         print(f"📁 Found {len(log_files)} combat log files")
 
@@ -326,8 +486,11 @@ class EnhancedProductionCombatParser:
         print(f"📈 Total matches processed: {total_processed}/{len(df_with_logs)}")
         print(f"💾 Results saved to: {output_csv}")
 
-        # Save final progress
-        self.save_processed_logs()
+        # Commit final progress (output rows are made durable first)
+        self.open_manifest().commit()
+        self.close_output_sink()
+        self.instrumentation.finish_run(mode='production', workers=self.workers,
+                                        matches_processed=total_processed)
 
     def _clean_timestamp(self, timestamp_str):
         """Clean timestamp string for parsing."""
@@ -344,90 +507,263 @@ class EnhancedProductionCombatParser:
 
     def process_matches_group(self, matches_df: pd.DataFrame, log_files: list, output_csv: str,
                               time_window: int) -> int:
-        """Process a group of matches with the same reliability level."""
+        """Process a group of matches with the same reliability level, one streaming pass per combat log."""
+        if self.workers > 1:
+            return self.process_matches_group_parallel(matches_df, log_files, output_csv, time_window)
+
         processed_count = 0
         total_matches = len(matches_df)
 
+        manifest = self.open_manifest()
+
+        # Plan: resolve log file, boundaries and pet for every pending match
+        jobs = []
+        planned_ids = set()
         for idx, (_, match) in enumerate(matches_df.iterrows(), 1):
             if idx % 50 == 0 or idx == total_matches:
-                print(f"   📊 Progress: {idx}/{total_matches} matches ({processed_count} processed)")
+                print(f"   📊 Planning: {idx}/{total_matches} matches ({len(jobs)} pending)")
+
+            try:
+                with self.instrumentation.match(match['filename']):
+                    relevant_log = self.find_combat_log_for_match(match, log_files)
+                    if not relevant_log:
+                        continue
+
+                    match_id = f"{relevant_log}_{match['filename']}"
+                    if match_id in planned_ids or manifest.is_processed(relevant_log, match['filename']):
+                        continue
+
+                    window = self.prepare_match_window(match, relevant_log, time_window)
+                jobs.append({'match_id': match_id, 'filename': match['filename'],
+                             'log_file': relevant_log, 'window': window})
+                planned_ids.add(match_id)
+
+            except Exception as e:
+                self.log_parsing_error(match['filename'], e)
+                continue
+
+        # Extract and emit one log at a time: one pass over each log feeds every match window
+        # inside it, then its rows are written and recorded, so manifest batches commit as the
+        # group runs
+        jobs_by_log = {}
+        for job in jobs:
+            jobs_by_log.setdefault(job['log_file'], []).append(job)
+
+        for log_file, log_jobs in jobs_by_log.items():
+            windows = [job['window'] for job in log_jobs if job['window']]
+            extracted = self.extract_windows_single_pass(log_file, windows)
+
+            for job in log_jobs:
+                try:
+                    window = job['window']
+                    if window and not extracted:
+                        # An unreadable log's matches stay unmarked for a retry
+                        continue
 
+                    features_written = bool(window)
+                    if features_written:
+                        self.open_output_sink(output_csv).write(window['features'])
+                        processed_count += 1
+
+                    manifest.mark_processed(job['log_file'], job['filename'], features_written)
+
+                except Exception as e:
+                    self.log_parsing_error(job['filename'], e)
+                    continue
+
+        self.instrumentation.flush()
+        print(f"   📊 Progress: {total_matches}/{total_matches} matches ({processed_count} processed)")
+        return processed_count
+
+    def process_matches_group_parallel(self, matches_df: pd.DataFrame, log_files: list, output_csv: str,
+                                       time_window: int) -> int:
+        """Process a reliability group across the worker pool; this process stays the only writer."""
+        processed_count = 0
+        total_matches = len(matches_df)
+
+        manifest = self.open_manifest()
+
+        # Plan: only log lookup and de-duplication here, boundaries are resolved in the workers
+        jobs = []
+        planned_ids = set()
+        for _, match in matches_df.iterrows():
             try:
-                relevant_log = self.find_combat_log_for_match(match, log_files)
+                with self.instrumentation.match(match['filename']):
+                    relevant_log = self.find_combat_log_for_match(match, log_files)
                 if not relevant_log:
                     continue
 
                 match_id = f"{relevant_log}_{match['filename']}"
-                if match_id in self.processed_logs:
+                if match_id in planned_ids or manifest.is_processed(relevant_log, match['filename']):
+                    continue
+
+                jobs.append({'match_id': match_id, 'filename': match['filename'], 'match': match,
+                             'log_file': relevant_log, 'time_window': time_window})
+                planned_ids.add(match_id)
+
+            except Exception as e:
+                self.log_parsing_error(match['filename'], e)
+                continue
+
+        print(f"   📊 Planning: {total_matches}/{total_matches} matches ({len(jobs)} pending, "
+              f"{self.workers} workers)")
+
+        # Commit results in the original match order as shards complete
+        for committed, (job, result) in enumerate(self.run_sharded_extraction(jobs), 1):
+            try:
+                if result['error']:
+                    self.log_parsing_error(job['filename'], result['error'])
                     continue
 
-                features = self.extract_combat_features_enhanced(match, relevant_log, time_window)
-                if features:
-                    self.write_features_to_csv(features, output_csv)
+                if result['features']:
+                    self.open_output_sink(output_csv).write(result['features'])
                     processed_count += 1
 
-                self.processed_logs.add(match_id)
+                manifest.mark_processed(job['log_file'], job['filename'], bool(result['features']))
 
             except Exception as e:
-                error_log = self.base_dir / "parsing_errors.log"
-                with open(error_log, 'a', encoding='utf-8') as f:
-                    f.write(f"{datetime.now()}: Error processing {match['filename']}: {e}\n")
+                self.log_parsing_error(job['filename'], e)
                 continue
 
+            finally:
+                if committed % 50 == 0:
+                    print(f"   📊 Progress: {committed}/{len(jobs)} matches ({processed_count} processed)")
+
+        manifest.commit()
+        self.instrumentation.flush()
+        print(f"   📊 Progress: {total_matches}/{total_matches} matches ({processed_count} processed)")
         return processed_count
 
-    def find_combat_log_for_match(self, match: pd.Series, log_files: list) -> Optional[Path]:
-        """Find the combat log file that contains this match."""
-        match_time = match['precise_start_time']
-        match_date = match_time.date()
-
-        candidate_logs = []
-        for log_file in log_files:
-            log_info = self.parse_log_info_from_filename(log_file.name)
-            if log_info:
-                log_date, log_time = log_info
-                days_diff = abs((match_date - log_date).days)
-
-                if days_diff <= 1:
-                    log_datetime = datetime.combine(log_date, log_time)
-                    time_diff_seconds = (match_time - log_datetime).total_seconds()
-                    candidate_logs.append({'file': log_file, 'time_diff_seconds': time_diff_seconds})
-
-        if not candidate_logs:
-            return None
+    def run_sharded_extraction(self, jobs: List[Dict]) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Shard match jobs by combat log across a process pool and yield (job, result) in job order.
+
+        Each result is {'features': Dict or None, 'error': str or None}. A crashed worker
+        breaks the shared pool, so every shard that did not finish is retried once with each
+        shard isolated in its own worker process; shards that fail again are reported as
+        errors and stay unprocessed for the next run.
+        """
+        shards = {}
+        for position, job in enumerate(jobs):
+            shards.setdefault(job['log_file'], []).append((position, job['match'], job['time_window']))
+
+        results = {}
+        next_position = 0
+        pending = shards
+        failed = {}
+
+        for attempt in (1, 2):
+            failed = {}
+            for log_file, outcome in self._iter_shard_results(pending, isolated=attempt > 1):
+                if isinstance(outcome, Exception):
+                    print(f"   ⚠️ Worker failed on {Path(log_file).name}: {outcome}")
+                    failed[log_file] = outcome
+                else:
+                    shard_results, shard_metrics = outcome
+                    self.instrumentation.merge(shard_metrics)
+                    results.update(shard_results)
 
-        valid_logs = [log for log in candidate_logs
-                      if log['time_diff_seconds'] > 0 or abs(log['time_diff_seconds']) <= 600]
+                while next_position < len(jobs) and next_position in results:
+                    yield jobs[next_position], results.pop(next_position)
+                    next_position += 1
 
-        if not valid_logs:
-            return None
+            if not failed:
+                break
+
+            pending = {log_file: shards[log_file] for log_file in failed}
+            if attempt == 1:
+                print(f"   🔄 Retrying {len(pending)} unfinished log shard(s) in isolated workers")
+
+        for log_file, error in failed.items():
+            for position, _, _ in shards[log_file]:
+                results[position] = {'features': None, 'error': f"worker failed: {error}"}
+
+        while next_position < len(jobs):
+            yield jobs[next_position], results.pop(next_position)
+            next_position += 1
+
+    def _iter_shard_results(self, shards: Dict[Path, List], isolated: bool) -> Iterator[Tuple[Path, object]]:
+        """Run log shards in worker processes; yields (log_file, results or exception) as they finish."""
+        if not shards:
+            return
+
+        # Largest logs first so the slowest shards do not start last
+        ordered_logs = sorted(shards, key=self._log_size, reverse=True)
+        batch_size = self.workers if isolated else len(ordered_logs)
+
+        for batch_start in range(0, len(ordered_logs), batch_size):
+            batch = ordered_logs[batch_start:batch_start + batch_size]
+            pools = []
+            futures = {}
+            try:
+                for log_file in batch:
+                    if not pools or isolated:
+                        pools.append(ProcessPoolExecutor(max_workers=1 if isolated else self.workers,
+                                                         initializer=_init_shard_worker,
+                                                         initargs=(str(self.base_dir), self.extractor_names,
+                                                                   self.instrumentation.worker_settings())))
+                    futures[pools[-1].submit(_extract_log_shard, log_file, shards[log_file])] = log_file
+
+                for future in as_completed(futures):
+                    try:
+                        yield futures[future], future.result()
+                    except Exception as e:
+                        yield futures[future], e
+            finally:
+                for pool in pools:
+                    pool.shutdown()
+
+    @staticmethod
+    def _log_size(log_file: Path) -> int:
+        try:
+            return Path(log_file).stat().st_size
+        except OSError:
+            return 0
 
-        valid_logs.sort(key=lambda x: abs(x['time_diff_seconds']))
-        return valid_logs[0]['file']
+    def log_parsing_error(self, filename: str, error: Exception):
+        """Append a per-match processing error to parsing_errors.log."""
+        error_log = self.base_dir / "parsing_errors.log"
+        with open(error_log, 'a', encoding='utf-8') as f:
+            f.write(f"{datetime.now()}: Error processing {filename}: {error}\n")
+
+    def find_combat_log_for_match(self, match: pd.Series, log_files: list) -> Optional[Path]:
+        """Find the combat log file that contains this match."""
+        with self.instrumentation.stage('log_lookup'):
+            return self.log_catalog(log_files).find_log(match['precise_start_time'])
 
     def parse_log_info_from_filename(self, log_filename: str) -> Optional[Tuple[datetime.date, datetime.time]]:
         """Extract date and time from combat log filename."""
-        try:
-            match = re.search(r'(\d{6})_(\d{6})', log_filename)
-            if match:
-                date_str, time_str = match.groups()
-                month = int(date_str[:2])
-                day = int(date_str[2:4])
-                year = 2000 + int(date_str[4:6])
-                log_date = datetime(year, month, day).date()
-
-                hour = int(time_str[:2])
-                minute = int(time_str[2:4])
-                second = int(time_str[4:6])
-                log_time = time(hour, minute, second)
-
-                return log_date, log_time
-        except:
-            pass
-        return None
+        log_start = parse_log_start_from_filename(log_filename)
+        if log_start is None:
+            return None
+        return log_start.date(), log_start.time()
 
     def extract_combat_features_enhanced(self, match: pd.Series, log_file: Path, time_window: int) -> Optional[Dict]:
         """Extract combat features using enhanced arena boundary detection with death correlation."""
+        window = self.prepare_match_window(match, log_file, time_window)
+        if not window:
+            return None
+
+        if not self.extract_windows_single_pass(log_file, [window]):
+            return None
+
+        return window['features']
+
+    def new_match_features(self, filename: str, match_start_time: str, player_name: str) -> Dict:
+        """Initialize features with COMPLETE schema (every enabled extractor's state) and a fresh identity table."""
+        features = {'filename': filename, 'match_start_time': match_start_time,
+                    IDENTITY_KEY: UnitIdentityTable(player_name)}
+        for extractor in self.extractors:
+            features.update(extractor.new_state())
+        return features
+
+    def finish_match_features(self, features: Dict):
+        """Let every extractor finalize its columns once a match's lines are processed."""
+        for extractor in self.extractors:
+            extractor.finish(features)
+
+    def prepare_match_window(self, match: pd.Series, log_file: Path, time_window: int) -> Optional[Dict]:
+        """Resolve player, pet and verified arena boundaries for a match without reading its events."""
         match_start = match['precise_start_time']
         match_duration = match.get('duration_s', 300)
         player_name = self.extract_player_name(match['filename'])
@@ -435,25 +771,10 @@ class EnhancedProductionCombatParser:
         if not player_name:
             return None
 
-        # Initialize features with COMPLETE schema
-        features = {
-            'filename': match['filename'],
-            'match_start_time': match_start.isoformat(),
-            'cast_success_own': 0,
-            'interrupt_success_own': 0,
-            'times_interrupted': 0,
-            'precog_gained_own': 0,
-            'precog_gained_enemy': 0,
-            'purges_own': 0,
-            'damage_done': 0,
-            'healing_done': 0,
-            'deaths_caused': 0,
-            'times_died': 0,
-            'spells_cast': [],
-            'spells_purged': []
-        }
+        features = self.new_match_features(match['filename'], match_start.isoformat(), player_name)
 
-        pet_name = self.find_pet_name(log_file, player_name)
+        with self.instrumentation.stage('pet_lookup'):
+            pet_name = self.find_pet_name(log_file, player_name)
 
         try:
             # Enhanced arena boundary detection with verification
@@ -461,27 +782,161 @@ class EnhancedProductionCombatParser:
             window_start = match_start - buffer
             window_end = match_start + timedelta(seconds=match_duration) + buffer
 
-            arena_start, arena_end = self.find_verified_arena_boundaries(
-                log_file, window_start, window_end, match_start, match['filename'], match_duration
-            )
+            with self.instrumentation.stage('boundary_search'), self.instrumentation.profile(Path(match['filename']).stem):
+                arena_start, arena_end = self.find_verified_arena_boundaries(
+                    log_file, window_start, window_end, match_start, match['filename'], match_duration
+                )
+
+        except Exception as e:
+            return None
+
+        return {
+            'player_name': player_name,
+            'pet_name': pet_name,
+            'features': features,
+            'start': arena_start if arena_start else window_start,
+            'end': arena_end if arena_end else window_end
+        }
 
-            precise_start = arena_start if arena_start else window_start
-            precise_end = arena_end if arena_end else window_end
+    def extract_windows_single_pass(self, log_file: Path, windows: List[Dict]) -> bool:
+        """
+        Stream a combat log once and route every line to each match window that contains it.
 
-            # Parse events within precise boundaries
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    event_time = self.parse_log_line_timestamp(line)
-                    if not event_time:
-                        continue
+        Windows are sorted and merged into non-overlapping spans; the reader seeks to each
+        span through the time index and feeds the event handler of every handled line to each
+        active window, so N matches in one log cost one read instead of N.
+        Returns False if the log could not be read.
+        """
+        if not windows:
+            return True
 
-                    if precise_start <= event_time <= precise_end:
-                        self.process_combat_event_enhanced(line, player_name, pet_name, features)
+        ordered = sorted(windows, key=lambda w: w['start'])
+        handlers = self.event_handlers
+        fields_needed = self.event_fields_needed
+        slack_ms = SPAN_SLACK // timedelta(milliseconds=1)
+
+        # Per-window counts are only kept when instrumented; line totals are plain locals
+        instrumentation = self.instrumentation
+        instrumented = instrumentation.enabled
+        if instrumented:
+            for window in windows:
+                window['lines_in_window'] = 0
+                window['event_counts'] = Counter()
+        lines_read = lines_parsed = lines_in_window = 0
+        pass_started = time.perf_counter()
+        failed = True
 
-            return features
+        try:
+            with instrumentation.profile(f"{Path(log_file).name}.{Path(ordered[0]['features']['filename']).stem}",
+                                        (window['features']['filename'] for window in windows)):
+                for span_start, span_end, span_windows in self._merge_window_spans(ordered):
+                    pending = list(span_windows)
+                    active = []
+
+                    # Integer window comparisons; bounds follow the log's timezone suffix
+                    decoder = CombatLogTimestampDecoder()
+                    bounds_offset = None
+
+                    for line in iter_log_window_lines(log_file, span_start, span_end):
+                        lines_read += 1
+                        # Only lines with a registered event handler need a timestamp at all
+                        event_type = get_combat_log_event_type(line)
+                        handler = handlers.get(event_type)
+                        if handler is None:
+                            continue
+
+                        event_ms = decoder.decode_ms(line)
+                        if event_ms is None:
+                            continue
+                        lines_parsed += 1
+
+                        if decoder.utc_offset_ms != bounds_offset:
+                            bounds_offset = decoder.utc_offset_ms
+                            for window in span_windows:
+                                window['start_ms'], window['end_ms'] = decoder.window_bounds_ms(
+                                    window['start'], window['end']
+                                )
+
+                        if pending and pending[0]['start_ms'] <= event_ms:
+                            while pending and pending[0]['start_ms'] <= event_ms:
+                                active.append(pending.pop(0))
+                            # Drop windows that closed well before this line
+                            active = [w for w in active if w['end_ms'] + slack_ms >= event_ms]
+
+                        # Tokenize once and hand the fields to every window containing the line
+                        parts = None
+                        for window in active:
+                            if window['start_ms'] <= event_ms <= window['end_ms']:
+                                if parts is None:
+                                    parts = split_combat_log_fields(line.strip(), fields_needed)
+                                    if len(parts) < 3:
+                                        break
+                                try:
+                                    handler(parts, window['player_name'], window['pet_name'], window['features'])
+                                except Exception:
+                                    pass
+                                if instrumented:
+                                    window['lines_in_window'] += 1
+                                    window['event_counts'][event_type] += 1
+
+                        if instrumented and parts is not None:
+                            lines_in_window += 1
+
+            for window in windows:
+                self.finish_match_features(window['features'])
+            failed = False
+            return True
 
         except Exception as e:
-            return None
+            self.log_parsing_error(Path(log_file).name, e)
+            return False
+
+        finally:
+            instrumentation.record_log_pass(log_file, windows, time.perf_counter() - pass_started,
+                                            lines_read, lines_parsed, lines_in_window, failed)
+
+    def extract_log_shard(self, log_file: Path, shard: List[Tuple[int, pd.Series, int]]) -> Dict[int, Dict]:
+        """
+        Resolve every (key, match, time_window) of one combat log and extract them in a single
+        pass. Returns {key: {'features': Dict or None, 'error': str or None}}.
+        """
+        results = {}
+        windows = {}
+
+        for key, match, time_window in shard:
+            try:
+                with self.instrumentation.match(match['filename']):
+                    window = self.prepare_match_window(match, log_file, time_window)
+            except Exception as e:
+                results[key] = {'features': None, 'error': str(e)}
+                continue
+
+            results[key] = {'features': None, 'error': None}
+            if window:
+                windows[key] = window
+
+        if windows and not self.extract_windows_single_pass(log_file, list(windows.values())):
+            # Reported as errors so callers retry these matches instead of marking them processed
+            for key in windows:
+                results[key]['error'] = f"combat log pass failed: {Path(log_file).name}"
+            windows = {}
+
+        for key, window in windows.items():
+            results[key]['features'] = window['features']
+
+        return results
+
+    def _merge_window_spans(self, ordered_windows: List[Dict]) -> List[Tuple[datetime, datetime, List[Dict]]]:
+        """Merge start-sorted match windows into non-overlapping read spans."""
+        spans = []
+        for window in ordered_windows:
+            if spans and window['start'] <= spans[-1][1]:
+                span_start, span_end, span_windows = spans[-1]
+                span_windows.append(window)
+                spans[-1] = (span_start, max(span_end, window['end']), span_windows)
+            else:
+                spans.append((window['start'], window['end'], [window]))
+        return spans
 
     def find_verified_arena_boundaries(self, log_file: Path, window_start: datetime, window_end: datetime,
                                        video_start: datetime, filename: str, video_duration: float) -> Tuple[
@@ -490,47 +945,33 @@ class EnhancedProductionCombatParser:
         expected_bracket, expected_map = self.extract_arena_info_from_filename(filename)
 
         # Load JSON death data for verification
-        death_data = self.load_death_data_from_json(filename)
+        with self.instrumentation.stage('json_load'):
+            death_data = self.load_death_data_from_json(filename)
 
-        arena_events = []
         extended_start = window_start - timedelta(minutes=10)
         extended_end = window_end + timedelta(minutes=10)
 
-        # Collect all arena events in extended window
-        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                event_time = self.parse_log_line_timestamp(line)
-                if not event_time or not (extended_start <= event_time <= extended_end):
-                    continue
-
-                if 'ARENA_MATCH_START' in line:
-                    arena_info = self.parse_arena_start_line(line, event_time)
-                    if arena_info:
-                        arena_events.append(('START', event_time, arena_info))
-                elif 'ARENA_MATCH_END' in line:
-                    arena_events.append(('END', event_time, None))
-
-        arena_events.sort(key=lambda x: x[1])
+        # Look up arena segments in the log's precomputed catalog (one scan per log)
+        with self.instrumentation.stage('segment_catalog'):
+            catalog = get_segment_catalog(log_file)
 
         # Find ALL matching arena start candidates
         matching_starts = []
-        for event_type, event_time, info in arena_events:
-            if event_type == 'START' and self.arena_info_matches(info, expected_bracket, expected_map):
-                # Find corresponding end
-                arena_end = None
-                for end_type, end_time, _ in arena_events:
-                    if end_type == 'END' and end_time > event_time:
-                        arena_end = end_time
-                        break
-
-                if arena_end:
-                    duration = (arena_end - event_time).total_seconds()
-                    matching_starts.append({
-                        'start': event_time,
-                        'end': arena_end,
-                        'duration': duration,
-                        'time_diff_to_video': abs((event_time - video_start).total_seconds())
-                    })
+        for segment in catalog.segments_starting_between(extended_start, extended_end):
+            arena_info = self.parse_arena_start_line(segment['start_line'], segment['start_time'])
+            if not self.arena_info_matches(arena_info, expected_bracket, expected_map):
+                continue
+
+            # Corresponding end must be the first END after the start, inside the search window
+            arena_end = segment['end_time']
+            if arena_end and arena_end <= extended_end:
+                matching_starts.append({
+                    'start': segment['start_time'],
+                    'end': arena_end,
+                    'duration': segment['duration'],
+                    'time_diff_to_video': abs((segment['start_time'] - video_start).total_seconds()),
+                    'segment': segment
+                })
 
         if not matching_starts:
             return None, None
@@ -545,9 +986,10 @@ class EnhancedProductionCombatParser:
 
         # Strategy 1: Death correlation verification (most reliable)
         if death_data:
-            verified_match = self.verify_match_with_death_correlation(
-                matching_starts, death_data, log_file, expected_bracket, expected_map
-            )
+            with self.instrumentation.stage('death_correlation'):
+                verified_match = self.verify_match_with_death_correlation(
+                    matching_starts, death_data, log_file, expected_bracket, expected_map
+                )
             if verified_match:
                 print(f"   SUCCESS: Death correlation verified match")
                 return verified_match['start'], verified_match['end']
@@ -577,6 +1019,7 @@ class EnhancedProductionCombatParser:
                 if json_path.exists():
                     with open(json_path, 'r', encoding='utf-8') as f:
                         data = json.load(f)
+                        self.instrumentation.count('json_files_loaded')
                         return self.extract_death_info(data)
             except:
                 pass
@@ -586,6 +1029,7 @@ class EnhancedProductionCombatParser:
             if json_path.exists():
                 with open(json_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
+                    self.instrumentation.count('json_files_loaded')
                     return self.extract_death_info(data)
 
         except Exception as e:
@@ -633,13 +1077,11 @@ class EnhancedProductionCombatParser:
         best_match = None
         best_correlation = -1
 
-        for match_candidate in matching_starts:
-            try:
-                # Count deaths in this arena match window
-                combat_deaths = self.count_deaths_in_arena_window(
-                    log_file, match_candidate['start'], match_candidate['end'], player_name
-                )
+        # Per-segment summaries from the catalog; any uncataloged candidates share one log pass
+        candidate_deaths = candidate_death_counts(matching_starts, log_file, player_name)
 
+        for match_candidate, combat_deaths in zip(matching_starts, candidate_deaths):
+            try:
                 # Calculate correlation score
                 json_total = death_data['total_deaths']
                 combat_total = combat_deaths['total_deaths']
@@ -660,51 +1102,16 @@ class EnhancedProductionCombatParser:
     def count_deaths_in_arena_window(self, log_file: Path, start_time: datetime, end_time: datetime,
                                      player_name: str) -> Dict:
         """Count deaths within a specific arena time window."""
-        death_counts = {
-            'player_deaths': 0,
-            'enemy_deaths': 0,
-            'total_deaths': 0
-        }
-
-        try:
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    event_time = self.parse_log_line_timestamp(line)
-                    if not event_time or not (start_time <= event_time <= end_time):
-                        continue
-
-                    if 'UNIT_DIED' in line:
-                        parts = line.strip().split(',')
-                        if len(parts) >= 7:
-                            died_unit = parts[6].strip('"').split('-', 1)[0]
-                            death_counts['total_deaths'] += 1
-
-                            if died_unit == player_name:
-                                death_counts['player_deaths'] += 1
-                            else:
-                                death_counts['enemy_deaths'] += 1
-
-        except Exception as e:
-            pass
+        return self.count_deaths_in_arena_windows(log_file, [(start_time, end_time)], player_name)[0]
 
-        return death_counts
+    def count_deaths_in_arena_windows(self, log_file: Path, windows: List[Tuple[datetime, datetime]],
+                                      player_name: str) -> List[Dict]:
+        """Count deaths in several arena windows of one log with a single read (one dict per window)."""
+        return count_deaths_in_arena_windows(log_file, windows, player_name)
 
     def extract_player_name_from_combat_log(self, log_file: Path) -> Optional[str]:
-        """Extract player name from combat log (first player that appears)."""
-        try:
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    if line_num > 100:  # Check first 100 lines
-                        break
-                    if any(event in line for event in ['SPELL_CAST_SUCCESS', 'SPELL_AURA_APPLIED']):
-                        parts = line.strip().split(',')
-                        if len(parts) >= 3:
-                            src = parts[2].strip('"').split('-', 1)[0]
-                            if src and len(src) > 2:  # Basic name validation
-                                return src
-        except:
-            pass
-        return None
+        """Extract player name from combat log (first player that appears), read once per log."""
+        return extract_player_name_from_combat_log(log_file)
 
     def verify_match_with_duration(self, matching_starts: List[Dict], expected_duration: float) -> Optional[Dict]:
         """Verify arena match using duration comparison."""
@@ -756,11 +1163,15 @@ class EnhancedProductionCombatParser:
     def detect_advanced_logging(self, log_file_path: Path, sample_lines: int = 100) -> Dict[str, any]:
         """
         Detect if combat log has advanced coordinate data capability.
-        
+
+        Answered from the log's persisted capability record (combat_log_capabilities),
+        built once per log from its COMBAT_LOG_VERSION headers; sample_lines is no
+        longer used.
+
         Args:
             log_file_path: Path to combat log file
-            sample_lines: Number of lines to sample for detection (default 100)
-            
+            sample_lines: Kept for existing callers
+
         Returns:
             Dict with detection results:
             {
@@ -768,80 +1179,30 @@ class EnhancedProductionCombatParser:
                 'coordinate_events': list,
                 'sample_coordinates': list,
                 'arena_zone': str,
-                'confidence': float
+                'confidence': float,
+                'advanced_logging': bool,
+                'toggles': int
             }
         """
-        detection_result = {
-            'has_coordinates': False,
-            'coordinate_events': [],
-            'sample_coordinates': [],
-            'arena_zone': 'unknown',
-            'confidence': 0.0
-        }
-        
         try:
-            with open(log_file_path, 'r', encoding='utf-8') as f:
-                lines_checked = 0
-                coordinate_count = 0
-                
-                for line in f:
-                    if lines_checked >= sample_lines:
-                        break
-                        
-                    line = line.strip()
-                    if not line:
-                        continue
-                        
-                    lines_checked += 1
-                    
-                    # Check for zone information
-                    if 'ZONE_CHANGE' in line and detection_result['arena_zone'] == 'unknown':
-                        try:
-                            parts = line.split(',')
-                            if len(parts) >= 3:
-                                zone_id = parts[1].strip()
-                                zone_name = parts[2].strip().strip('"')
-                                detection_result['arena_zone'] = f"{zone_id}:{zone_name}"
-                        except:
-                            pass
-                    
-                    # Check for advanced combat events with coordinates
-                    if any(event in line for event in ['SPELL_HEAL', 'SPELL_DAMAGE', 'SPELL_CAST_SUCCESS', 
-                                                     'SPELL_ENERGIZE', 'RANGE_DAMAGE', 'SWING_DAMAGE']):
-                        
-                        # Look for coordinate pattern: ,-X.XX,Y.YY,0,F.FFFF,NNN
-                        coordinate_match = re.search(r',(-?\d+\.\d+),(-?\d+\.\d+),0,(\d+\.\d+),\d+', line)
-                        if coordinate_match:
-                            x_coord = float(coordinate_match.group(1))
-                            y_coord = float(coordinate_match.group(2))
-                            facing = float(coordinate_match.group(3))
-                            
-                            coordinate_count += 1
-                            detection_result['coordinate_events'].append(line.split(',')[0])  # Event type
-                            detection_result['sample_coordinates'].append({
-                                'x': x_coord,
-                                'y': y_coord,
-                                'facing': facing,
-                                'event': line.split(',')[0] if ',' in line else 'unknown'
-                            })
-                            
-                            # Limit sample coordinates to prevent memory bloat
-                            if len(detection_result['sample_coordinates']) >= 10:
-                                break
-                
-                # Calculate confidence based on coordinate density
-                if coordinate_count > 0:
-                    detection_result['has_coordinates'] = True
-                    detection_result['confidence'] = min(1.0, coordinate_count / 20.0)  # Max confidence at 20+ coords
-                    
-                    # Remove duplicate event types for cleaner reporting
-                    detection_result['coordinate_events'] = list(set(detection_result['coordinate_events']))
-                
+            return get_log_capabilities(Path(log_file_path)).detection_result()
         except Exception as e:
             print(f"ERROR: Error detecting advanced logging in {log_file_path}: {e}")
-            detection_result['error'] = str(e)
-        
-        return detection_result
+            return {
+                'has_coordinates': False,
+                'coordinate_events': [],
+                'sample_coordinates': [],
+                'arena_zone': 'unknown',
+                'confidence': 0.0,
+                'error': str(e)
+            }
+
+    def is_movement_capable(self, log_file: Path, start_time: datetime, end_time: datetime) -> bool:
+        """True if advanced logging with validated coordinates covers the whole match window."""
+        try:
+            return get_log_capabilities(Path(log_file)).movement_capable_between(start_time, end_time)
+        except OSError:
+            return False
 
     def extract_validated_coordinates(self, line: str) -> Optional[Dict]:
         """
@@ -920,8 +1281,15 @@ class EnhancedProductionCombatParser:
     
     def _is_coordinate_format(self, value: str) -> bool:
         """Check if a value matches coordinate format (####.##)."""
-        pattern = r'^-?\d+\.\d{2}$'
-        return bool(re.match(pattern, value))
+        return COORDINATE_FORMAT.fullmatch(value) is not None
+
+    def extract_match_positions(self, log_file: Path, start_time: datetime, end_time: datetime) -> PositionArrays:
+        """
+        All validated position samples in a time window as NumPy arrays (timestamp_ms,
+        interned unit, x, y, facing) - the bulk form of extract_validated_coordinates.
+        """
+        return extract_position_arrays(iter_log_window_lines(log_file, start_time, end_time),
+                                       self.COORDINATE_EVENTS, start_time=start_time, end_time=end_time)
     
     def _extract_quoted_name(self, param: str) -> str:
         """Extract name from quoted parameter."""
@@ -1028,147 +1396,100 @@ class EnhancedProductionCombatParser:
     def find_pet_name(self, log_file: Path, player_name: str) -> Optional[str]:
         """Find the pet name for this player in the combat log."""
         try:
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    if line_num > 1000:
-                        break
-                    if 'SPELL_SUMMON' in line:
-                        parts = line.strip().split(',')
-                        if len(parts) >= 7:
-                            src = parts[2].strip('"').split('-', 1)[0]
-                            pet_candidate = parts[6].strip('"')
-                            if src == player_name:
-                                return pet_candidate
+            # Only SPELL_SUMMON lines within the first 1000 lines are decoded
+            for marker_line in iter_marker_lines(log_file, (b'SPELL_SUMMON',), max_lines=1000):
+                parts = marker_line.text.strip().split(',')
+                if len(parts) >= 7:
+                    src = parts[2].strip('"').split('-', 1)[0]
+                    pet_candidate = parts[6].strip('"')
+                    if src == player_name:
+                        return pet_candidate
         except:
             pass
         return None
 
     def parse_log_line_timestamp(self, line: str) -> Optional[datetime]:
-        """Parse timestamp from a combat log line."""
-        try:
-            parts = line.strip().split(None, 2)
-            if len(parts) < 2:
-                return None
-
-            full_timestamp = f"{parts[0]} {parts[1]}"
-            timestamp_clean = full_timestamp.split('-')[0].strip()
-
-            try:
-                return datetime.strptime(timestamp_clean, "%m/%d/%Y %H:%M:%S.%f")
-            except ValueError:
-                return datetime.strptime(timestamp_clean, "%m/%d/%Y %H:%M:%S")
-        except:
-            return None
+        """Parse timestamp from a combat log line (fast decoder, strptime fallback)."""
+        return parse_combat_log_timestamp(line)
 
     def process_combat_event_enhanced(self, line: str, player_name: str, pet_name: Optional[str], features: Dict):
         """Process a single combat log event with enhanced pet index tracking."""
+        # Reject events without a registered handler before any split
+        handler = self.event_handlers.get(get_combat_log_event_type(line))
+        if handler is None:
+            return
+
         try:
-            parts = line.strip().split(',')
+            # Handled events read at most event_fields_needed fields - the rest of the line is never split
+            parts = split_combat_log_fields(line.strip(), self.event_fields_needed)
             if len(parts) < 3:
                 return
 
-            first_part = parts[0]
-            event_type = first_part.split()[-1] if ' ' in first_part else first_part
-
-            # SPELL_DISPEL events (Pet Purges) - USE PET INDEX
-            if event_type == 'SPELL_DISPEL' and len(parts) >= 13:
-                src = parts[2].strip('"').split('-', 1)[0]
-                spell_name = parts[10].strip('"')
-
-                # Check if source is any of the player's known pets using pet index
-                if spell_name == "Devour Magic" and self.is_player_pet(src, player_name):
-                    purged_aura = parts[12].strip('"')
-                    features['purges_own'] += 1
-                    features['spells_purged'].append(purged_aura)
-
-            # Cast success events - Only count player casts (not pets)
-            elif event_type == 'SPELL_CAST_SUCCESS' and len(parts) >= 11:
-                src = parts[2].strip('"').split('-', 1)[0]
-                spell_name = parts[10].strip('"')
-
-                if src == player_name:
-                    features['cast_success_own'] += 1
-                    features['spells_cast'].append(spell_name)
-
-            # Interrupt events - CHECK FOR BOTH PLAYER AND PET INTERRUPTS
-            elif event_type == 'SPELL_INTERRUPT' and len(parts) >= 11:
-                src = parts[2].strip('"').split('-', 1)[0]
-                dst = parts[6].strip('"').split('-', 1)[0]
-
-                # Check if interrupt source is player OR any of their pets
-                interrupt_by_player = (src == player_name)
-                interrupt_by_pet = self.is_player_pet(src, player_name)
-                interrupted_player = (dst == player_name)
-                interrupted_pet = self.is_player_pet(dst, player_name)
-
-                if interrupt_by_player or interrupt_by_pet:
-                    features['interrupt_success_own'] += 1
-                elif interrupted_player or interrupted_pet:
-                    features['times_interrupted'] += 1
-
-            # Precognition aura applications
-            elif event_type == 'SPELL_AURA_APPLIED' and len(parts) >= 11:
-                dst = parts[6].strip('"').split('-', 1)[0]
-                spell_name = parts[10].strip('"')
-
-                if spell_name == 'Precognition':
-                    if dst == player_name:
-                        features['precog_gained_own'] += 1
-                    else:
-                        features['precog_gained_enemy'] += 1
-
-            # Death events
-            elif event_type == 'UNIT_DIED' and len(parts) >= 7:
-                died_unit = parts[6].strip('"').split('-', 1)[0]
-                if died_unit == player_name:
-                    features['times_died'] += 1
+            handler(parts, player_name, pet_name, features)
 
         except:
             pass
 
     def setup_output_csv(self, output_csv: str):
-        """Set up the output CSV file with complete headers including purges_own."""
+        """Set up the output CSV file with complete headers including purges_own (or clear a Parquet dataset)."""
+        if self.output_sink is not None and self.output_sink.path == Path(output_csv):
+            self.close_output_sink()
+
+        if not str(output_csv).lower().endswith('.csv'):
+            if os.path.isdir(output_csv):
+                shutil.rmtree(output_csv)
+                print(f"   🗑️ Deleted existing Parquet dataset for clean rebuild")
+            return
+
         if os.path.exists(output_csv):
             os.remove(output_csv)
             print(f"   🗑️ Deleted existing CSV file for clean rebuild")
 
         with open(output_csv, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = [
-                'filename', 'match_start_time', 'cast_success_own', 'interrupt_success_own',
-                'times_interrupted', 'precog_gained_own', 'precog_gained_enemy', 'purges_own',
-                'damage_done', 'healing_done', 'deaths_caused', 'times_died',
-                'spells_cast', 'spells_purged'
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=self.feature_columns)
             writer.writeheader()
-            print(f"   SUCCESS: Created new CSV with complete schema: {len(fieldnames)} columns")
+            print(f"   SUCCESS: Created new CSV with complete schema: {len(self.feature_columns)} columns")
 
     def write_features_to_csv(self, features: Dict, output_csv: str):
-        """Write extracted features to the output CSV."""
+        """Write one match's features straight to the output CSV (unbuffered, for one-off rows)."""
         with open(output_csv, 'a', newline='', encoding='utf-8') as f:
-            features_for_csv = features.copy()
-            features_for_csv['spells_cast'] = '; '.join(features['spells_cast']) if features['spells_cast'] else ''
-            features_for_csv['spells_purged'] = '; '.join(features['spells_purged']) if features[
-                'spells_purged'] else ''
+            writer = csv.DictWriter(f, fieldnames=self.feature_columns, extrasaction='ignore')
+            writer.writerow(format_feature_row(features))
+
+
+# Per-process parser for pool workers, so the pet index is loaded once per worker
+_WORKER_PARSER: Optional[EnhancedProductionCombatParser] = None
 
-            fieldnames = [
-                'filename', 'match_start_time', 'cast_success_own', 'interrupt_success_own',
-                'times_interrupted', 'precog_gained_own', 'precog_gained_enemy', 'purges_own',
-                'damage_done', 'healing_done', 'deaths_caused', 'times_died',
-                'spells_cast', 'spells_purged'
-            ]
 
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writerow(features_for_csv)
+def _init_shard_worker(base_dir: str, extractor_names: List[str], instrumentation_settings: Optional[Dict]):
+    """Process pool initializer: build the worker's parser (and pet index) once."""
+    global _WORKER_PARSER
+    # Workers only collect metrics; the parent merges them and is the only writer
+    instrumentation = ParserInstrumentation(**instrumentation_settings) if instrumentation_settings else None
+    _WORKER_PARSER = EnhancedProductionCombatParser(base_dir, extractors=extractor_names,
+                                                    instrumentation=instrumentation)
 
 
-def main():
+def _extract_log_shard(log_file: Path, shard: List[Tuple[int, pd.Series, int]]) -> Tuple[Dict[int, Dict], Optional[Dict]]:
+    """Pool task: resolve every match of one combat log and extract them in a single pass."""
+    results = _WORKER_PARSER.extract_log_shard(log_file, shard)
+    return results, _WORKER_PARSER.instrumentation.drain()
+
+
+def main(workers: int = 1, extractors: Optional[List[str]] = None, metrics: Optional[str] = None,
+         profile_rate: float = 0.0):
     """Main function to run enhanced production combat parsing."""
     base_dir = "E:/Footage/Footage/WoW - Warcraft Recorder/Wow Arena Matches"
     enhanced_index = f"{base_dir}/master_index_enhanced.csv"
     logs_dir = f"{base_dir}/Logs"
     output_csv = f"{base_dir}/match_features_enhanced_VERIFIED.csv"
 
-    parser = EnhancedProductionCombatParser(base_dir)
+    # metrics='' (flag without a path) writes parser_metrics.jsonl next to the output
+    if metrics == '':
+        metrics = f"{base_dir}/{METRICS_FILENAME}"
+    instrumentation = open_instrumentation(metrics, profile_rate)
+
+    parser = EnhancedProductionCombatParser(base_dir, workers=workers, extractors=extractors,
+                                            instrumentation=instrumentation)
     # CRITICAL: Force rebuild with enhanced verification
     parser.parse_enhanced_matches(enhanced_index, logs_dir, output_csv, force_rebuild=True)
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""
+Feature Extractors
+
+Registry of the per-match feature extractors run by the production parser. Each
+extractor declares the event types it consumes, its output columns and its per-match
+state. The parser builds a single event dispatch table from the enabled extractors, so
+every enabled feature is computed in the same pass over a log, and the output schema is
+the enabled extractors' columns.
+
+A new feature is a subclass registered with @register_feature_extractor:
+
+    @register_feature_extractor
+    class KicksTakenExtractor(FeatureExtractor):
+        name = 'kicks_taken'
+        event_types = ('SPELL_INTERRUPT',)
+        columns = ('kicks_taken',)
+        fields_needed = 7
+        default_enabled = False
+
+        def handle(self, event_type, parts, player_name, pet_name, state):
+            if state[IDENTITY_KEY].is_player(parts[5], parts[6]):
+                state['kicks_taken'] += 1
+
+and is enabled per run by name (EnhancedProductionCombatParser(..., extractors=[...]) or
+--extractors). Schema order is registry order, whatever order names are given in:
+filename and match_start_time, then every scalar column, then every list column.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+
+# Columns every feature row starts with
+KEY_COLUMNS = ('filename', 'match_start_time')
+
+# State key of the match's UnitIdentityTable (player and pet GUIDs of this match only)
+IDENTITY_KEY = '_identity'
+
+
+class FeatureExtractor:
+    """
+    One group of output columns computed from a set of event types.
+
+    handle() receives the tokenized line (split to fields_needed fields) and the match's
+    state dict, which holds new_state() - the extractor's columns at their starting values
+    plus any private keys (prefixed '_'; they are never written) - and the match's identity
+    table under IDENTITY_KEY. finish() runs once when the match's lines are done.
+    """
+
+    name = ''
+    event_types: Tuple[str, ...] = ()
+    columns: Tuple[str, ...] = ()
+    list_columns: Tuple[str, ...] = ()   # subset of columns holding lists, written '; '-joined
+    fields_needed = 13                   # leading fields of a line handle() reads
+    default_enabled = True
+    always_enabled = False               # not optional (e.g. identity tracking other extractors rely on)
+
+    def __init__(self, parser):
+        self.parser = parser
+
+    def new_state(self) -> Dict:
+        """Per-match state: every column at its starting value."""
+        return {column: [] if column in self.list_columns else 0 for column in self.columns}
+
+    def handle(self, event_type: str, parts: List[str], player_name: str, pet_name: Optional[str], state: Dict):
+        raise NotImplementedError
+
+    def finish(self, state: Dict):
+        """Derive final column values from private state (nothing to do by default)."""
+
+
+FEATURE_EXTRACTORS: Dict[str, Type[FeatureExtractor]] = {}
+
+
+def register_feature_extractor(extractor_class: Type[FeatureExtractor]) -> Type[FeatureExtractor]:
+    """Class decorator adding an extractor to the registry under its name."""
+    if not extractor_class.name:
+        raise ValueError(f"{extractor_class.__name__} has no name")
+    FEATURE_EXTRACTORS[extractor_class.name] = extractor_class
+    return extractor_class
+
+
+def resolve_extractor_names(names: Optional[Iterable[str]] = None) -> List[str]:
+    """Enabled extractor names in registry order: the defaults, or the given names (plus required ones)."""
+    if names is None:
+        wanted = {name for name, cls in FEATURE_EXTRACTORS.items() if cls.default_enabled}
+    else:
+        wanted = set(names)
+        unknown = wanted - set(FEATURE_EXTRACTORS)
+        if unknown:
+            raise ValueError(f"Unknown feature extractors: {', '.join(sorted(unknown))} "
+                             f"(available: {', '.join(FEATURE_EXTRACTORS)})")
+    wanted |= {name for name, cls in FEATURE_EXTRACTORS.items() if cls.always_enabled}
+    return [name for name in FEATURE_EXTRACTORS if name in wanted]
+
+
+def feature_columns(extractor_classes: Iterable[Type[FeatureExtractor]]) -> List[str]:
+    """Output schema of a set of extractors: key columns, scalar columns, then list columns."""
+    extractor_classes = list(extractor_classes)
+    scalar = [column for cls in extractor_classes for column in cls.columns if column not in cls.list_columns]
+    lists = [column for cls in extractor_classes for column in cls.columns if column in cls.list_columns]
+    columns = list(KEY_COLUMNS) + scalar + lists
+    if len(set(columns)) != len(columns):
+        raise ValueError("Two enabled feature extractors write the same column")
+    return columns
+
+
+def build_event_handlers(extractors: List[FeatureExtractor]) -> Dict[str, Callable]:
+    """
+    Event type -> handler(parts, player_name, pet_name, features) for a set of extractors.
+    Event types consumed by several extractors get one handler that calls each in turn.
+    """
+    consumers: Dict[str, List[FeatureExtractor]] = {}
+    for extractor in extractors:
+        for event_type in extractor.event_types:
+            consumers.setdefault(event_type, []).append(extractor)
+
+    return {event_type: _event_handler(event_type, event_consumers)
+            for event_type, event_consumers in consumers.items()}
+
+
+def _event_handler(event_type: str, consumers: List[FeatureExtractor]) -> Callable:
+    if len(consumers) == 1:
+        handle = consumers[0].handle
+
+        def handler(parts, player_name, pet_name, features):
+            handle(event_type, parts, player_name, pet_name, features)
+    else:
+        handles = [consumer.handle for consumer in consumers]
+
+        def handler(parts, player_name, pet_name, features):
+            for handle in handles:
+                handle(event_type, parts, player_name, pet_name, features)
+    return handler
+
+
+# Built-in extractors, in schema order
+
+@register_feature_extractor
+class IdentityExtractor(FeatureExtractor):
+    """Player summons and arena participants feed the match's identity table - no columns."""
+
+    name = 'identity'
+    event_types = ('SPELL_SUMMON', 'COMBATANT_INFO')
+    fields_needed = 6
+    always_enabled = True
+
+    def handle(self, event_type, parts, player_name, pet_name, state):
+        identity = state[IDENTITY_KEY]
+        if event_type == 'COMBATANT_INFO':
+            # Arena participants - the player's GUID must be one of them
+            identity.add_participant(parts[1].strip())
+        elif len(parts) >= 6 and identity.is_player(parts[1], parts[2], parts[3]):
+            # Summons by the player - their GUIDs count as the player's pets
+            identity.add_pet(parts[5])
+
+
+@register_feature_extractor
+class CastsExtractor(FeatureExtractor):
+    """Cast success events - Only count player casts (not pets)"""
+
+    name = 'casts'
+    event_types = ('SPELL_CAST_SUCCESS',)
+    columns = ('cast_success_own', 'spells_cast')
+    list_columns = ('spells_cast',)
+    fields_needed = 11
+
+    def handle(self, event_type, parts, player_name, pet_name, state):
+        if len(parts) >= 11:
+            spell_name = parts[10].strip('"')
+
+            if state[IDENTITY_KEY].is_player(parts[1], parts[2], parts[3], first_cast=True):
+                state['cast_success_own'] += 1
+                state['spells_cast'].append(spell_name)
+
+
+@register_feature_extractor
+class InterruptsExtractor(FeatureExtractor):
+    """Interrupt events - CHECK FOR BOTH PLAYER AND PET INTERRUPTS"""
+
+    name = 'interrupts'
+    event_types = ('SPELL_INTERRUPT',)
+    columns = ('interrupt_success_own', 'times_interrupted')
+    fields_needed = 11
+
+    def handle(self, event_type, parts, player_name, pet_name, state):
+        if len(parts) >= 11:
+            parser = self.parser
+            identity = state[IDENTITY_KEY]
+
+            # Check if interrupt source is player OR any of their pets
+            if identity.is_player(parts[1], parts[2], parts[3]) or parser.is_owned_pet(identity, parts[1], parts[2]):
+                state['interrupt_success_own'] += 1
+            elif identity.is_player(parts[5], parts[6], parts[7]) or parser.is_owned_pet(identity, parts[5], parts[6]):
+                state['times_interrupted'] += 1
+
+
+@register_feature_extractor
+class PrecognitionExtractor(FeatureExtractor):
+    """Precognition aura applications"""
+
+    name = 'precognition'
+    event_types = ('SPELL_AURA_APPLIED',)
+    columns = ('precog_gained_own', 'precog_gained_enemy')
+    fields_needed = 11
+
+    def handle(self, event_type, parts, player_name, pet_name, state):
+        if len(parts) >= 11:
+            spell_name = parts[10].strip('"')
+
+            if spell_name == 'Precognition':
+                if state[IDENTITY_KEY].is_player(parts[5], parts[6], parts[7]):
+                    state['precog_gained_own'] += 1
+                else:
+                    state['precog_gained_enemy'] += 1
+
+
+@register_feature_extractor
+class PurgesExtractor(FeatureExtractor):
+    """SPELL_DISPEL events (Pet Purges) - USE PET INDEX"""
+
+    name = 'purges'
+    event_types = ('SPELL_DISPEL',)
+    columns = ('purges_own', 'spells_purged')
+    list_columns = ('spells_purged',)
+    fields_needed = 13
+
+    def handle(self, event_type, parts, player_name, pet_name, state):
+        if len(parts) >= 13:
+            spell_name = parts[10].strip('"')
+
+            # Check if source is any of the player's known pets using pet index
+            if spell_name == "Devour Magic" and \
+                    self.parser.is_owned_pet(state[IDENTITY_KEY], parts[1], parts[2]):
+                purged_aura = parts[12].strip('"')
+                state['purges_own'] += 1
+                state['spells_purged'].append(purged_aura)
+
+
+@register_feature_extractor
+class ThroughputColumns(FeatureExtractor):
+    """damage_done / healing_done: kept in the schema, not extracted yet (always 0)."""
+
+    name = 'throughput'
+    columns = ('damage_done', 'healing_done')
+
+
+@register_feature_extractor
+class DeathsExtractor(FeatureExtractor):
+    """Death events (deaths_caused is kept in the schema but not extracted yet)"""
+
+    name = 'deaths'
+    event_types = ('UNIT_DIED',)
+    columns = ('deaths_caused', 'times_died')
+    fields_needed = 8
+
+    def handle(self, event_type, parts, player_name, pet_name, state):
+        if len(parts) >= 7:
+            flags = parts[7] if len(parts) > 7 else ''
+            if state[IDENTITY_KEY].is_player(parts[5], parts[6], flags):
+                state['times_died'] += 1
+
+
+# Schema of the default extractor set
+FEATURE_COLUMNS = feature_columns(FEATURE_EXTRACTORS[name] for name in resolve_extractor_names())
@@ -0,0 +1,304 @@
+"""
+Feature Output Sink
+
+Buffered writers for the parser's per-match feature rows. Rows are collected in memory
+and flushed every flush_rows rows or flush_seconds seconds; checkpoint() additionally
+fsyncs what was flushed, so the processing manifest is only committed for matches whose
+rows are already durable.
+
+Two formats, chosen by the output path:
+  *.csv      one CSV file, appended through a single open handle
+  otherwise  a Parquet dataset partitioned by month and bracket
+             (match_features/month=2025-05/bracket=3v3/part-....parquet)
+
+Rows are keyed by the video filename. Writing a key that is already in the output, or
+calling upsert(), replaces that row: the CSV is rewritten as a stream that copies every
+untouched line as-is, and a Parquet dataset only rewrites the partitions holding the keys.
+"""
+
+import csv
+import io
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from development_standards import extract_arena_info_from_filename
+from feature_extractors import FEATURE_COLUMNS
+
+
+DEFAULT_FLUSH_ROWS = 100
+DEFAULT_FLUSH_SECONDS = 30.0
+
+
+def format_feature_row(features: Dict) -> Dict:
+    """Output row for a features dict (or a row read back through pandas): lists '; '-joined."""
+    row = {}
+    for column, value in features.items():
+        if isinstance(value, list):
+            value = '; '.join(value) if value else ''
+        elif hasattr(value, 'item'):
+            value = value.item()  # numpy scalar from a pandas row
+        if isinstance(value, float) and value != value:
+            value = ''  # NaN: an empty cell read back through pandas
+        row[column] = value
+    return row
+
+
+def _fsync_path(path: Path):
+    fd = os.open(str(path), os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class FeatureOutputSink:
+    """Common buffering; subclasses implement _write_rows, _apply_upserts and existing_keys."""
+
+    def __init__(self, path: Path, columns: List[str] = None, flush_rows: int = DEFAULT_FLUSH_ROWS,
+                 flush_seconds: float = DEFAULT_FLUSH_SECONDS):
+        self.path = Path(path)
+        self.columns = list(columns or FEATURE_COLUMNS)
+        self.flush_rows = max(1, flush_rows)
+        self.flush_seconds = flush_seconds
+        self._buffer: List[Dict] = []
+        self._upserts: Dict[str, Dict] = {}
+        self._last_flush = time.monotonic()
+        self.keys = self.existing_keys()
+
+    def write(self, features: Dict):
+        """Queue one match row (an upsert if its filename is already in the output)."""
+        row = format_feature_row(features)
+        key = row['filename']
+        if key in self.keys:
+            self._upserts[key] = row
+        else:
+            self.keys.add(key)
+            self._buffer.append(row)
+
+        if len(self._buffer) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def upsert(self, rows: Iterable[Dict]):
+        """Replace (or add) rows keyed by filename."""
+        for row in rows:
+            row = format_feature_row(row)
+            if row['filename'] in self.keys:
+                self._upserts[row['filename']] = row
+            else:
+                self.keys.add(row['filename'])
+                self._buffer.append(row)
+        self.flush()
+
+    def flush(self):
+        """Hand buffered rows and pending upserts to the output (no fsync)."""
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self._buffer = []
+        if self._upserts:
+            self._apply_upserts(self._upserts)
+            self._upserts = {}
+        self._last_flush = time.monotonic()
+
+    def checkpoint(self):
+        """Flush and fsync, so everything written so far survives a crash."""
+        self.flush()
+        self._sync()
+
+    def close(self):
+        """Checkpoint and release the output."""
+        self.checkpoint()
+
+    def existing_keys(self) -> set:
+        raise NotImplementedError
+
+    def load_rows(self) -> pd.DataFrame:
+        """All rows currently in the output."""
+        raise NotImplementedError
+
+    def _write_rows(self, rows: List[Dict]):
+        raise NotImplementedError
+
+    def _apply_upserts(self, upserts: Dict[str, Dict]):
+        raise NotImplementedError
+
+    def _sync(self):
+        raise NotImplementedError
+
+
+class CsvFeatureSink(FeatureOutputSink):
+    """Feature rows appended to one CSV file through a single open handle."""
+
+    def __init__(self, path: Path, **kwargs):
+        self._handle = None
+        self._writer = None
+        super().__init__(path, **kwargs)
+
+    def existing_keys(self) -> set:
+        if not self.path.exists():
+            return set()
+        with open(self.path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header and header != self.columns:
+                raise ValueError(f"{self.path} was written with a different feature set "
+                                 f"({len(header)} columns) - rebuild it or write to a new output")
+            return {row[0] for row in reader if row}
+
+    def load_rows(self) -> pd.DataFrame:
+        self.flush()
+        if not self.path.exists():
+            return pd.DataFrame(columns=self.columns)
+        return pd.read_csv(self.path)
+
+    def _open(self):
+        if self._handle is None:
+            write_header = not self.path.exists() or self.path.stat().st_size == 0
+            self._handle = open(self.path, 'a', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._handle, fieldnames=self.columns, extrasaction='ignore')
+            if write_header:
+                self._writer.writeheader()
+
+    def _write_rows(self, rows: List[Dict]):
+        self._open()
+        self._writer.writerows(rows)
+        self._handle.flush()
+
+    def _apply_upserts(self, upserts: Dict[str, Dict]):
+        # A CSV row cannot change size in place: stream a copy, substituting keyed rows
+        self._close_handle()
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(self.path, 'r', newline='', encoding='utf-8') as src, \
+                open(tmp_path, 'w', newline='', encoding='utf-8') as dst:
+            writer = csv.DictWriter(dst, fieldnames=self.columns, extrasaction='ignore')
+            for line_num, line in enumerate(src):
+                key = next(csv.reader(io.StringIO(line)), [None])[0] if line_num else None
+                if key in upserts:
+                    writer.writerow(upserts[key])
+                else:
+                    dst.write(line)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _sync(self):
+        if self._handle is not None:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+
+    def _close_handle(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._writer = None
+
+    def close(self):
+        super().close()
+        self._close_handle()
+
+
+class ParquetFeatureSink(FeatureOutputSink):
+    """Feature rows as a Parquet dataset partitioned by month and bracket."""
+
+    def __init__(self, path: Path, **kwargs):
+        # Imported here: pyarrow is optional for the rest of the parser
+        from combat_log_event_store import import_pyarrow
+
+        self.pa = import_pyarrow()
+        if self.pa is None:
+            raise ImportError("pyarrow is required for Parquet output")
+        self._unsynced: List[Path] = []
+        self._part_seq = 0
+        # Unique per sink, so parts written by earlier runs are never overwritten
+        self._run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{os.urandom(4).hex()}"
+        super().__init__(path, **kwargs)
+
+    @staticmethod
+    def partition_for(row: Dict) -> Tuple[str, str]:
+        """(month, bracket) partition of a row."""
+        month = str(row.get('match_start_time', ''))[:7] or 'unknown'
+        bracket, _ = extract_arena_info_from_filename(str(row['filename']))
+        return month, bracket.replace(' ', '_')
+
+    def _partition_dir(self, partition: Tuple[str, str]) -> Path:
+        month, bracket = partition
+        return self.path / f"month={month}" / f"bracket={bracket}"
+
+    def _part_files(self, partition_dir: Path = None) -> List[Path]:
+        root = partition_dir or self.path
+        return sorted(root.rglob('part-*.parquet')) if root.exists() else []
+
+    def existing_keys(self) -> set:
+        keys = set()
+        part_files = self._part_files()
+        if part_files and self.pa.parquet.read_schema(str(part_files[0])).names != self.columns:
+            raise ValueError(f"{self.path} was written with a different feature set "
+                             f"- rebuild it or write to a new output")
+        for part_file in part_files:
+            keys.update(self.pa.parquet.read_table(str(part_file), columns=['filename']).column(0).to_pylist())
+        return keys
+
+    def load_rows(self) -> pd.DataFrame:
+        self.flush()
+        tables = [self.pa.parquet.read_table(str(part_file)) for part_file in self._part_files()]
+        if not tables:
+            return pd.DataFrame(columns=self.columns)
+        return self.pa.concat_tables(tables).to_pandas()[self.columns]
+
+    def _table(self, rows: List[Dict]):
+        return self.pa.Table.from_pylist([{column: row.get(column) for column in self.columns} for row in rows])
+
+    def _write_part(self, partition_dir: Path, rows: List[Dict]) -> Path:
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        self._part_seq += 1
+        part_file = partition_dir / f"part-{self._run_id}-{self._part_seq:05d}.parquet"
+        tmp_path = part_file.with_name(part_file.name + '.tmp')
+        self.pa.parquet.write_table(self._table(rows), str(tmp_path), compression='zstd')
+        os.replace(tmp_path, part_file)
+        self._unsynced.append(part_file)
+        return part_file
+
+    def _group_by_partition(self, rows: Iterable[Dict]) -> Dict[Tuple[str, str], List[Dict]]:
+        groups: Dict[Tuple[str, str], List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(self.partition_for(row), []).append(row)
+        return groups
+
+    def _write_rows(self, rows: List[Dict]):
+        for partition, partition_rows in self._group_by_partition(rows).items():
+            self._write_part(self._partition_dir(partition), partition_rows)
+
+    def _apply_upserts(self, upserts: Dict[str, Dict]):
+        # Only partitions holding upserted keys are rewritten (compacted into one part)
+        for partition, partition_rows in self._group_by_partition(upserts.values()).items():
+            partition_dir = self._partition_dir(partition)
+            old_parts = self._part_files(partition_dir)
+            replacements = {row['filename']: row for row in partition_rows}
+
+            rows = []
+            for part_file in old_parts:
+                for row in self.pa.parquet.read_table(str(part_file)).to_pylist():
+                    rows.append(replacements.pop(row['filename'], row))
+            rows.extend(replacements.values())
+
+            new_part = self._write_part(partition_dir, rows)
+            self._sync()
+            for part_file in old_parts:
+                if part_file != new_part:
+                    part_file.unlink()
+
+    def _sync(self):
+        for part_file in self._unsynced:
+            if part_file.exists():
+                _fsync_path(part_file)
+        self._unsynced = []
+
+
+def open_feature_sink(output_path: str, **kwargs) -> FeatureOutputSink:
+    """CSV sink for *.csv paths, partitioned Parquet dataset otherwise."""
+    if str(output_path).lower().endswith('.csv'):
+        return CsvFeatureSink(Path(output_path), **kwargs)
+    return ParquetFeatureSink(Path(output_path), **kwargs)
@@ -13,10 +13,12 @@ from typing import Dict, List, Optional, Tuple
 import json
 from collections import defaultdict
 
+from combat_log_io import open_combat_log
 from development_standards import (
     SafeLogger,
     select_combat_log_file,
     parse_combat_log_timestamp,
+    split_combat_log_fields,
     export_json_safely
 )
 from arena_match_model import (
@@ -262,7 +264,7 @@ def test_realistic_targeting_analysis(match_row: pd.Series, logs_dir: Path) -> O
         events_processed = 0
         
         try:
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+            with open_combat_log(log_file) as f:
                 for line in f:
                     events_processed += 1
                     if events_processed > 50000:  # Safety limit
@@ -347,7 +349,7 @@ def parse_combat_event_quickly(line: str, timestamp: datetime) -> Optional[Dict]
     try:
         if '  ' in line:
             timestamp_part, event_data = line.split('  ', 1)
-            parts = event_data.split(',')
+            parts = split_combat_log_fields(event_data, 11)
             
             if len(parts) >= 7:
                 return {
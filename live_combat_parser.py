@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Live Combat Log Follower
+
+Tails the newest WoWCombatLog-*.txt while WoW is writing it and emits one feature row
+per arena match as soon as its ARENA_MATCH_END line arrives. Features are accumulated
+per arena segment through the production parser's event handlers, so a live row counts
+exactly what process_combat_event_enhanced counts for the same lines. The log owner is
+identified again for every match, since one session log can hold several characters.
+
+Memory stays bounded however long the log grows: the file is read in fixed-size chunks,
+only the current segment's counters are kept, and the unterminated tail of the file and
+the lines buffered before the log owner is known are both capped.
+
+Usage:
+  python live_combat_parser.py --logs-dir Logs --output live_features.csv
+  python live_combat_parser.py --replay Logs/WoWCombatLog-050625_182406.txt --logs-dir /tmp/live --rate 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from arena_match_model import AFFILIATION_MINE, TYPE_PLAYER
+from development_standards import (
+    SafeLogger,
+    get_combat_log_event_type,
+    parse_combat_log_timestamp,
+    split_combat_log_fields
+)
+from enhanced_combat_parser_production_ENHANCED import EnhancedProductionCombatParser
+
+
+LOG_GLOB = 'WoWCombatLog-*.txt'
+READ_CHUNK_BYTES = 1024 * 1024
+MAX_PARTIAL_LINE_BYTES = 1024 * 1024
+MAX_PENDING_LINES = 20000
+
+
+class LiveCombatLogFollower:
+    """Follow the newest combat log in a directory and write a row per finished arena match."""
+
+    def __init__(self, parser: EnhancedProductionCombatParser, logs_dir: str, output_csv: str,
+                 player_name: Optional[str] = None, poll_interval: float = 1.0, from_start: bool = False):
+        self.parser = parser
+        self.logs_dir = Path(logs_dir)
+        self.output_csv = output_csv
+        self.fixed_player_name = player_name
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+
+        self.log_file: Optional[Path] = None
+        self.handle = None
+        self.offset = 0
+        self.partial = b''
+        self.skipping_long_line = False
+
+        self.player_name = player_name
+        self.segment: Optional[Dict] = None
+        self.rows_written = 0
+
+    def _newest_log(self) -> Optional[Path]:
+        """Most recently modified combat log in the logs directory."""
+        newest = None
+        newest_mtime = None
+        for log_file in self.logs_dir.glob(LOG_GLOB):
+            try:
+                mtime = log_file.stat().st_mtime
+            except OSError:
+                continue
+            if newest_mtime is None or mtime > newest_mtime:
+                newest, newest_mtime = log_file, mtime
+        return newest
+
+    def _open_log(self, log_file: Path, at_end: bool):
+        """Switch to log_file, dropping any state that belongs to the previous log."""
+        self._close_log()
+        if self.segment is not None:
+            SafeLogger.warning(f"Left {self.log_file.name} during an unfinished arena match - discarded")
+            self.segment = None
+
+        self.log_file = log_file
+        self.handle = open(log_file, 'rb')
+        self.offset = self.handle.seek(0, os.SEEK_END) if at_end else 0
+        self.partial = b''
+        self.skipping_long_line = False
+        self.player_name = self.fixed_player_name
+        SafeLogger.info(f"Following {log_file.name} from byte {self.offset:,}")
+
+    def _close_log(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    def poll(self) -> int:
+        """Read everything appended since the last poll; returns the number of bytes consumed."""
+        if self.handle is None:
+            newest = self._newest_log()
+            # Only a log that already existed at startup is joined at its end
+            if newest is None:
+                self.from_start = True
+                return 0
+            self._open_log(newest, at_end=not self.from_start)
+            self.from_start = True
+
+        # Truncated or replaced in place: start over from the beginning
+        try:
+            size = os.fstat(self.handle.fileno()).st_size
+            replaced = not self.log_file.exists() or not os.path.samestat(
+                os.fstat(self.handle.fileno()), self.log_file.stat())
+        except OSError:
+            size, replaced = self.offset, True
+        if replaced and self.log_file.exists():
+            SafeLogger.warning(f"{self.log_file.name} was replaced - following the new file")
+            self._open_log(self.log_file, at_end=False)
+        elif size < self.offset:
+            SafeLogger.warning(f"{self.log_file.name} was truncated - restarting from the beginning")
+            self._open_log(self.log_file, at_end=False)
+
+        consumed = 0
+        self.handle.seek(self.offset)
+        while True:
+            chunk = self.handle.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            consumed += len(chunk)
+            self._consume_chunk(chunk)
+            self.offset += len(chunk)
+
+        # Rotation: WoW starts a new file on /combatlog toggles and client restarts
+        if consumed == 0:
+            newest = self._newest_log()
+            if newest is not None and newest != self.log_file:
+                self._open_log(newest, at_end=False)
+                return self.poll()
+
+        return consumed
+
+    def _consume_chunk(self, chunk: bytes):
+        """Split a chunk into complete lines; the unterminated tail waits for the next read."""
+        lines = chunk.split(b'\n')
+        lines[0] = self.partial + lines[0]
+        self.partial = lines.pop()
+
+        if len(self.partial) > MAX_PARTIAL_LINE_BYTES:
+            # No combat log line is this long - drop it instead of buffering without bound
+            SafeLogger.warning(f"Skipping oversized line in {self.log_file.name}")
+            self.partial = b''
+            self.skipping_long_line = True
+
+        for raw_line in lines:
+            if self.skipping_long_line:
+                self.skipping_long_line = False
+                continue
+            self.process_line(raw_line.decode('utf-8', errors='ignore').rstrip('\r'))
+
+    def process_line(self, line: str):
+        """Feed one complete log line to the current arena segment."""
+        event_type = get_combat_log_event_type(line)
+
+        if event_type == 'ARENA_MATCH_START':
+            self._start_segment(line)
+            return
+        if self.segment is None:
+            return
+        if event_type == 'ARENA_MATCH_END':
+            self._finish_segment()
+            return
+
+        if self.player_name is None:
+            self._identify_player(line)
+            if self.player_name is None:
+                if event_type in self.parser.event_handlers:
+                    pending = self.segment['pending_lines']
+                    if len(pending) < MAX_PENDING_LINES:
+                        pending.append(line)
+                    else:
+                        self.segment['dropped_lines'] += 1
+                return
+            self.segment['features'] = self._new_features()
+            self._replay_pending_lines()
+
+        if event_type == 'SPELL_SUMMON' and self.segment['pet_name'] is None:
+            parts = split_combat_log_fields(line, 7)
+            if len(parts) >= 7 and parts[2].strip('"').split('-', 1)[0] == self.player_name:
+                self.segment['pet_name'] = parts[6].strip('"')
+
+        self.parser.process_combat_event_enhanced(line, self.player_name, self.segment['pet_name'],
+                                                  self.segment['features'])
+
+    def _identify_player(self, line: str):
+        """Pick up the match's log owner from the first unit flagged as the logging player."""
+        parts = split_combat_log_fields(line, 5)
+        if len(parts) < 4 or not parts[3].startswith('0x'):
+            return
+        try:
+            flags = int(parts[3], 16)
+        except ValueError:
+            return
+        if flags & AFFILIATION_MINE and flags & TYPE_PLAYER:
+            self.player_name = parts[2].strip('"').split('-', 1)[0]
+            SafeLogger.info(f"Identified log owner: {self.player_name}")
+
+    def _replay_pending_lines(self):
+        pending: List[str] = self.segment['pending_lines']
+        self.segment['pending_lines'] = []
+        for pending_line in pending:
+            self.parser.process_combat_event_enhanced(pending_line, self.player_name, self.segment['pet_name'],
+                                                      self.segment['features'])
+
+    def _start_segment(self, line: str):
+        if self.segment is not None:
+            SafeLogger.warning("ARENA_MATCH_START without a matching END - previous match discarded")
+
+        # A session log can hold matches of several characters - identify the owner per match
+        self.player_name = self.fixed_player_name
+
+        event_time = parse_combat_log_timestamp(line)
+        arena_info = self.parser.parse_arena_start_line(line, event_time) if event_time else None
+
+        self.segment = {
+            'arena_info': arena_info,
+            'match_start_time': event_time.isoformat() if event_time else '',
+            'pet_name': None,
+            'pending_lines': [],
+            'dropped_lines': 0,
+            # Created once the owner is known - the match's identity table starts from their name
+            'features': None
+        }
+        if self.player_name is not None:
+            self.segment['features'] = self._new_features()
+
+    def _new_features(self) -> Dict:
+        match_start_time = self.segment['match_start_time']
+        return self.parser.new_match_features(f"live:{self.log_file.name}:{match_start_time}", match_start_time,
+                                              self.player_name)
+
+    def _finish_segment(self):
+        segment, self.segment = self.segment, None
+        if self.player_name is None:
+            SafeLogger.warning("Arena match ended before the log owner was identified - no row written")
+            return
+        if segment['dropped_lines']:
+            SafeLogger.warning(f"{segment['dropped_lines']} early lines exceeded the pending buffer and were skipped")
+
+        self.parser.finish_match_features(segment['features'])
+        if not os.path.exists(self.output_csv):
+            self.parser.setup_output_csv(self.output_csv)
+        self.parser.write_features_to_csv(segment['features'], self.output_csv)
+        self.rows_written += 1
+
+        features = segment['features']
+        arena = segment['arena_info'] or {}
+        SafeLogger.success(f"Match ended ({arena.get('bracket', '?')} {arena.get('map', '?')}, "
+                           f"{features['match_start_time']}): casts={features['cast_success_own']}, "
+                           f"interrupts={features['interrupt_success_own']}, died={features['times_died']}")
+
+    def run(self, max_idle_polls: Optional[int] = None) -> int:
+        """Poll until interrupted (or after max_idle_polls consecutive empty polls); returns rows written."""
+        idle_polls = 0
+        try:
+            while max_idle_polls is None or idle_polls < max_idle_polls:
+                if self.poll():
+                    idle_polls = 0
+                else:
+                    idle_polls += 1
+                    time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            SafeLogger.info("Follow mode stopped")
+        finally:
+            self._close_log()
+        return self.rows_written
+
+
+def replay_log(source_log: Path, logs_dir: Path, rate: float = 1000.0, chunk_lines: int = 100) -> Path:
+    """
+    Append an existing combat log to a fresh WoWCombatLog-*.txt in logs_dir at roughly
+    rate lines/second - a stand-in for the game client when testing follow mode.
+    """
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    target = logs_dir / time.strftime('WoWCombatLog-%m%d%y_%H%M%S.txt')
+
+    written = 0
+    with open(source_log, 'rb') as src, open(target, 'ab') as dst:
+        batch = []
+        for raw_line in src:
+            batch.append(raw_line)
+            if len(batch) >= chunk_lines:
+                dst.write(b''.join(batch))
+                dst.flush()
+                written += len(batch)
+                batch = []
+                if rate > 0:
+                    time.sleep(chunk_lines / rate)
+        if batch:
+            dst.write(b''.join(batch))
+            written += len(batch)
+
+    SafeLogger.success(f"Replayed {written:,} lines into {target}")
+    return target
+
+
+def main(argv=None):
+    """Follow the newest combat log, or replay a log for testing."""
+    arg_parser = argparse.ArgumentParser(description="Live arena feature extraction from a growing combat log")
+    arg_parser.add_argument('--base-dir', default='.', help='Directory holding player_pet_index.json')
+    arg_parser.add_argument('--logs-dir', default='Logs', help='Directory WoW writes combat logs to')
+    arg_parser.add_argument('--output', default='match_features_live.csv', help='CSV to append match rows to')
+    arg_parser.add_argument('--player', help='Character name of the log owner (default: detect from unit flags)')
+    arg_parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls when idle')
+    arg_parser.add_argument('--from-start', action='store_true',
+                            help='Process the newest log from its beginning instead of only new lines')
+    arg_parser.add_argument('--max-idle-polls', type=int, help='Stop after this many consecutive empty polls')
+    arg_parser.add_argument('--extractors', help='Comma-separated feature extractors to run (default: all default ones)')
+    arg_parser.add_argument('--replay', type=Path, help='Append this log into --logs-dir instead of following')
+    arg_parser.add_argument('--rate', type=float, default=1000.0, help='Replay speed in lines per second (0 = max)')
+    args = arg_parser.parse_args(argv)
+
+    if args.replay:
+        replay_log(args.replay, Path(args.logs_dir), args.rate)
+        return 0
+
+    extractors = args.extractors.split(',') if args.extractors else None
+    parser = EnhancedProductionCombatParser(args.base_dir, extractors=extractors)
+    follower = LiveCombatLogFollower(parser, args.logs_dir, args.output, player_name=args.player,
+                                     poll_interval=args.poll_interval, from_start=args.from_start)
+    rows = follower.run(args.max_idle_polls)
+    SafeLogger.info(f"Wrote {rows} match rows to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Parser Instrumentation
+
+Opt-in timing and counters for EnhancedProductionCombatParser, written as JSONL so a slow
+run can be broken down afterwards:
+
+  {"type": "match", ...}     per match: stage seconds, JSON files loaded, lines in its
+                             window and events dispatched to it per event type
+  {"type": "log_pass", ...}  per streaming pass over a log: seconds, windows, lines read,
+                             lines parsed (handled lines with a decoded timestamp), lines
+                             inside at least one match window, events per type
+  {"type": "run", ...}       per parse run: totals of everything above
+
+Stages (seconds are inclusive - boundary_search contains json_load, segment_catalog and
+death_correlation):
+
+  log_lookup, pet_lookup, boundary_search, json_load, segment_catalog, death_correlation,
+  event_extraction
+
+A sampled subset of matches (profile_rate, chosen by a hash of the filename so every
+worker process picks the same ones) is also run under cProfile, with one .prof dump per
+boundary search and per extraction pass holding a sampled match.
+
+The parser holds a NullInstrumentation unless one is passed in: its timers are a shared
+no-op context manager and the extraction loop only keeps plain local line counts.
+"""
+
+import cProfile
+import json
+import os
+import time
+import zlib
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+METRICS_FILENAME = 'parser_metrics.jsonl'
+
+_NULL_CONTEXT = nullcontext()
+
+
+class NullInstrumentation:
+    """Disabled instrumentation: every hook is a no-op."""
+
+    enabled = False
+
+    def stage(self, name: str):
+        return _NULL_CONTEXT
+
+    def match(self, filename: str):
+        return _NULL_CONTEXT
+
+    def profile(self, name: str, sample_keys: Iterable[str] = ()):
+        return _NULL_CONTEXT
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def record_log_pass(self, log_file: Path, windows: List[Dict], seconds: float, lines_read: int,
+                        lines_parsed: int, lines_in_window: int, failed: bool = False):
+        pass
+
+    def worker_settings(self) -> Optional[Dict]:
+        return None
+
+    def drain(self) -> Optional[Dict]:
+        return None
+
+    def merge(self, snapshot: Optional[Dict]):
+        pass
+
+    def flush(self):
+        pass
+
+    def finish_run(self, **details):
+        pass
+
+
+class _StageTimer:
+    __slots__ = ('instrumentation', 'name', 'start')
+
+    def __init__(self, instrumentation: 'ParserInstrumentation', name: str):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.add_stage_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _MatchScope:
+    __slots__ = ('instrumentation', 'filename', 'previous')
+
+    def __init__(self, instrumentation: 'ParserInstrumentation', filename: str):
+        self.instrumentation = instrumentation
+        self.filename = filename
+
+    def __enter__(self):
+        self.previous = self.instrumentation.current
+        self.instrumentation.current = self.instrumentation.match_record(self.filename)
+        return self.instrumentation.current
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.current = self.previous
+        return False
+
+
+class _ProfileDump:
+    def __init__(self, dump_path: Path):
+        self.dump_path = dump_path
+        self.profiler = None
+
+    def __enter__(self):
+        try:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        except ValueError:
+            # Another profiler is already active (e.g. the whole run is under cProfile)
+            self.profiler = None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.profiler is not None:
+            self.profiler.disable()
+            try:
+                self.dump_path.parent.mkdir(parents=True, exist_ok=True)
+                self.profiler.dump_stats(str(self.dump_path))
+            except OSError as e:
+                print(f"WARNING: Could not write profile {self.dump_path.name}: {e}")
+        return False
+
+
+class ParserInstrumentation:
+    """
+    Collects stage timings and counters and appends them to metrics_path as JSONL.
+
+    Without a metrics_path (pool workers) records are only collected; the parent process
+    drains them from each finished shard and merges them into its own instrumentation.
+    """
+
+    enabled = True
+
+    def __init__(self, metrics_path: Optional[Path] = None, profile_rate: float = 0.0,
+                 profile_dir: Optional[Path] = None):
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self.profile_rate = max(0.0, min(1.0, profile_rate))
+        if profile_dir:
+            self.profile_dir = Path(profile_dir)
+        elif self.metrics_path:
+            self.profile_dir = self.metrics_path.with_name(self.metrics_path.stem + '_profiles')
+        else:
+            self.profile_dir = Path('parser_profiles')
+
+        self.current: Optional[Dict] = None
+        self._start_run()
+
+    def _start_run(self):
+        self.run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+        self.run_started = datetime.now()
+        self.run_clock = time.perf_counter()
+        self.run_matches = 0
+        self.run_passes = 0
+        self.run_stages: Dict[str, List[float]] = {}
+        self.run_counters: Counter = Counter()
+        self.run_events: Counter = Counter()
+        self._reset_totals()
+
+    def _reset_totals(self):
+        self.stages: Dict[str, List[float]] = {}
+        self.counters: Counter = Counter()
+        self.events: Counter = Counter()
+        self.matches: Dict[str, Dict] = {}
+        self.passes: List[Dict] = []
+
+    # --- hooks used by the parser ---
+
+    def stage(self, name: str) -> _StageTimer:
+        """Context manager timing one stage (added to the run and the current match)."""
+        return _StageTimer(self, name)
+
+    def match(self, filename: str) -> _MatchScope:
+        """Context manager attributing stages and counters inside it to a match."""
+        return _MatchScope(self, filename)
+
+    def count(self, name: str, n: int = 1):
+        """Add to a counter of the run and the current match."""
+        self.counters[name] += n
+        if self.current is not None:
+            self.current['counters'][name] = self.current['counters'].get(name, 0) + n
+
+    def profile(self, name: str, sample_keys: Iterable[str] = ()):
+        """cProfile the block into <profile_dir>/<name>.prof if name or any sample key is sampled."""
+        if not self.profile_rate:
+            return _NULL_CONTEXT
+        if not any(self.is_sampled(key) for key in (name, *sample_keys)):
+            return _NULL_CONTEXT
+        return _ProfileDump(self.profile_dir / f"{name}.prof")
+
+    def is_sampled(self, key: str) -> bool:
+        """Deterministic sample: the same keys are picked in every process and run."""
+        return zlib.crc32(str(key).encode('utf-8')) % 10000 < self.profile_rate * 10000
+
+    def add_stage_time(self, name: str, seconds: float):
+        totals = self.stages.get(name)
+        if totals is None:
+            totals = self.stages[name] = [0.0, 0]
+        totals[0] += seconds
+        totals[1] += 1
+        if self.current is not None:
+            stages = self.current['stages']
+            stages[name] = stages.get(name, 0.0) + seconds
+
+    def match_record(self, filename: str) -> Dict:
+        record = self.matches.get(filename)
+        if record is None:
+            record = self.matches[filename] = {'type': 'match', 'filename': filename, 'log_file': None,
+                                               'stages': {}, 'counters': {}, 'events': {}}
+        return record
+
+    def record_log_pass(self, log_file: Path, windows: List[Dict], seconds: float, lines_read: int,
+                        lines_parsed: int, lines_in_window: int, failed: bool = False):
+        """Counters of one extraction pass; per-window counts go to their match records."""
+        pass_events = Counter()
+        for window in windows:
+            record = self.match_record(window['features']['filename'])
+            record['log_file'] = Path(log_file).name
+            record['counters']['lines_in_window'] = (record['counters'].get('lines_in_window', 0)
+                                                     + window.get('lines_in_window', 0))
+            event_counts = window.get('event_counts', {})
+            for event_type, n in event_counts.items():
+                record['events'][event_type] = record['events'].get(event_type, 0) + n
+            pass_events.update(event_counts)
+
+        self.add_stage_time('event_extraction', seconds)
+        self.counters.update({'lines_read': lines_read, 'lines_parsed': lines_parsed,
+                              'lines_in_window': lines_in_window,
+                              'events_dispatched': sum(pass_events.values())})
+        self.events.update(pass_events)
+        self.passes.append({
+            'type': 'log_pass',
+            'log_file': Path(log_file).name,
+            'windows': len(windows),
+            'seconds': round(seconds, 6),
+            'lines_read': lines_read,
+            'lines_parsed': lines_parsed,
+            'lines_in_window': lines_in_window,
+            'events': dict(pass_events),
+            'failed': failed
+        })
+
+    # --- moving records between processes ---
+
+    def worker_settings(self) -> Dict:
+        """Constructor arguments for the collect-only instrumentation of a pool worker."""
+        return {'profile_rate': self.profile_rate, 'profile_dir': str(self.profile_dir)}
+
+    def drain(self) -> Dict:
+        """Hand over (and forget) everything collected since the last drain."""
+        snapshot = {
+            'stages': self.stages,
+            'counters': dict(self.counters),
+            'events': dict(self.events),
+            'matches': list(self.matches.values()),
+            'passes': self.passes
+        }
+        self._reset_totals()
+        self.current = None
+        return snapshot
+
+    def merge(self, snapshot: Optional[Dict]):
+        """Add a drained snapshot (from a pool worker) to this run."""
+        if not snapshot:
+            return
+        for name, (seconds, calls) in snapshot['stages'].items():
+            totals = self.stages.setdefault(name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += calls
+        self.counters.update(snapshot['counters'])
+        self.events.update(snapshot['events'])
+        self.passes.extend(snapshot['passes'])
+
+        for worker_record in snapshot['matches']:
+            record = self.match_record(worker_record['filename'])
+            record['log_file'] = worker_record['log_file'] or record['log_file']
+            for key in ('stages', 'counters', 'events'):
+                for name, value in worker_record[key].items():
+                    record[key][name] = record[key].get(name, 0) + value
+
+    # --- output ---
+
+    def _write(self, records: List[Dict]):
+        if not self.metrics_path or not records:
+            return
+        try:
+            with open(self.metrics_path, 'a', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps({'run_id': self.run_id, **record}) + '\n')
+        except OSError as e:
+            print(f"WARNING: Could not write parser metrics to {self.metrics_path}: {e}")
+
+    def flush(self):
+        """Append the finished match and log pass records (run totals keep accumulating)."""
+        records = []
+        for record in self.matches.values():
+            record['stages'] = {name: round(seconds, 6) for name, seconds in record['stages'].items()}
+            records.append(record)
+        records.extend(self.passes)
+        self._write(records)
+
+        self.run_matches += len(self.matches)
+        self.run_passes += len(self.passes)
+        for name, (seconds, calls) in self.stages.items():
+            totals = self.run_stages.setdefault(name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += calls
+        self.run_counters.update(self.counters)
+        self.run_events.update(self.events)
+        self._reset_totals()
+        self.current = None
+
+    def finish_run(self, **details):
+        """Flush, append the run summary and start a new run."""
+        self.flush()
+        summary = {
+            'type': 'run',
+            'started': self.run_started.isoformat(timespec='seconds'),
+            'seconds': round(time.perf_counter() - self.run_clock, 3),
+            'matches': self.run_matches,
+            'log_passes': self.run_passes,
+            'stages': {name: {'seconds': round(seconds, 6), 'calls': calls}
+                       for name, (seconds, calls) in self.run_stages.items()},
+            'counters': dict(self.run_counters),
+            'events': dict(self.run_events),
+            **details
+        }
+        self._write([summary])
+        self._start_run()
+        return summary
+
+
+def open_instrumentation(metrics_path: Optional[str] = None, profile_rate: float = 0.0,
+                         profile_dir: Optional[str] = None):
+    """ParserInstrumentation writing to metrics_path, or a NullInstrumentation when no path is given."""
+    if not metrics_path:
+        return NullInstrumentation()
+    return ParserInstrumentation(Path(metrics_path), profile_rate, Path(profile_dir) if profile_dir else None)
@@ -10,6 +10,10 @@ from typing import Dict, Set, List, Optional
 from collections import defaultdict
 import re
 
+from combat_log_io import find_combat_logs
+from combat_log_scanner import iter_marker_lines
+from development_standards import split_combat_log_fields
+
 
 class PetIndexBuilder:
     def __init__(self, base_dir: str):
@@ -97,7 +101,7 @@ class PetIndexBuilder:
             print(f"🗑️ Deleted existing index file: {output_file}")
 
         # Get all combat log files
-        log_files = list(self.logs_dir.glob('*.txt'))
+        log_files = find_combat_logs(self.logs_dir)
         log_files.sort()
 
         print(f"📊 Found {len(log_files)} combat log files")
@@ -132,24 +136,22 @@ class PetIndexBuilder:
         summon_events_found = 0
 
         try:
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    # Look for SPELL_SUMMON events
-                    if 'SPELL_SUMMON' in line:
-                        pet_info = self.parse_summon_event_filtered(line, log_file.name, line_num)
-                        if pet_info:
-                            player_name = pet_info['player']
-                            pet_name = pet_info['pet']
-
-                            # ONLY store if this is one of OUR characters
-                            if player_name in self.our_characters:
-                                # Add to index
-                                self.player_pet_index[player_name]['pet_names'].add(pet_name)
-                                self.player_pet_index[player_name]['summon_events'].append(pet_info)
-                                self.player_pet_index[player_name]['characters_found'].add(player_name)
-                                self.player_pet_index[player_name]['logs_with_summons'].add(log_file.name)
-
-                                summon_events_found += 1
+            # Look for SPELL_SUMMON events - only those lines are decoded
+            for marker_line in iter_marker_lines(log_file, (b'SPELL_SUMMON',), count_lines=True):
+                pet_info = self.parse_summon_event_filtered(marker_line.text, log_file.name, marker_line.line_num)
+                if pet_info:
+                    player_name = pet_info['player']
+                    pet_name = pet_info['pet']
+
+                    # ONLY store if this is one of OUR characters
+                    if player_name in self.our_characters:
+                        # Add to index
+                        self.player_pet_index[player_name]['pet_names'].add(pet_name)
+                        self.player_pet_index[player_name]['summon_events'].append(pet_info)
+                        self.player_pet_index[player_name]['characters_found'].add(player_name)
+                        self.player_pet_index[player_name]['logs_with_summons'].add(log_file.name)
+
+                        summon_events_found += 1
 
         except Exception as e:
             print(f"   ⚠️ Error processing {log_file.name}: {e}")
@@ -159,10 +161,10 @@ class PetIndexBuilder:
     def parse_summon_event_filtered(self, line: str, log_filename: str, line_num: int) -> Optional[Dict]:
         """Parse a SPELL_SUMMON line to extract player and pet information - filtered for our characters."""
         try:
-            parts = line.strip().split(',')
+            parts = split_combat_log_fields(line.strip(), 7)
             if len(parts) >= 7:
                 # Extract timestamp
-                timestamp_part = line.split(',')[1].strip() if ',' in line else ''
+                timestamp_part = parts[1].strip()
 
                 # Extract player (source) and pet (target)
                 source_guid = parts[2].strip('"')
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Pipeline Throughput Benchmarks
+
+Times every stage of the processing pipeline on a dataset (normally one written by
+synthetic_combat_log.py) and reports the results as JSON, so runs on different commits
+can be compared:
+
+  log_index_build        time index and arena segment catalog of every log, from scratch
+  pet_index_build        PetIndexBuilder over every log
+  boundary_detection     log lookup and verified arena boundaries for every indexed video
+  feature_extraction     the production parser, force rebuild, into a scratch output
+  targeting_extraction   JSON-metadata targeting analysis for every indexed video
+
+Each stage runs in a freshly spawned process, so in-process caches from an earlier stage
+never help a later one and peak RSS is the stage's own. Stages run in this order because
+later ones use what earlier ones build (sidecar indexes, player_pet_index.json).
+lines/s is the dataset's total log lines over the stage's wall time.
+
+Usage:
+  python pipeline_benchmarks.py --data bench_data --generate --size-mb 100 --arenas 20
+  python pipeline_benchmarks.py --data bench_data --output results.json
+  python pipeline_benchmarks.py --data bench_data --stages feature_extraction --workers 8 --compare results.json
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from development_standards import SafeLogger
+
+
+BENCHMARK_VERSION = 1
+
+STAGES = ['log_index_build', 'pet_index_build', 'boundary_detection', 'feature_extraction',
+          'targeting_extraction']
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process and its finished children, in MB (None if unknown)."""
+    try:
+        import resource
+    except ImportError:
+        # Windows: psutil is optional
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 1024 / 1024
+        except (ImportError, AttributeError):
+            return None
+
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is bytes on macOS, KB elsewhere
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _log_files(data_dir: Path) -> List[Path]:
+    # Imported here: stage modules are only loaded inside the stage processes
+    from combat_log_io import find_combat_logs
+
+    return sorted(find_combat_logs(data_dir / 'Logs'))
+
+
+def _load_index(parser, data_dir: Path):
+    import pandas as pd
+
+    index_df = pd.read_csv(data_dir / 'master_index_enhanced.csv')
+    index_df = parser._clean_timestamps_in_df(index_df)
+    return index_df.dropna(subset=['precise_start_time']).reset_index(drop=True)
+
+
+def stage_log_index_build(data_dir: Path, workers: int) -> Dict:
+    from arena_segment_catalog import ArenaSegmentCatalog
+    from combat_log_index import CombatLogTimeIndex
+
+    log_files = _log_files(data_dir)
+    for log_file in log_files:
+        for sidecar in (CombatLogTimeIndex.sidecar_path(log_file), ArenaSegmentCatalog.sidecar_path(log_file)):
+            if sidecar.exists():
+                sidecar.unlink()
+
+    segments = 0
+    for log_file in log_files:
+        CombatLogTimeIndex.build(log_file).save()
+        catalog = ArenaSegmentCatalog.build(log_file)
+        catalog.save()
+        segments += len(catalog.segments)
+    return {'matches': segments, 'succeeded': segments}
+
+
+def stage_pet_index_build(data_dir: Path, workers: int) -> Dict:
+    from pet_index_builder import PetIndexBuilder
+
+    builder = PetIndexBuilder(str(data_dir))
+    index = builder.build_comprehensive_pet_index()
+    players = len(index.get('player_pets', {})) if index else 0
+    return {'matches': len(_log_files(data_dir)), 'succeeded': players}
+
+
+def stage_boundary_detection(data_dir: Path, workers: int) -> Dict:
+    from enhanced_combat_parser_production_ENHANCED import (
+        DEFAULT_TIME_WINDOW, RELIABILITY_TIME_WINDOWS, EnhancedProductionCombatParser)
+
+    parser = EnhancedProductionCombatParser(str(data_dir))
+    index_df = _load_index(parser, data_dir)
+    log_files = _log_files(data_dir)
+    match_logs = parser.resolve_match_logs(index_df['precise_start_time'], log_files)
+
+    found = 0
+    for (_, match), log_file in zip(index_df.iterrows(), match_logs):
+        if log_file is None:
+            continue
+        time_window = RELIABILITY_TIME_WINDOWS.get(str(match.get('matching_reliability', '')).lower(),
+                                                   DEFAULT_TIME_WINDOW)
+        buffer = timedelta(seconds=time_window)
+        match_start = match['precise_start_time']
+        duration = float(match.get('duration_s', 300))
+        arena_start, _ = parser.find_verified_arena_boundaries(
+            log_file, match_start - buffer, match_start + timedelta(seconds=duration) + buffer,
+            match_start, match['filename'], duration)
+        found += arena_start is not None
+    return {'matches': len(index_df), 'succeeded': found}
+
+
+def stage_feature_extraction(data_dir: Path, workers: int) -> Dict:
+    import pandas as pd
+    from enhanced_combat_parser_production_ENHANCED import EnhancedProductionCombatParser
+
+    scratch_dir = Path(tempfile.mkdtemp(prefix='pipeline_benchmark_'))
+    try:
+        # The processing manifest lives in base_dir: parse from a scratch copy of the metadata
+        shutil.copy2(data_dir / 'master_index_enhanced.csv', scratch_dir)
+        pet_index = data_dir / 'player_pet_index.json'
+        if pet_index.exists():
+            shutil.copy2(pet_index, scratch_dir)
+        for json_dir in data_dir.iterdir():
+            if json_dir.is_dir() and json_dir.name != 'Logs':
+                (scratch_dir / json_dir.name).symlink_to(json_dir.resolve(), target_is_directory=True)
+
+        output_csv = scratch_dir / 'match_features.csv'
+        parser = EnhancedProductionCombatParser(str(scratch_dir), workers=workers)
+        parser.parse_enhanced_matches(str(scratch_dir / 'master_index_enhanced.csv'), str(data_dir / 'Logs'),
+                                      str(output_csv), force_rebuild=True)
+        rows = len(pd.read_csv(output_csv)) if output_csv.exists() else 0
+        matches = len(pd.read_csv(scratch_dir / 'master_index_enhanced.csv'))
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    return {'matches': matches, 'succeeded': rows}
+
+
+def stage_targeting_extraction(data_dir: Path, workers: int) -> Dict:
+    import pandas as pd
+    from json_metadata_targeting_system import test_realistic_targeting_analysis
+
+    # The targeting system resolves JSON metadata relative to the working directory
+    os.chdir(data_dir)
+    index_df = pd.read_csv('master_index_enhanced.csv')
+    succeeded = 0
+    for _, match in index_df.iterrows():
+        result = test_realistic_targeting_analysis(match, Path('Logs'))
+        succeeded += bool(result and result.get('success'))
+    return {'matches': len(index_df), 'succeeded': succeeded}
+
+
+STAGE_FUNCTIONS = {
+    'log_index_build': stage_log_index_build,
+    'pet_index_build': stage_pet_index_build,
+    'boundary_detection': stage_boundary_detection,
+    'feature_extraction': stage_feature_extraction,
+    'targeting_extraction': stage_targeting_extraction
+}
+
+
+def _run_stage(stage: str, data_dir: str, workers: int, quiet: bool) -> Dict:
+    """Stage body run inside its own process."""
+    data_dir = Path(data_dir).resolve()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    with open(os.devnull, 'w') as devnull, \
+            (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+        start = time.perf_counter()
+        result = STAGE_FUNCTIONS[stage](data_dir, workers)
+        result['seconds'] = time.perf_counter() - start
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def run_stage(stage: str, data_dir: Path, workers: int = 1, quiet: bool = True) -> Dict:
+    """Run one stage in a freshly spawned process and return its timings."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run_stage, stage, str(data_dir), workers, quiet).result()
+
+
+def count_log_lines(log_files: List[Path]) -> int:
+    """Newlines in a set of logs (raw or archived), read in large blocks."""
+    from combat_log_io import open_combat_log
+
+    lines = 0
+    for log_file in log_files:
+        with open_combat_log(log_file, 'rb') as f:
+            for block in iter(lambda: f.read(16 * 1024 * 1024), b''):
+                lines += block.count(b'\n')
+    return lines
+
+
+def describe_dataset(data_dir: Path) -> Dict:
+    """Logs, lines, bytes and indexed matches of a dataset."""
+    from synthetic_combat_log import load_dataset_summary
+
+    log_files = _log_files(data_dir)
+    summary = load_dataset_summary(data_dir)
+    log_bytes = sum(log_file.stat().st_size for log_file in log_files)
+    if summary is not None and summary['bytes'] == log_bytes:
+        lines = summary['lines']
+    else:
+        lines = count_log_lines(log_files)
+
+    with open(data_dir / 'master_index_enhanced.csv', 'r', encoding='utf-8') as f:
+        matches = sum(1 for _ in f) - 1
+
+    return {
+        'path': str(data_dir),
+        'logs': len(log_files),
+        'lines': lines,
+        'bytes': log_bytes,
+        'matches': matches,
+        'synthetic': summary is not None,
+        'seed': summary.get('seed') if summary else None
+    }
+
+
+def current_commit() -> Optional[str]:
+    """Git commit of the code being benchmarked (None outside a checkout)."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(data_dir: Path, stages: List[str] = None, workers: int = 1, quiet: bool = True) -> Dict:
+    """Run the selected stages in pipeline order; returns the JSON-ready report."""
+    data_dir = Path(data_dir)
+    dataset = describe_dataset(data_dir)
+    report = {
+        'benchmark_version': BENCHMARK_VERSION,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': current_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workers': workers,
+        'dataset': dataset,
+        'stages': {}
+    }
+
+    for stage in STAGES:
+        if stages and stage not in stages:
+            continue
+        SafeLogger.info(f"Running {stage}...")
+        result = run_stage(stage, data_dir, workers, quiet)
+        seconds = max(result['seconds'], 1e-9)
+        result['lines_per_s'] = dataset['lines'] / seconds
+        result['matches_per_s'] = result['matches'] / seconds
+        report['stages'][stage] = result
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else 'n/a'
+        SafeLogger.info(f"{stage}: {result['seconds']:.2f}s, {result['lines_per_s']:,.0f} lines/s, "
+                        f"{result['matches_per_s']:.2f} matches/s ({result['succeeded']}/{result['matches']}), "
+                        f"peak RSS {rss}")
+    return report
+
+
+def print_comparison(report: Dict, baseline: Dict):
+    """Per-stage wall time against an earlier report (< 1.00x is faster)."""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp', '?')})")
+    print("=" * 40)
+    if baseline.get('dataset', {}).get('bytes') != report['dataset']['bytes']:
+        SafeLogger.warning("Datasets differ - ratios are not like for like")
+    for stage, result in report['stages'].items():
+        before = baseline.get('stages', {}).get(stage)
+        if not before:
+            continue
+        ratio = result['seconds'] / max(before['seconds'], 1e-9)
+        print(f"{stage:<22} {before['seconds']:8.2f}s -> {result['seconds']:8.2f}s  x{ratio:.2f}")
+
+
+def main():
+    """Run pipeline throughput benchmarks"""
+    arg_parser = argparse.ArgumentParser(description="Combat log pipeline throughput benchmarks")
+    arg_parser.add_argument('--data', type=Path, required=True,
+                            help='Dataset directory (Logs/, master_index_enhanced.csv, video JSON)')
+    arg_parser.add_argument('--generate', action='store_true',
+                            help='Write a synthetic dataset into --data first if it has none')
+    arg_parser.add_argument('--size-mb', type=float, default=100, help='Generated log size in MB (default: 100)')
+    arg_parser.add_argument('--arenas', type=int, default=20, help='Generated arena matches (default: 20)')
+    arg_parser.add_argument('--logs', type=int, default=1, help='Generated session logs (default: 1)')
+    arg_parser.add_argument('--seed', type=int, default=0, help='Generator seed (default: 0)')
+    arg_parser.add_argument('--stages', help=f"Comma-separated stages (default: all - {', '.join(STAGES)})")
+    arg_parser.add_argument('--workers', type=int, default=1, help='Worker processes for feature extraction')
+    arg_parser.add_argument('--output', type=Path, help='Write the JSON report here (default: stdout)')
+    arg_parser.add_argument('--compare', type=Path, help='Earlier JSON report to compare stage times with')
+    arg_parser.add_argument('--verbose', action='store_true', help='Show stage output')
+    args = arg_parser.parse_args()
+
+    stages = args.stages.split(',') if args.stages else None
+    unknown = set(stages or []) - set(STAGES)
+    if unknown:
+        SafeLogger.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+        return 1
+
+    if args.generate and not (args.data / 'master_index_enhanced.csv').exists():
+        from synthetic_combat_log import generate_dataset
+
+        generate_dataset(args.data, args.size_mb, args.arenas, args.logs, args.seed)
+    if not (args.data / 'master_index_enhanced.csv').exists():
+        SafeLogger.error(f"No master_index_enhanced.csv in {args.data} (use --generate)")
+        return 1
+
+    report = run_benchmarks(args.data, stages, args.workers, quiet=not args.verbose)
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(report_json + '\n', encoding='utf-8')
+        SafeLogger.success(f"Report written to {args.output}")
+    else:
+        print(report_json)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Processing Manifest
+
+Transactional record of which (combat log, match) pairs the production parser has
+finished, stored in SQLite next to the outputs (processing_manifest.sqlite).
+
+Each entry is keyed by the log path and match filename and carries the fingerprint of
+the inputs it was produced from: log size, mtime, a SHA-256 of the log's first
+HASH_PREFIX_BYTES and the parser version. A match is skipped on restart only while all
+of those still agree, so a log that grew, was replaced or is parsed by a newer parser
+version is re-run. Completed matches are buffered and committed in batches, so a crash
+loses at most one batch of progress; before_commit lets the caller make the matching
+output rows durable first.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+MANIFEST_FILENAME = 'processing_manifest.sqlite'
+
+# Bytes hashed per log - catches replaced logs whose size and mtime happen to agree
+HASH_PREFIX_BYTES = 64 * 1024
+
+# Completed matches buffered before a transaction is committed
+DEFAULT_COMMIT_INTERVAL = 25
+
+
+class LogFingerprint(NamedTuple):
+    """Identity of a combat log's contents at processing time."""
+    log_path: str
+    size: int
+    mtime: float
+    hash_prefix: str
+
+
+def fingerprint_log(log_file: Path) -> LogFingerprint:
+    """Size, mtime and prefix hash of a combat log."""
+    log_file = Path(log_file)
+    stat = log_file.stat()
+    with open(log_file, 'rb') as f:
+        hash_prefix = hashlib.sha256(f.read(HASH_PREFIX_BYTES)).hexdigest()[:16]
+    return LogFingerprint(str(log_file), stat.st_size, stat.st_mtime, hash_prefix)
+
+
+class ProcessingManifest:
+    """SQLite-backed set of finished matches, keyed by log path and match filename."""
+
+    def __init__(self, db_path: Path, parser_version: str, commit_interval: int = DEFAULT_COMMIT_INTERVAL):
+        self.db_path = Path(db_path)
+        self.parser_version = parser_version
+        self.commit_interval = max(1, commit_interval)
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS processed_matches (
+                log_path TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                log_size INTEGER NOT NULL,
+                log_mtime REAL NOT NULL,
+                log_hash_prefix TEXT NOT NULL,
+                parser_version TEXT NOT NULL,
+                features_written INTEGER NOT NULL,
+                processed_at TEXT NOT NULL,
+                PRIMARY KEY (log_path, filename)
+            )
+        """)
+        self.conn.commit()
+
+        # In-memory view of the table for O(1) lookups while planning
+        self._entries: Dict[Tuple[str, str], Tuple[int, float, str, str]] = {}
+        for log_path, filename, size, mtime, hash_prefix, version in self.conn.execute(
+                "SELECT log_path, filename, log_size, log_mtime, log_hash_prefix, parser_version "
+                "FROM processed_matches"):
+            self._entries[(log_path, filename)] = (size, mtime, hash_prefix, version)
+
+        self._fingerprints: Dict[str, LogFingerprint] = {}
+        self._pending: List[Tuple] = []
+
+        # Called before every commit so outputs are durable before their matches are recorded
+        self.before_commit: Optional[Callable[[], None]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def fingerprint(self, log_file: Path) -> LogFingerprint:
+        """Fingerprint of a log, computed once per log per run."""
+        key = str(log_file)
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            fingerprint = fingerprint_log(log_file)
+            self._fingerprints[key] = fingerprint
+        return fingerprint
+
+    def is_processed(self, log_file: Path, filename: str) -> bool:
+        """True if the match was finished from exactly this log content by this parser version."""
+        entry = self._entries.get((str(log_file), filename))
+        if entry is None:
+            return False
+        fingerprint = self.fingerprint(log_file)
+        return entry == (fingerprint.size, fingerprint.mtime, fingerprint.hash_prefix, self.parser_version)
+
+    def mark_processed(self, log_file: Path, filename: str, features_written: bool):
+        """Record a finished match; committed with the next batch."""
+        fingerprint = self.fingerprint(log_file)
+        self._entries[(fingerprint.log_path, filename)] = (
+            fingerprint.size, fingerprint.mtime, fingerprint.hash_prefix, self.parser_version)
+        self._pending.append((fingerprint.log_path, filename, fingerprint.size, fingerprint.mtime,
+                              fingerprint.hash_prefix, self.parser_version, int(features_written),
+                              datetime.now().isoformat()))
+        if len(self._pending) >= self.commit_interval:
+            self.commit()
+
+    def commit(self):
+        """Write buffered entries in one transaction."""
+        if not self._pending:
+            return
+        if self.before_commit is not None:
+            self.before_commit()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO processed_matches (log_path, filename, log_size, log_mtime, "
+                "log_hash_prefix, parser_version, features_written, processed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._pending)
+        self._pending = []
+
+    def clear(self):
+        """Forget every entry (force rebuild)."""
+        self._pending = []
+        self._entries = {}
+        with self.conn:
+            self.conn.execute("DELETE FROM processed_matches")
+
+    def close(self):
+        """Commit outstanding entries and close the database."""
+        self.commit()
+        self.conn.close()
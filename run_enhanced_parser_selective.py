@@ -3,6 +3,7 @@
 
 import sys
 import os
+import argparse
 from datetime import datetime
 from pathlib import Path
 
@@ -10,7 +11,7 @@ from pathlib import Path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 
-def run_selective_reprocessing():
+def run_selective_reprocessing(workers: int = 1):
     """Run selective re-processing for matches with zero interrupts using enhanced pet logic."""
 
     print("🚀 Starting SELECTIVE Re-processing for Zero Interrupt Matches")
@@ -41,8 +42,8 @@ def run_selective_reprocessing():
 
         # Initialize parser
         print(f"🔧 Initializing parser with pet index...")
-        parser = EnhancedProductionCombatParser(base_dir)
-        print(f"✅ Parser initialized")
+        parser = EnhancedProductionCombatParser(base_dir, workers=workers)
+        print(f"✅ Parser initialized ({workers} worker process{'es' if workers > 1 else ''})")
 
         # Check pet index
         pet_count = len(parser.pet_index.get('player_pets', {}))
@@ -81,7 +82,7 @@ def run_selective_reprocessing():
     return True
 
 
-def run_full_processing():
+def run_full_processing(workers: int = 1):
     """Run full processing with enhanced pet logic (force rebuild)."""
 
     print("🚀 Starting FULL Enhanced Combat Parser Processing")
@@ -111,8 +112,8 @@ def run_full_processing():
 
         # Initialize parser
         print(f"🔧 Initializing parser with pet index...")
-        parser = EnhancedProductionCombatParser(base_dir)
-        print(f"✅ Parser initialized")
+        parser = EnhancedProductionCombatParser(base_dir, workers=workers)
+        print(f"✅ Parser initialized ({workers} worker process{'es' if workers > 1 else ''})")
 
         # Check pet index
         pet_count = len(parser.pet_index.get('player_pets', {}))
@@ -174,8 +175,14 @@ def show_interrupt_stats(output_csv: str):
         print(f"⚠️ Could not show stats: {e}")
 
 
-def main():
+def main(workers: int = None):
     """Main function with menu."""
+    if workers is None:
+        arg_parser = argparse.ArgumentParser(description="Enhanced combat parser with pet index logic")
+        arg_parser.add_argument('--workers', type=int, default=1,
+                                help='Worker processes, matches are sharded by combat log (default: 1)')
+        workers = arg_parser.parse_args().workers
+
     print("🎮 Enhanced Combat Parser with Pet Index Logic")
     print("=" * 60)
     print("Choose processing mode:")
@@ -189,11 +196,11 @@ def main():
             
             if choice == '1':
                 print("\n🎯 Starting selective re-processing...")
-                success = run_selective_reprocessing()
+                success = run_selective_reprocessing(workers)
                 break
             elif choice == '2':
                 print("\n🚀 Starting full processing...")
-                success = run_full_processing()
+                success = run_full_processing(workers)
                 break
             elif choice == '3':
                 print("👋 Goodbye!")
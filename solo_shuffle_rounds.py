@@ -0,0 +1,241 @@
+"""
+Solo Shuffle Rounds
+
+Splits a Solo Shuffle match into its rounds in one streaming pass over the match's byte
+range (the ARENA_MATCH_START .. ARENA_MATCH_END segment from the arena segment catalog).
+Only the marker lines below are decoded:
+
+  COMBATANT_INFO      sent for every combatant, with that round's team id, before each
+                      round - the first one after a finished round, or a repeat of a
+                      GUID already seen this round, opens the next round
+  Arena Preparation   (32727) applied while the gates are closed and removed when they
+                      open; opens a round when a log has no COMBATANT_INFO for it
+  UNIT_DIED           the first death of a round participant (a player, never a pet)
+                      ends the round
+  ARENA_MATCH_END     ends a round still in progress
+
+A round still in progress when the next round's COMBATANT_INFO arrives ended without a
+death and is recorded as a draw. Each round gets its teams rebuilt from its own
+COMBATANT_INFO team ids (the friendly team is the one holding the primary player) and
+the byte range [start_offset, end_offset) of its lines, so round-level features can read
+exactly one round with iter_round_lines.
+"""
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from arena_match_model import (
+    ArenaMatchModel, PlayerInfo, SoloShuffleRound, TeamComposition, TeamSide, unit_base_name
+)
+from arena_segment_catalog import get_segment_catalog
+from combat_log_io import open_combat_log
+from combat_log_scanner import iter_marker_lines
+from development_standards import parse_combat_log_timestamp
+
+
+ARENA_PREPARATION_SPELL_ID = '32727'
+SOLO_SHUFFLE_ROUNDS = 6
+
+ROUND_MARKERS = (b'COMBATANT_INFO', b'UNIT_DIED', b',' + ARENA_PREPARATION_SPELL_ID.encode('ascii') + b',',
+                 b'ARENA_MATCH_END')
+
+# A Solo Shuffle segment starts within this many seconds of the match start it is looked up by
+SEGMENT_START_TOLERANCE_S = 120
+
+
+class SoloShuffleRoundSegmenter:
+    """
+    Streaming round splitter: feed() the marker lines of one match in log order, then
+    finish() returns its SoloShuffleRound list.
+
+    known_players (GUID -> PlayerInfo, e.g. from video metadata) supply class and spec;
+    other participants get a PlayerInfo with the name seen in the log.
+    """
+
+    def __init__(self, player_name: str, player_guid: Optional[str] = None,
+                 known_players: Optional[Dict[str, PlayerInfo]] = None):
+        self.player_name = player_name
+        self.player_guid = player_guid
+        self.known_players = known_players or {}
+        self.names: Dict[str, str] = {}   # GUID -> full unit name seen in the log
+        self.rounds: List[SoloShuffleRound] = []
+        self._round: Optional[Dict] = None
+        self._last_time: Optional[datetime] = None
+        self._last_offset = 0
+
+    def feed(self, line: str, offset: int, next_offset: int):
+        """Process one marker line (offsets are the line's start and the next line's start)."""
+        event_time = parse_combat_log_timestamp(line)
+        if event_time is None:
+            return
+        self._last_time = event_time
+        self._last_offset = next_offset
+
+        separator = line.find('  ')
+        if separator < 0:
+            return
+        parts = line[separator + 2:].strip().split(',')
+        event_type = parts[0]
+
+        if event_type == 'COMBATANT_INFO':
+            if len(parts) < 3:
+                return
+            if self._round is not None and (self._round['in_combat'] or parts[1] in self._round['teams']):
+                # Next round's combatants (a reset) while the previous round had no deciding death
+                self._close_round(event_time, offset, death_guid=None)
+            if self._round is None:
+                self._open_round(event_time, offset)
+            self._round['teams'][parts[1]] = parts[2]
+
+        elif event_type in ('SPELL_AURA_APPLIED', 'SPELL_AURA_REMOVED'):
+            if len(parts) < 10 or parts[9] != ARENA_PREPARATION_SPELL_ID:
+                return
+            self.names.setdefault(parts[1], parts[2].strip('"'))
+            if event_type == 'SPELL_AURA_APPLIED':
+                if self._round is not None and self._round['in_combat']:
+                    self._close_round(event_time, offset, death_guid=None)
+                if self._round is None:
+                    self._open_round(event_time, offset)
+                self._round['prepared'].add(parts[1])
+            elif self._round is not None and self._round['gates_open'] is None:
+                self._round['gates_open'] = event_time
+                self._round['in_combat'] = True
+
+        elif event_type == 'UNIT_DIED':
+            if len(parts) < 7 or self._round is None:
+                return
+            died_guid = parts[5]
+            self.names.setdefault(died_guid, parts[6].strip('"'))
+            if died_guid in self._round['teams'] or died_guid in self._round['prepared'] or \
+                    (not self._round['teams'] and died_guid.startswith('Player-')):
+                self._close_round(event_time, next_offset, death_guid=died_guid)
+
+        elif event_type == 'ARENA_MATCH_END':
+            if self._round is not None:
+                self._close_round(event_time, offset, death_guid=None)
+
+    def finish(self) -> List[SoloShuffleRound]:
+        """Close a round left open by a truncated log and return every round."""
+        if self._round is not None and self._last_time is not None:
+            self._close_round(self._last_time, self._last_offset, death_guid=None)
+        return self.rounds
+
+    def _open_round(self, event_time: datetime, offset: int):
+        self._round = {'start_time': event_time, 'start_offset': offset, 'teams': {}, 'prepared': set(),
+                       'gates_open': None, 'in_combat': False}
+
+    def _close_round(self, end_time: datetime, end_offset: int, death_guid: Optional[str]):
+        state = self._round
+        self._round = None
+
+        team_ids = dict(state['teams'])
+        for guid in state['prepared']:
+            team_ids.setdefault(guid, None)
+        friendly_team_id = team_ids.get(self._resolve_player_guid(team_ids))
+
+        friendly, enemy = [], []
+        for guid, team_id in team_ids.items():
+            side = TeamSide.FRIENDLY if friendly_team_id is not None and team_id == friendly_team_id \
+                else TeamSide.ENEMY
+            player = self._player_info(guid, side)
+            (friendly if side == TeamSide.FRIENDLY else enemy).append(player)
+
+        outcome = 'Draw'
+        if death_guid is not None and friendly_team_id is not None:
+            outcome = 'Loss' if team_ids.get(death_guid) == friendly_team_id else 'Win'
+        elif death_guid is not None:
+            outcome = None
+
+        combat_start = state['gates_open'] or state['start_time']
+        self.rounds.append(SoloShuffleRound(
+            round_number=len(self.rounds) + 1,
+            friendly_team=TeamComposition(players=friendly),
+            enemy_team=TeamComposition(players=enemy),
+            start_time=state['start_time'],
+            end_time=end_time,
+            outcome=outcome,
+            duration_seconds=int((end_time - combat_start).total_seconds()),
+            gates_open_time=state['gates_open'],
+            start_offset=state['start_offset'],
+            end_offset=end_offset,
+            death_guid=death_guid
+        ))
+
+    def _resolve_player_guid(self, team_ids: Dict[str, Optional[str]]) -> Optional[str]:
+        if self.player_guid is None:
+            for guid in team_ids:
+                known = self.known_players.get(guid)
+                name = known.name if known is not None else unit_base_name(self.names.get(guid, ''))
+                if name and name.lower() == self.player_name.lower():
+                    self.player_guid = guid
+                    break
+        return self.player_guid
+
+    def _player_info(self, guid: str, side: TeamSide) -> PlayerInfo:
+        known = self.known_players.get(guid)
+        if known is not None:
+            return replace(known, team=side)
+        full_name = self.names.get(guid, guid)
+        return PlayerInfo(name=unit_base_name(full_name), full_name=full_name, guid=guid, team=side)
+
+
+def segment_solo_shuffle(log_file: Path, segment: Dict, player_name: str, player_guid: Optional[str] = None,
+                         known_players: Optional[Dict[str, PlayerInfo]] = None) -> List[SoloShuffleRound]:
+    """Rounds of one arena segment (a segment catalog entry), from a single marker scan of its bytes."""
+    segmenter = SoloShuffleRoundSegmenter(player_name, player_guid, known_players)
+    for marker_line in iter_marker_lines(log_file, ROUND_MARKERS, segment['start_offset'], segment['end_offset']):
+        segmenter.feed(marker_line.text, marker_line.offset, marker_line.next_offset)
+    return segmenter.finish()
+
+
+def find_match_segment(log_file: Path, match_start: datetime,
+                       tolerance_s: int = SEGMENT_START_TOLERANCE_S) -> Optional[Dict]:
+    """Complete catalog segment whose ARENA_MATCH_START is closest to match_start (within tolerance)."""
+    tolerance = timedelta(seconds=tolerance_s)
+    candidates = [segment for segment in get_segment_catalog(log_file).segments_starting_between(
+        match_start - tolerance, match_start + tolerance) if segment['end_offset'] is not None]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda segment: abs((segment['start_time'] - match_start).total_seconds()))
+
+
+def populate_solo_shuffle_rounds(match_model: ArenaMatchModel, log_file: Path) -> List[SoloShuffleRound]:
+    """
+    Fill match_model.solo_shuffle_rounds from the combat log (no-op for other brackets).
+
+    The segment is the one starting closest to arena_start_time (or the video start time);
+    the model's players, keyed by GUID, keep their class and spec in every round.
+    """
+    if not match_model.is_solo_shuffle:
+        return []
+
+    segment = find_match_segment(log_file, match_model.arena_start_time or match_model.start_time)
+    if segment is None:
+        return []
+
+    known_players = {guid: player for guid, player in match_model.identity.players.items()
+                     if player.guid == guid}
+    match_model.solo_shuffle_rounds = segment_solo_shuffle(
+        log_file, segment, match_model.primary_player, match_model.identity.player_guid, known_players
+    )
+    match_model.arena_start_time = segment['start_time']
+    match_model.arena_end_time = segment['end_time']
+    match_model.combat_log_file = Path(log_file).name
+    return match_model.solo_shuffle_rounds
+
+
+def iter_round_lines(log_file: Path, solo_round: SoloShuffleRound) -> Iterator[str]:
+    """Yield the decoded lines of one round (its [start_offset, end_offset) byte range)."""
+    if solo_round.start_offset is None or solo_round.end_offset is None:
+        return
+
+    with open_combat_log(log_file, 'rb') as f:
+        f.seek(solo_round.start_offset)
+        position = solo_round.start_offset
+        for raw_line in f:
+            if position >= solo_round.end_offset:
+                break
+            position += len(raw_line)
+            yield raw_line.decode('utf-8', errors='ignore')
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Synthetic Combat Log Generator
+
+Writes a reproducible benchmark dataset laid out like a Warcraft Recorder folder:
+
+  <output>/Logs/WoWCombatLog-MMDDYY_HHMMSS.txt   session logs with arena matches
+  <output>/<YYYY-MM>/<video>.json                 video metadata per match
+  <output>/master_index_enhanced.csv              enhanced index of the videos
+  <output>/synthetic_dataset.json                 what was generated (lines, bytes, matches)
+
+Logs have advanced logging enabled and use the field layouts the parser validates
+(COORDINATE_EVENTS), with 2v2, 3v3, Skirmish and six-round Solo Shuffle matches, player
+pets (summons, pet interrupts and Devour Magic dispels), COMBATANT_INFO per round and
+quoted spell and pet names containing commas. Arena matches have a realistic line rate;
+the rest of the requested size is non-arena filler between matches, so a 10 GB dataset
+is mostly lines the parser has to skip, as a real multi-hour session log is.
+
+The same seed always writes the same dataset.
+
+Usage:
+  python synthetic_combat_log.py --output-dir bench_data --size-mb 100 --arenas 20
+  python synthetic_combat_log.py --output-dir bench_10g --size-mb 10240 --arenas 400 --logs 8
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from development_standards import SafeLogger
+
+
+DATASET_MANIFEST = 'synthetic_dataset.json'
+
+DEFAULT_START = datetime(2025, 5, 6, 18, 0, 0)
+
+# Arena lines per second of match time (all units, advanced logging on)
+ARENA_LINES_PER_SECOND = 40
+
+# (zone_id, map name) - names round-trip through video filenames
+ARENA_MAPS = [
+    ('1505', 'Nagrand'), ('572', 'Ruins of Lordaeron'), ('980', "Tol'viron"), ('1825', 'Hook Point'),
+    ('1911', 'Mugambala'), ('2373', 'Empyrean Domain'), ('2563', 'Nokhudon'), ('617', 'Dalaran Sewers'),
+    ('2759', 'Cage of Carnage'), ('2547', 'Enigma Crucible'), ('2167', 'Robodrome')
+]
+
+# (bracket, weight)
+BRACKETS = [('3v3', 0.5), ('2v2', 0.2), ('Solo Shuffle', 0.2), ('Skirmish', 0.1)]
+
+SOLO_SHUFFLE_ROUNDS = 6
+
+# Recorded characters: (name, realm, spec id, pet name or None)
+OUR_CHARACTERS = [
+    ('Phlargus', 'Eredar', 266, 'Felhunter'),
+    ('Melonha', 'Tichondrius', 253, 'Fluffy, the Destroyer'),
+    ('Zlrmage', 'BleedingHollow', 63, None)
+]
+
+OPPONENT_SPECS = [250, 251, 577, 102, 105, 1467, 1468, 253, 254, 62, 63, 64, 268, 269, 270, 65, 66, 70,
+                  256, 257, 258, 259, 260, 261, 262, 263, 264, 265, 266, 267, 71, 72]
+OPPONENT_NAMES = ['Zlr', 'Morvx', 'Kaelthas', 'Ashwing', 'Brightmane', 'Coldsnap', 'Duskfall', 'Emberly',
+                  'Frostbyte', 'Grimtusk', 'Hollowpeak', 'Ironvale', 'Jadewind', 'Kestrel', 'Lunaria']
+REALMS = [('Tichondrius', 11), ('BleedingHollow', 73), ('Eredar', 53), ('Stormrage', 60), ('Area52', 3676)]
+
+# (spell id, name, school) - some names contain commas, as real spell and aura names can
+CAST_SPELLS = [(686, 'Shadow Bolt', 0x20), (116858, 'Chaos Bolt', 0x24), (5782, 'Fear', 0x20),
+               (6789, 'Mortal Coil', 0x20), (2061, 'Flash Heal', 0x2), (133, 'Fireball', 0x4),
+               (19434, 'Aimed Shot', 0x1), (385952, 'Shield Charge, Empowered', 0x1)]
+DAMAGE_SPELLS = [(686, 'Shadow Bolt', 0x20), (133, 'Fireball', 0x4), (19434, 'Aimed Shot', 0x1),
+                 (589, 'Shadow Word: Pain', 0x20)]
+HEAL_SPELLS = [(2061, 'Flash Heal', 0x2), (8936, 'Regrowth', 0x8), (774, 'Rejuvenation', 0x8)]
+PURGEABLE_AURAS = [(17, 'Power Word: Shield'), (1022, 'Blessing of Protection'), (774, 'Rejuvenation'),
+                   (388007, 'Blessing of Summer, Empowered')]
+INTERRUPTED_SPELLS = [(2061, 'Flash Heal'), (8936, 'Regrowth'), (116858, 'Chaos Bolt')]
+
+PRECOGNITION = (377362, 'Precognition')
+ARENA_PREPARATION = (32727, 'Arena Preparation')
+SPELL_LOCK = (19647, 'Spell Lock')
+DEVOUR_MAGIC = (19505, 'Devour Magic')
+
+# Unit flags
+FLAGS_ME = '0x511'
+FLAGS_PARTY = '0x512'
+FLAGS_ENEMY = '0x548'
+FLAGS_MY_PET = '0x1111'
+FLAGS_CREATURE = '0xa48'
+NO_UNIT = '0000000000000000,nil,0x80000000,0x80000000'
+
+
+class Unit:
+    """A combat log unit with a position for advanced-logging fields."""
+
+    def __init__(self, guid: str, name: str, flags: str, spec_id: int = 0, team: int = 0,
+                 center: Tuple[float, float] = (0.0, 0.0), rng: random.Random = None):
+        self.guid = guid
+        self.name = name
+        self.flags = flags
+        self.spec_id = spec_id
+        self.team = team
+        self.rng = rng or random
+        self.x = center[0] + self.rng.uniform(-30, 30)
+        self.y = center[1] + self.rng.uniform(-30, 30)
+        self.facing = self.rng.uniform(0, 6.2832)
+        self.deaths = 0
+
+    @property
+    def short_name(self) -> str:
+        return self.name.split('-', 1)[0]
+
+    @property
+    def realm(self) -> str:
+        parts = self.name.split('-')
+        return parts[1] if len(parts) > 2 else ''
+
+    def ref(self) -> str:
+        """GUID, quoted name, flags and raid flags."""
+        return f'{self.guid},"{self.name}",{self.flags},0x0'
+
+    def advanced(self) -> str:
+        """Advanced-logging block: info GUID, owner, stats, power, then x, y, map, facing, level."""
+        self.x += self.rng.uniform(-1.5, 1.5)
+        self.y += self.rng.uniform(-1.5, 1.5)
+        self.facing = (self.facing + self.rng.uniform(-0.3, 0.3)) % 6.2832
+        return (f'{self.guid},0000000000000000,10282260,10282260,98686,13440,33841,2396,0,0,3,300,300,0,'
+                f'{self.x:.2f},{self.y:.2f},0,{self.facing:.4f},673')
+
+
+class LogWriter:
+    """Buffered line writer that formats combat log timestamps (5/6/2025 18:26:32.082-4)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.file = open(path, 'w', encoding='utf-8', newline='\n')
+        self.lines = 0
+        self.bytes = 0
+        self._buffer: List[str] = []
+        self._date_key = None
+        self._date_text = ''
+
+    def stamp(self, when: datetime) -> str:
+        date_key = when.date()
+        if date_key != self._date_key:
+            self._date_key = date_key
+            self._date_text = f"{when.month}/{when.day}/{when.year}"
+        return (f"{self._date_text} {when.hour:02d}:{when.minute:02d}:{when.second:02d}."
+                f"{when.microsecond // 1000:03d}-4")
+
+    def write(self, when: datetime, event: str):
+        line = f"{self.stamp(when)}  {event}\n"
+        self._buffer.append(line)
+        self.lines += 1
+        self.bytes += len(line.encode('utf-8')) if not line.isascii() else len(line)
+        if len(self._buffer) >= 4096:
+            self.flush()
+
+    def flush(self):
+        self.file.write(''.join(self._buffer))
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def _map_center(zone_id: str) -> Tuple[float, float]:
+    """Stable world position of an arena (the known boxes for Nagrand, Lordaeron, Tiger's Peak)."""
+    known = {'1505': (-2000.0, 6600.0), '572': (1300.0, 1300.0), '1134': (-1700.0, -4300.0)}
+    if zone_id in known:
+        return known[zone_id]
+    rng = random.Random(int(zone_id))
+    return rng.uniform(-4000, 4000), rng.uniform(-4000, 4000)
+
+
+def _player_guid(rng: random.Random, server_id: int) -> str:
+    return f"Player-{server_id}-{rng.getrandbits(32):08X}"
+
+
+def _combatant_info(unit: Unit, faction: int) -> str:
+    """COMBATANT_INFO with stats, spec, talents, PvP talents, items and auras (bracketed lists)."""
+    stats = ','.join(['1200'] * 21)
+    return (f"COMBATANT_INFO,{unit.guid},{faction},{stats},{unit.spec_id},"
+            f"[(80000,100000,1),(80001,100001,2)],(0,356962,357888,0),"
+            f"[(212395,639,(),(7981,1524),()),(221140,636,(),(),())],[Player-0-0,1459,1],1,0,0,0")
+
+
+class SyntheticArenaGenerator:
+    """Writes arena matches and filler into session logs, tracking the video rows to index."""
+
+    def __init__(self, output_dir: Path, seed: int = 0, start: datetime = DEFAULT_START):
+        self.output_dir = Path(output_dir)
+        self.rng = random.Random(seed)
+        self.now = start
+        self.rows: List[Dict] = []
+        self.summary = {'seed': seed, 'logs': [], 'lines': 0, 'bytes': 0, 'arena_lines': 0,
+                        'matches': 0, 'solo_shuffle_rounds': 0}
+        self._filler_templates: List[str] = []
+        self._creature_seq = 0
+
+    # --- units -------------------------------------------------------------------------
+
+    def _character(self) -> Tuple[Unit, Optional[Unit]]:
+        name, realm, spec_id, pet_name = self.rng.choice(OUR_CHARACTERS)
+        server_id = dict(REALMS).get(realm, 1)
+        rng = random.Random(name)   # our characters keep their GUIDs across matches
+        player = Unit(_player_guid(rng, server_id), f"{name}-{realm}-US", FLAGS_ME, spec_id, 0, rng=self.rng)
+        pet = None
+        if pet_name:
+            pet = Unit(self._creature_guid(417), pet_name, FLAGS_MY_PET, 0, 0, rng=self.rng)
+        return player, pet
+
+    def _opponent(self, flags: str, team: int, taken: set) -> Unit:
+        while True:
+            name = self.rng.choice(OPPONENT_NAMES)
+            realm, server_id = self.rng.choice(REALMS)
+            if name not in taken:
+                taken.add(name)
+                return Unit(_player_guid(self.rng, server_id), f"{name}-{realm}-US", flags,
+                            self.rng.choice(OPPONENT_SPECS), team, rng=self.rng)
+
+    def _creature_guid(self, npc_id: int) -> str:
+        self._creature_seq += 1
+        return f"Creature-0-3021-1911-5918-{npc_id}-{self._creature_seq:010X}"
+
+    # --- event lines -------------------------------------------------------------------
+
+    def _spell(self, source: Unit, dest: Optional[Unit], spell: Tuple) -> str:
+        spell_id, name, school = spell if len(spell) == 3 else (*spell, 0x1)
+        dest_ref = dest.ref() if dest else NO_UNIT
+        return f'{source.ref()},{dest_ref},{spell_id},"{name}",0x{school:x}'
+
+    def _combat_event(self, units: List[Unit], pets: Dict[int, Unit]) -> str:
+        rng = self.rng
+        source = rng.choice(units)
+        enemies = [unit for unit in units if unit.team != source.team]
+        allies = [unit for unit in units if unit.team == source.team]
+        target = rng.choice(enemies) if enemies else source
+        roll = rng.random()
+
+        if roll < 0.28:
+            return f"SPELL_CAST_SUCCESS,{self._spell(source, target, rng.choice(CAST_SPELLS))},{source.advanced()}"
+        if roll < 0.62:
+            amount = rng.randint(20000, 400000)
+            return (f"SPELL_DAMAGE,{self._spell(source, target, rng.choice(DAMAGE_SPELLS))},{target.advanced()},"
+                    f"{amount},{amount},-1,32,0,0,0,{'1' if roll < 0.35 else 'nil'},nil,nil,nil")
+        if roll < 0.76:
+            ally = rng.choice(allies)
+            amount = rng.randint(20000, 300000)
+            return (f"SPELL_HEAL,{self._spell(source, ally, rng.choice(HEAL_SPELLS))},{ally.advanced()},"
+                    f"{amount},{amount},{rng.randint(0, amount // 2)},0,nil")
+        if roll < 0.86:
+            amount = rng.randint(10000, 120000)
+            return (f"SWING_DAMAGE,{source.ref()},{target.ref()},{source.advanced()},"
+                    f"{amount},{amount},-1,1,0,0,0,nil,nil,nil")
+        if roll < 0.91:
+            aura = rng.choice(PURGEABLE_AURAS)
+            return f"SPELL_AURA_APPLIED,{self._spell(source, rng.choice(allies), aura)},BUFF"
+        if roll < 0.93:
+            return f"SPELL_AURA_APPLIED,{self._spell(target, source, PRECOGNITION)},BUFF"
+        if roll < 0.96:
+            pet = pets.get(source.team)
+            caster = pet if pet is not None and rng.random() < 0.6 else source
+            spell = SPELL_LOCK if caster is pet else (2139, 'Counterspell', 0x40)
+            interrupted = rng.choice(INTERRUPTED_SPELLS)
+            return (f"SPELL_INTERRUPT,{self._spell(caster, target, spell)},"
+                    f'{interrupted[0]},"{interrupted[1]}",2')
+        pet = pets.get(source.team)
+        if pet is not None:
+            aura = rng.choice(PURGEABLE_AURAS)
+            return f'SPELL_DISPEL,{self._spell(pet, target, DEVOUR_MAGIC)},{aura[0]},"{aura[1]}",2,BUFF'
+        return f"SPELL_CAST_SUCCESS,{self._spell(source, target, rng.choice(CAST_SPELLS))},{source.advanced()}"
+
+    def _fight(self, log: LogWriter, units: List[Unit], pets: Dict[int, Unit], seconds: float):
+        """Combat lines at the arena line rate for a number of seconds."""
+        lines = max(1, int(seconds * ARENA_LINES_PER_SECOND))
+        step = timedelta(seconds=seconds / lines)
+        for _ in range(lines):
+            self.now += step
+            log.write(self.now, self._combat_event(units, pets))
+        self.summary['arena_lines'] += lines
+
+    def _die(self, log: LogWriter, unit: Unit):
+        self.now += timedelta(milliseconds=self.rng.randint(50, 400))
+        log.write(self.now, f'UNIT_DIED,{NO_UNIT},{unit.ref()},0')
+        unit.deaths += 1
+
+    # --- matches -----------------------------------------------------------------------
+
+    def write_match(self, log: LogWriter):
+        """One arena match (Solo Shuffle: six rounds) plus its video JSON and index row."""
+        rng = self.rng
+        bracket = rng.choices([b for b, _ in BRACKETS], [w for _, w in BRACKETS])[0]
+        zone_id, map_name = rng.choice(ARENA_MAPS)
+        center = _map_center(zone_id)
+        player, pet = self._character()
+        lines_before = log.lines
+
+        team_size = 2 if bracket == '2v2' or (bracket == 'Skirmish' and rng.random() < 0.5) else 3
+        taken = {player.short_name}
+        if bracket == 'Solo Shuffle':
+            others = [self._opponent(FLAGS_ENEMY, 1, taken) for _ in range(5)]
+        else:
+            others = ([self._opponent(FLAGS_PARTY, 0, taken) for _ in range(team_size - 1)] +
+                      [self._opponent(FLAGS_ENEMY, 1, taken) for _ in range(team_size)])
+        units = [player] + others
+        for unit in units:
+            unit.x, unit.y = center[0] + rng.uniform(-30, 30), center[1] + rng.uniform(-30, 30)
+
+        log.write(self.now, f'ZONE_CHANGE,{zone_id},"{map_name}",0')
+        self.now += timedelta(seconds=rng.uniform(1, 3))
+        start_bracket = {'Solo Shuffle': 'Rated Solo Shuffle', 'Skirmish': f'{team_size}v{team_size}'}.get(
+            bracket, bracket)
+        log.write(self.now, f"ARENA_MATCH_START,{zone_id},33,{start_bracket},{0 if bracket == 'Skirmish' else 1}")
+        match_start = self.now
+
+        if bracket == 'Solo Shuffle':
+            won_rounds = self._write_shuffle_rounds(log, units, pet)
+            won = won_rounds >= SOLO_SHUFFLE_ROUNDS // 2 + 1
+        else:
+            won = self._write_team_match(log, units, pet)
+
+        self.now += timedelta(seconds=rng.uniform(1, 2))
+        duration = int((self.now - match_start).total_seconds())
+        log.write(self.now, f"ARENA_MATCH_END,{0 if won else 1},{duration},2011,1987")
+
+        self._record_video(player, units, bracket, zone_id, map_name, match_start, duration, won)
+        self.summary['matches'] += 1
+        return log.lines - lines_before
+
+    def _prepare(self, log: LogWriter, units: List[Unit], pet: Optional[Unit], player: Unit, seconds: float):
+        """Preparation phase: COMBATANT_INFO, Arena Preparation auras, pet summon, gates open."""
+        for unit in units:
+            log.write(self.now, _combatant_info(unit, unit.team))
+        for unit in units:
+            log.write(self.now, f"SPELL_AURA_APPLIED,{self._spell(unit, unit, ARENA_PREPARATION)},BUFF")
+        if pet is not None:
+            self.now += timedelta(seconds=self.rng.uniform(0.5, 2))
+            summon = (691, 'Summon Felhunter', 0x20) if pet.name == 'Felhunter' else (883, 'Call Pet 1', 0x1)
+            log.write(self.now, f"SPELL_SUMMON,{self._spell(player, pet, summon)}")
+        self.now += timedelta(seconds=seconds)
+        for unit in units:
+            log.write(self.now, f"SPELL_AURA_REMOVED,{self._spell(unit, unit, ARENA_PREPARATION)},BUFF")
+
+    def _write_team_match(self, log: LogWriter, units: List[Unit], pet: Optional[Unit]) -> bool:
+        player = units[0]
+        if pet is not None:
+            pet.team = 0
+        self._prepare(log, units, pet, player, self.rng.uniform(20, 60))
+        self._fight(log, units, {0: pet} if pet else {}, self.rng.uniform(90, 360))
+        won = self.rng.random() < 0.5
+        losers = [unit for unit in units if unit.team == (1 if won else 0)]
+        self._die(log, self.rng.choice(losers))
+        return won
+
+    def _write_shuffle_rounds(self, log: LogWriter, units: List[Unit], pet: Optional[Unit]) -> int:
+        """Six rounds with new teams each round: the player plus two of the five others."""
+        player, others = units[0], units[1:]
+        won_rounds = 0
+        for round_num in range(SOLO_SHUFFLE_ROUNDS):
+            partners = set(self.rng.sample(range(5), 2))
+            for position, unit in enumerate(others):
+                unit.team = 0 if position in partners else 1
+                unit.flags = FLAGS_PARTY if unit.team == 0 else FLAGS_ENEMY
+            if pet is not None:
+                pet.team = 0
+
+            self._prepare(log, units, pet if round_num == 0 else None, player,
+                          self.rng.uniform(20, 30) if round_num == 0 else self.rng.uniform(8, 15))
+            self._fight(log, units, {0: pet} if pet else {}, self.rng.uniform(45, 150))
+            won = self.rng.random() < 0.5
+            losers = [unit for unit in units if unit.team == (1 if won else 0)]
+            self._die(log, self.rng.choice(losers))
+            won_rounds += won
+            self.summary['solo_shuffle_rounds'] += 1
+            self.now += timedelta(seconds=self.rng.uniform(3, 6))
+        return won_rounds
+
+    def _record_video(self, player: Unit, units: List[Unit], bracket: str, zone_id: str, map_name: str,
+                      match_start: datetime, duration: int, won: bool):
+        """Video JSON (Warcraft Recorder layout) and enhanced index row for a match."""
+        rng = self.rng
+        video_start = match_start - timedelta(seconds=rng.uniform(-3, 8))
+        filename_map = map_name.replace("'", ' ').replace(' ', '_')
+        filename_bracket = bracket.replace(' ', '_')
+        filename = (f"{video_start.strftime('%Y-%m-%d_%H-%M-%S')}_-_{player.short_name}_-_"
+                    f"{filename_bracket}_{filename_map}_({'Win' if won else 'Loss'}).mp4")
+
+        combatants = [{'_name': unit.short_name, '_realm': unit.realm, '_GUID': unit.guid,
+                       '_specID': unit.spec_id, '_teamID': unit.team, 'deathCount': unit.deaths}
+                      for unit in units]
+        metadata = {
+            'category': bracket,
+            'zoneID': int(zone_id),
+            'zoneName': map_name,
+            'result': won,
+            'duration': duration,
+            'deaths': [{'name': unit.short_name, 'friendly': unit.team == 0}
+                       for unit in units for _ in range(unit.deaths)],
+            'overrun': 0,
+            'uniqueHash': f"{rng.getrandbits(64):016x}",
+            'player': {'_name': player.short_name, '_realm': player.realm, '_GUID': player.guid,
+                       '_specID': player.spec_id, '_teamID': 0},
+            'combatants': combatants
+        }
+        json_dir = self.output_dir / video_start.strftime('%Y-%m')
+        json_dir.mkdir(parents=True, exist_ok=True)
+        with open(json_dir / (filename[:-4] + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+
+        self.rows.append({
+            'filename': filename,
+            'precise_start_time': video_start.isoformat(),
+            'duration_s': duration + rng.randint(-5, 5),
+            'matching_reliability': rng.choice(['high', 'medium', 'low']),
+            'player_name': player.short_name,
+            'bracket': bracket,
+            'map': map_name,
+            'outcome': 'Win' if won else 'Loss'
+        })
+
+    # --- filler ------------------------------------------------------------------------
+
+    def _filler_events(self) -> List[str]:
+        """Pre-rendered non-arena events (world combat between creatures and other players)."""
+        if not self._filler_templates:
+            saved_rng, self.rng = self.rng, random.Random(self.summary['seed'] + 1)
+            units = [Unit(self._creature_guid(self.rng.randint(1000, 200000)), name, FLAGS_CREATURE, rng=self.rng)
+                     for name in ('Training Dummy', 'Ravenous Gorger', 'Deepwood Stalker, Elite')]
+            taken = set()
+            units += [self._opponent(FLAGS_PARTY, 1, taken) for _ in range(4)]
+            self._filler_templates = [self._combat_event(units, {}) for _ in range(2000)]
+            self.rng = saved_rng
+        return self._filler_templates
+
+    def write_filler(self, log: LogWriter, target_bytes: int, seconds: float):
+        """Non-arena lines until the log reaches target_bytes, spread over the given seconds."""
+        templates = self._filler_events()
+        missing = target_bytes - log.bytes
+        if missing <= 0:
+            self.now += timedelta(seconds=seconds)
+            return
+        lines = max(1, missing // 330)
+        step = timedelta(seconds=seconds / lines)
+        choice = self.rng.choice
+        for _ in range(lines):
+            self.now += step
+            log.write(self.now, choice(templates))
+
+    # --- dataset -----------------------------------------------------------------------
+
+    def generate(self, size_mb: float, arenas: int, logs: int = 1) -> Dict:
+        """Write the whole dataset; returns the summary also saved as synthetic_dataset.json."""
+        logs = max(1, min(logs, arenas))
+        logs_dir = self.output_dir / 'Logs'
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        target_bytes = int(size_mb * 1024 * 1024)
+
+        arena_num = 0
+        for log_num in range(logs):
+            log_arenas = arenas * (log_num + 1) // logs - arenas * log_num // logs
+            log_target = target_bytes * (log_num + 1) // logs - target_bytes * log_num // logs
+            log = LogWriter(logs_dir / self.now.strftime('WoWCombatLog-%m%d%y_%H%M%S.txt'))
+            log.write(self.now, 'COMBAT_LOG_VERSION,21,ADVANCED_LOG_ENABLED,1,BUILD_VERSION,11.1.5,PROJECT_ID,1')
+
+            for match_num in range(log_arenas):
+                # Filler before each match brings the log up to its share of the target size
+                self.write_filler(log, log_target * match_num // max(1, log_arenas),
+                                  self.rng.uniform(60, 240))
+                self.write_match(log)
+                arena_num += 1
+            self.write_filler(log, log_target, self.rng.uniform(60, 240))
+            log.close()
+
+            self.summary['logs'].append({'log_file': log.path.name, 'lines': log.lines, 'bytes': log.bytes})
+            self.summary['lines'] += log.lines
+            self.summary['bytes'] += log.bytes
+            SafeLogger.info(f"{log.path.name}: {log.lines} lines, {log.bytes / 1024 / 1024:.1f} MB")
+            self.now += timedelta(minutes=self.rng.uniform(5, 30))
+
+        with open(self.output_dir / 'master_index_enhanced.csv', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.rows[0]))
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+        with open(self.output_dir / DATASET_MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump(self.summary, f, indent=1)
+        return self.summary
+
+
+def generate_dataset(output_dir: Path, size_mb: float = 100, arenas: int = 20, logs: int = 1,
+                     seed: int = 0, start: datetime = DEFAULT_START) -> Dict:
+    """Write a synthetic dataset (logs, video JSON, enhanced index) and return its summary."""
+    return SyntheticArenaGenerator(Path(output_dir), seed, start).generate(size_mb, arenas, logs)
+
+
+def load_dataset_summary(data_dir: Path) -> Optional[Dict]:
+    """Summary written by generate_dataset, or None for a dataset that was not generated."""
+    manifest = Path(data_dir) / DATASET_MANIFEST
+    if not manifest.exists():
+        return None
+    with open(manifest, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    """Generate a synthetic benchmark dataset"""
+    arg_parser = argparse.ArgumentParser(description="Write synthetic WoW combat logs for benchmarking")
+    arg_parser.add_argument('--output-dir', type=Path, required=True, help='Dataset directory to create')
+    arg_parser.add_argument('--size-mb', type=float, default=100, help='Total log size in MB - arena matches alone may exceed it (default: 100)')
+    arg_parser.add_argument('--arenas', type=int, default=20, help='Arena matches to write (default: 20)')
+    arg_parser.add_argument('--logs', type=int, default=1, help='Session logs to spread them over (default: 1)')
+    arg_parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = arg_parser.parse_args()
+
+    if args.arenas < 1:
+        SafeLogger.error("--arenas must be at least 1")
+        return 1
+
+    summary = generate_dataset(args.output_dir, args.size_mb, args.arenas, args.logs, args.seed)
+    SafeLogger.success(f"Wrote {summary['matches']} matches, {summary['lines']} lines, "
+                       f"{summary['bytes'] / 1024 / 1024:.1f} MB to {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Test Arena Log Splitter
+
+A pet summoned during one match is still out in the next, so the SPELL_SUMMON line
+written inside an earlier segment must be replayed at the top of every later segment.
+"""
+
+from arena_log_splitter import split_log_segments
+
+
+PLAYER = 'Player-1-0000AAAA'
+PET = 'Creature-0-1-2-3-417-0000BBBB'
+
+SUMMON = (f'5/6/2025 19:01:00.000  SPELL_SUMMON,{PLAYER},"Melonha-Realm",0x511,0x0,'
+          f'{PET},"Felhunter",0x1111,0x0,691,"Summon Felhunter",0x20')
+
+
+def _line(stamp: str, event: str) -> str:
+    return f'5/6/2025 {stamp}  {event}'
+
+
+def test_summon_inside_a_match_reaches_later_segments(tmp_path):
+    lines = [
+        _line('19:00:00.000', 'COMBAT_LOG_VERSION,21,ADVANCED_LOG_ENABLED,1,BUILD_VERSION,11.1.5,PROJECT_ID,1'),
+        _line('19:00:30.000', 'ARENA_MATCH_START,1672,33,2v2,1'),
+        SUMMON,
+        _line('19:03:00.000', 'ARENA_MATCH_END,0,150,2011,1987'),
+        _line('19:05:00.000', 'ARENA_MATCH_START,1505,33,2v2,1'),
+        _line('19:07:00.000', 'ARENA_MATCH_END,1,120,2011,1987'),
+    ]
+    log_file = tmp_path / 'WoWCombatLog-050625_190000.txt'
+    log_file.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    output_dir = tmp_path / 'Segments'
+    output_dir.mkdir()
+
+    rows = split_log_segments(log_file, output_dir, set())
+
+    assert len(rows) == 2
+    second = (output_dir / rows[1]['segment_file']).read_text(encoding='utf-8').splitlines()
+    assert second[0] == lines[0]
+    assert second[1] == SUMMON
+    assert second[2] == lines[4]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_summon_inside_a_match_reaches_later_segments(Path(tmp_dir))
+    print("Arena log splitter tests passed")
@@ -0,0 +1,64 @@
+"""
+Test Arena Segment Catalog
+
+The per-segment UNIT_DIED summaries of the catalog replace re-reading the log during
+death correlation, so they must agree with count_deaths_in_arena_window over the same
+segment for every unit. Candidates without a segment are counted in one shared pass
+and must agree the same way.
+"""
+
+from arena_segment_catalog import ArenaSegmentCatalog, death_counts_from_segment, get_segment_catalog
+from combat_log_io import find_combat_logs
+from development_standards import (candidate_death_counts, count_deaths_in_arena_window,
+                                   extract_player_name_from_combat_log)
+from synthetic_combat_log import generate_dataset
+
+
+def _segments_and_names(data_dir):
+    log_file = find_combat_logs(data_dir / 'Logs')[0]
+    segments = [segment for segment in get_segment_catalog(log_file).segments if segment['end_time']]
+    owner = extract_player_name_from_combat_log(log_file)
+    return log_file, segments, owner
+
+
+def test_segment_deaths_match_window_counts(tmp_path):
+    generate_dataset(tmp_path, size_mb=1, arenas=4)
+    log_file, segments, owner = _segments_and_names(tmp_path)
+
+    assert len(segments) == 4
+    assert sum(sum(segment['deaths'].values()) for segment in segments) > 0
+    for segment in segments:
+        # Every unit that died in the segment as the player, so player and enemy deaths both split
+        for player_name in [owner, *segment['deaths']]:
+            assert death_counts_from_segment(segment, player_name) == count_deaths_in_arena_window(
+                log_file, segment['start_time'], segment['end_time'], player_name)
+
+    # The persisted sidecar reloads to the same segments
+    assert ArenaSegmentCatalog.load(log_file).segments == segments
+
+
+def test_candidate_death_counts_match_window_counts(tmp_path):
+    generate_dataset(tmp_path, size_mb=1, arenas=4)
+    log_file, segments, _ = _segments_and_names(tmp_path)
+    player_name = max(segments[0]['deaths'], key=segments[0]['deaths'].get)
+
+    # Alternate cataloged candidates and bare windows (counted together in one pass)
+    candidates = [{'start': segment['start_time'], 'end': segment['end_time']} for segment in segments]
+    for candidate, segment in zip(candidates[::2], segments[::2]):
+        candidate['segment'] = segment
+
+    expected = [count_deaths_in_arena_window(log_file, candidate['start'], candidate['end'], player_name)
+                for candidate in candidates]
+    assert candidate_death_counts(candidates, log_file, player_name) == expected
+    assert expected[0]['player_deaths'] > 0
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_segment_deaths_match_window_counts(Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_candidate_death_counts_match_window_counts(Path(tmp_dir))
+    print("Arena segment catalog tests passed")
@@ -0,0 +1,60 @@
+"""
+Test Combat Log Capabilities
+
+Advanced logging switched on mid-session writes a second COMBAT_LOG_VERSION header far
+into the log. The section it starts must still be sampled from its own first lines, so
+matches played after the toggle are reported as movement capable.
+"""
+
+from datetime import datetime
+
+from combat_log_capabilities import SAMPLE_LINES, LogCapabilities
+
+
+PLAYER = 'Player-1-0000AAAA'
+
+HEADER = '5/6/2025 {}  COMBAT_LOG_VERSION,21,ADVANCED_LOG_ENABLED,{},BUILD_VERSION,11.1.5,PROJECT_ID,1'
+
+
+def _aura(stamp: str) -> str:
+    return (f'5/6/2025 {stamp}  SPELL_AURA_APPLIED,{PLAYER},"Melonha-Realm",0x511,0x0,'
+            f'{PLAYER},"Melonha-Realm",0x511,0x0,32727,"Arena Preparation",0x1,BUFF')
+
+
+def _cast(stamp: str) -> str:
+    # 31 fields: x/y at 26/27 and facing at 29 of the advanced-info block
+    return (f'5/6/2025 {stamp}  SPELL_CAST_SUCCESS,{PLAYER},"Melonha-Realm",0x511,0x0,'
+            f'0000000000000000,nil,0x80000000,0x80000000,686,"Shadow Bolt",0x20,'
+            f'{PLAYER},0000000000000000,100,100,0,0,0,0,0,0,0,0,0,0,1234.56,-2345.67,1672,1.5708,80')
+
+
+def test_mid_file_header_is_sampled(tmp_path):
+    filler = 4 * SAMPLE_LINES
+    lines = [HEADER.format('19:00:00.000', 0)]
+    lines += [_aura(f'19:{1 + i // 60000:02d}:{i // 1000 % 60:02d}.{i % 1000:03d}') for i in range(filler)]
+    lines.append(HEADER.format('19:30:00.000', 1))
+    lines += [_cast(f'19:30:{1 + i:02d}.000') for i in range(20)]
+
+    log_file = tmp_path / 'WoWCombatLog-050625_190000.txt'
+    log_file.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    capabilities = LogCapabilities.build(log_file)
+    before, after = capabilities.sections
+
+    assert not before['advanced'] and before['position_samples'] == 0
+    assert after['advanced'] and after['position_samples'] == 20
+    assert after['sample_coordinates'][0] == \
+        {'x': 1234.56, 'y': -2345.67, 'facing': 1.5708, 'event': 'SPELL_CAST_SUCCESS'}
+
+    assert capabilities.movement_capable_between(datetime(2025, 5, 6, 19, 30, 5), datetime(2025, 5, 6, 19, 30, 15))
+    assert not capabilities.movement_capable_between(datetime(2025, 5, 6, 19, 1), datetime(2025, 5, 6, 19, 2))
+    assert capabilities.detection_result()['sample_coordinates'][0]['event'] == 'SPELL_CAST_SUCCESS'
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_mid_file_header_is_sampled(Path(tmp_dir))
+    print("Combat log capabilities tests passed")
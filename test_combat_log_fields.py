@@ -0,0 +1,62 @@
+"""
+Test Combat Log Field Tokenizer
+
+A unit name with a comma in it ("Fluffy, the Destroyer") must stay one field: a plain
+str.split shifts every later field of the line by one, so the spell name and dispelled
+aura are read from the wrong positions.
+"""
+
+from development_standards import get_combat_log_fields, split_combat_log_fields
+
+
+DISPEL_LINE = ('5/6/2025 22:01:02.123  SPELL_DISPEL,Creature-0-1-2-3-417-0000AAAA,"Fluffy, the Destroyer",'
+               '0x1111,0x0,Player-1-0000BBBB,"Enemy-Realm",0x548,0x0,19505,"Devour Magic",0x20,'
+               '1022,"Blessing of Protection",1,BUFF')
+
+
+def test_quoted_comma_keeps_field_positions():
+    parts = split_combat_log_fields(DISPEL_LINE)
+
+    assert len(parts) == len(DISPEL_LINE.split(',')) - 1
+    assert parts[1] == 'Creature-0-1-2-3-417-0000AAAA'
+    assert parts[2].strip('"') == 'Fluffy, the Destroyer'
+    assert parts[5] == 'Player-1-0000BBBB'
+    assert parts[10].strip('"') == 'Devour Magic'
+    assert parts[12] == '1022'
+    assert parts[13].strip('"') == 'Blessing of Protection'
+
+    # The plain split the tokenizer replaced reads one field too early
+    assert DISPEL_LINE.split(',')[10].strip('"') != 'Devour Magic'
+
+
+def test_first_fields_only():
+    parts = split_combat_log_fields(DISPEL_LINE, 13)
+
+    assert parts == split_combat_log_fields(DISPEL_LINE)[:13]
+    assert get_combat_log_fields(DISPEL_LINE, (2, 10, 13)) == \
+        ('"Fluffy, the Destroyer"', '"Devour Magic"', '"Blessing of Protection"')
+    assert get_combat_log_fields(DISPEL_LINE, (40,)) == (None,)
+
+
+def test_quoted_comma_after_requested_fields():
+    # The comma sits in the dispelled aura name, past the fields asked for
+    line = DISPEL_LINE.replace('"Fluffy, the Destroyer"', '"Fluffy"').replace(
+        '"Blessing of Protection"', '"Blessing, of Protection"')
+
+    assert split_combat_log_fields(line, 12) == line.split(',')[:12]
+    assert split_combat_log_fields(line)[13] == '"Blessing, of Protection"'
+
+
+def test_unquoted_line_matches_plain_split():
+    line = '5/6/2025 22:01:02.123  SPELL_CAST_SUCCESS,Player-1-0000BBBB,"Enemy-Realm",0x548,0x0,0000000000000000,nil'
+
+    assert split_combat_log_fields(line) == line.split(',')
+    assert split_combat_log_fields(line, 3) == line.split(',')[:3]
+
+
+if __name__ == "__main__":
+    test_quoted_comma_keeps_field_positions()
+    test_first_fields_only()
+    test_quoted_comma_after_requested_fields()
+    test_unquoted_line_matches_plain_split()
+    print("Combat log field tokenizer tests passed")
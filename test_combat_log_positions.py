@@ -0,0 +1,47 @@
+"""
+Test Match Position Extraction
+
+The window reader behind extract_match_positions pads its byte range by the monotonic
+tolerance, so the lines it yields around a match include samples from just before and
+just after it. Only the samples inside the match window may be returned.
+"""
+
+from datetime import datetime
+
+from enhanced_combat_parser_production_ENHANCED import EnhancedProductionCombatParser
+
+
+PLAYER = 'Player-1-0000AAAA'
+
+
+def _cast(stamp: str, x: str) -> str:
+    # 31 fields: x/y at 26/27 and facing at 29 of the advanced-info block
+    return (f'5/6/2025 {stamp}  SPELL_CAST_SUCCESS,{PLAYER},"Melonha-Realm",0x511,0x0,'
+            f'0000000000000000,nil,0x80000000,0x80000000,686,"Shadow Bolt",0x20,'
+            f'{PLAYER},0000000000000000,100,100,0,0,0,0,0,0,0,0,0,0,{x},-2345.67,1672,1.5708,80')
+
+
+def test_samples_outside_window_are_dropped(tmp_path):
+    lines = [_cast('19:00:09.000', '1000.00'), _cast('19:00:09.999', '1000.00')]
+    lines += [_cast(f'19:00:{10 + i:02d}.000', '1234.56') for i in range(11)]
+    lines += [_cast('19:00:20.001', '3000.00'), _cast('19:00:21.000', '3000.00')]
+
+    log_file = tmp_path / 'WoWCombatLog-050625_190000.txt'
+    log_file.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    parser = EnhancedProductionCombatParser(str(tmp_path))
+    positions = parser.extract_match_positions(log_file, datetime(2025, 5, 6, 19, 0, 10),
+                                               datetime(2025, 5, 6, 19, 0, 20))
+
+    assert len(positions) == 11
+    assert set(positions.x.tolist()) == {1234.56}
+    assert positions.units == [PLAYER]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_samples_outside_window_are_dropped(Path(tmp_dir))
+    print("Match position extraction tests passed")
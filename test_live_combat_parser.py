@@ -0,0 +1,64 @@
+"""
+Test Live Combat Log Follower
+
+Replays a session log in which the logging character changes between arena matches
+(a relog) and checks that every match row is credited to the character who played it.
+"""
+
+import pandas as pd
+
+from enhanced_combat_parser_production_ENHANCED import EnhancedProductionCombatParser
+from live_combat_parser import LiveCombatLogFollower, replay_log
+
+
+FIRST = ('Player-1-0000AAAA', 'Melonha-Realm')
+SECOND = ('Player-1-0000BBBB', 'Phlargus-Realm')
+ENEMY = ('Player-1-0000CCCC', 'Enemy-Realm')
+
+
+def _cast(stamp: str, unit, flags: str, spell: str) -> str:
+    guid, name = unit
+    return (f'5/6/2025 {stamp}  SPELL_CAST_SUCCESS,{guid},"{name}",{flags},0x0,'
+            f'{ENEMY[0]},"{ENEMY[1]}",0x548,0x0,1,"{spell}",0x1')
+
+
+def _interrupt(stamp: str, unit, flags: str) -> str:
+    guid, name = unit
+    return (f'5/6/2025 {stamp}  SPELL_INTERRUPT,{guid},"{name}",{flags},0x0,'
+            f'{ENEMY[0]},"{ENEMY[1]}",0x548,0x0,2,"Kick",0x1,3,"Fireball",0x4')
+
+
+def _session_lines():
+    return [
+        '5/6/2025 19:00:00.000  COMBAT_LOG_VERSION,21,ADVANCED_LOG_ENABLED,1,BUILD_VERSION,11.1.5,PROJECT_ID,1',
+        '5/6/2025 19:00:01.000  ARENA_MATCH_START,1825,33,2v2,1',
+        _cast('19:00:02.000', FIRST, '0x511', 'Frostbolt'),
+        _cast('19:00:03.000', FIRST, '0x511', 'Frostbolt'),
+        _interrupt('19:00:04.000', FIRST, '0x511'),
+        '5/6/2025 19:00:05.000  ARENA_MATCH_END,1,4,1800,1800',
+        # Relog: the same log continues with another character
+        '5/6/2025 19:30:01.000  ARENA_MATCH_START,1825,33,2v2,1',
+        _cast('19:30:02.000', SECOND, '0x511', 'Lava Burst'),
+        _interrupt('19:30:03.000', SECOND, '0x511'),
+        _interrupt('19:30:04.000', SECOND, '0x511'),
+        _cast('19:30:05.000', FIRST, '0x548', 'Frostbolt'),
+        '5/6/2025 19:30:06.000  ARENA_MATCH_END,1,4,1800,1800',
+    ]
+
+
+def test_character_switch_mid_log(tmp_path):
+    source_log = tmp_path / 'session.txt'
+    source_log.write_text('\n'.join(_session_lines()) + '\n', encoding='utf-8')
+
+    logs_dir = tmp_path / 'Logs'
+    output_csv = tmp_path / 'live.csv'
+    replay_log(source_log, logs_dir, rate=0)
+
+    parser = EnhancedProductionCombatParser(str(tmp_path))
+    follower = LiveCombatLogFollower(parser, str(logs_dir), str(output_csv), poll_interval=0, from_start=True)
+    assert follower.run(max_idle_polls=1) == 2
+
+    rows = pd.read_csv(output_csv).sort_values('match_start_time').reset_index(drop=True)
+    assert list(rows['cast_success_own']) == [2, 1]
+    assert list(rows['interrupt_success_own']) == [1, 2]
+    assert rows.loc[1, 'spells_cast'] == 'Lava Burst'
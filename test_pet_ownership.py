@@ -0,0 +1,73 @@
+"""
+Test Pet Ownership
+
+A pet is recognised by name through the pet index once per match; its GUID is then
+cached in the match's identity table, so later events are a GUID lookup. Summoned pets
+count without an index entry, and nothing carries over into the next match.
+"""
+
+import json
+
+from enhanced_combat_parser_production_ENHANCED import EnhancedProductionCombatParser
+from feature_extractors import IDENTITY_KEY
+
+
+PLAYER = 'Player-1-0000AAAA'
+ENEMY = 'Player-2-0000CCCC'
+INDEXED_PET = 'Creature-0-1-2-3-417-0000BBBB'
+SUMMONED_PET = 'Creature-0-1-2-3-416-0000DDDD'
+
+
+def _interrupt(source_guid: str, source_name: str) -> str:
+    return (f'5/6/2025 19:01:00.000  SPELL_INTERRUPT,{source_guid},"{source_name}",0x1111,0x0,'
+            f'{ENEMY},"Kaelthas-Realm",0x548,0x0,19647,"Spell Lock",0x20,2061,"Flash Heal",2')
+
+
+def _summon(pet_guid: str, pet_name: str) -> str:
+    return (f'5/6/2025 19:00:50.000  SPELL_SUMMON,{PLAYER},"Phlargus-Eredar",0x511,0x0,'
+            f'{pet_guid},"{pet_name}",0x1111,0x0,688,"Summon Imp",0x20')
+
+
+def test_pet_guid_is_cached_per_match(tmp_path):
+    pet_index = {'player_pets': {'Phlargus': {'pet_names': ['Felhunter-1234']}}, 'pet_lookup': {}}
+    (tmp_path / 'player_pet_index.json').write_text(json.dumps(pet_index), encoding='utf-8')
+    parser = EnhancedProductionCombatParser(str(tmp_path))
+
+    name_checks = []
+    is_player_pet = parser.is_player_pet
+
+    def counting_is_player_pet(potential_pet_name, player_name):
+        name_checks.append(potential_pet_name)
+        return is_player_pet(potential_pet_name, player_name)
+
+    parser.is_player_pet = counting_is_player_pet
+
+    features = parser.new_match_features('match.mp4', '2025-05-06T19:00:00', 'Phlargus')
+    for _ in range(3):
+        parser.process_combat_event_enhanced(_interrupt(INDEXED_PET, 'Felhunter'), 'Phlargus', None, features)
+    assert features['interrupt_success_own'] == 3
+    assert name_checks == ['Felhunter']
+
+    # A summoned pet is the player's by GUID alone
+    parser.process_combat_event_enhanced(_summon(SUMMONED_PET, 'Zhaakun'), 'Phlargus', None, features)
+    parser.process_combat_event_enhanced(_interrupt(SUMMONED_PET, 'Zhaakun'), 'Phlargus', None, features)
+    assert features['interrupt_success_own'] == 4
+    assert name_checks == ['Felhunter']
+    assert features[IDENTITY_KEY].pet_guids == {INDEXED_PET, SUMMONED_PET}
+
+    # The next match starts without the previous match's pet GUIDs
+    features = parser.new_match_features('next.mp4', '2025-05-06T19:10:00', 'Phlargus')
+    parser.process_combat_event_enhanced(_interrupt(SUMMONED_PET, 'Zhaakun'), 'Phlargus', None, features)
+    parser.process_combat_event_enhanced(_interrupt(INDEXED_PET, 'Felhunter'), 'Phlargus', None, features)
+    assert features['interrupt_success_own'] == 1
+    assert name_checks.count('Felhunter') == 2
+    assert features[IDENTITY_KEY].pet_guids == {INDEXED_PET}
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_pet_guid_is_cached_per_match(Path(tmp_dir))
+    print("Pet ownership tests passed")
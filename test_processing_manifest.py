@@ -0,0 +1,84 @@
+"""
+Test Processing Manifest
+
+The manifest lets a resumed run skip finished matches. It must only be trusted for
+the output it describes, and it must record progress log by log while a reliability
+group runs, so a crash keeps the matches of the logs already finished.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+import enhanced_combat_parser_production_ENHANCED as production
+from enhanced_combat_parser_production_ENHANCED import EnhancedProductionCombatParser
+from processing_manifest import ProcessingManifest
+from synthetic_combat_log import generate_dataset
+
+
+def _run(data_dir, output_csv, extractors=None):
+    parser = EnhancedProductionCombatParser(str(data_dir), extractors=extractors)
+    try:
+        parser.parse_enhanced_matches(str(data_dir / 'master_index_enhanced.csv'), str(data_dir / 'Logs'),
+                                      str(output_csv), force_rebuild=False)
+    finally:
+        parser.close_manifest()
+    return pd.read_csv(output_csv)
+
+
+def test_deleted_output_is_rebuilt(tmp_path):
+    generate_dataset(tmp_path, size_mb=1, arenas=4)
+    output_csv = tmp_path / 'features.csv'
+
+    first = _run(tmp_path, output_csv)
+    assert len(first) == 4
+
+    # Without the manifest being cleared every match would be skipped as processed
+    os.remove(output_csv)
+    second = _run(tmp_path, output_csv)
+    assert sorted(second['filename']) == sorted(first['filename'])
+
+
+def test_finished_logs_survive_a_crash(tmp_path, monkeypatch):
+    # The high reliability group (seed 0) has one match in each log
+    generate_dataset(tmp_path, size_mb=1, arenas=6, logs=2)
+    output_csv = tmp_path / 'features.csv'
+    monkeypatch.setattr(production, 'PROCESSED_SAVE_INTERVAL', 1)
+
+    extract = EnhancedProductionCombatParser.extract_windows_single_pass
+    passes = []
+
+    def crash_on_second_log(parser, log_file, windows):
+        passes.append(log_file)
+        if len(passes) == 2:
+            raise RuntimeError("simulated crash")
+        return extract(parser, log_file, windows)
+
+    monkeypatch.setattr(EnhancedProductionCombatParser, 'extract_windows_single_pass', crash_on_second_log)
+    parser = EnhancedProductionCombatParser(str(tmp_path))
+    with pytest.raises(RuntimeError):
+        parser.parse_enhanced_matches(str(tmp_path / 'master_index_enhanced.csv'), str(tmp_path / 'Logs'),
+                                      str(output_csv), force_rebuild=False)
+
+    rows = pd.read_csv(output_csv)
+    manifest = ProcessingManifest(parser.manifest_file, parser.manifest_version)
+    assert len(rows) > 0
+    assert all(manifest.is_processed(passes[0], filename) for filename in rows['filename'])
+    manifest.close()
+
+
+def test_selective_run_without_interrupt_columns(tmp_path):
+    generate_dataset(tmp_path, size_mb=1, arenas=4)
+    output_csv = tmp_path / 'features.csv'
+
+    parser = EnhancedProductionCombatParser(str(tmp_path), extractors=['casts', 'deaths'])
+    assert parser.manifest_version != EnhancedProductionCombatParser(str(tmp_path)).manifest_version
+    _run(tmp_path, output_csv, extractors=['casts', 'deaths'])
+
+    # Phase 1 must not read interrupt or purge columns the output does not have
+    parser.parse_enhanced_matches_selective(str(tmp_path / 'master_index_enhanced.csv'), str(tmp_path / 'Logs'),
+                                            str(output_csv))
+    rows = pd.read_csv(output_csv)
+    assert 'interrupt_success_own' not in rows.columns
+    assert len(rows) == 4
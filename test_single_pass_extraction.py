@@ -0,0 +1,52 @@
+"""
+Test Single-Pass Extraction
+
+extract_windows_single_pass feeds every match window of a log from one read. Each
+match's features must be exactly what a pass over that window alone produces.
+"""
+
+import pandas as pd
+
+from combat_log_io import find_combat_logs
+from enhanced_combat_parser_production_ENHANCED import EnhancedProductionCombatParser
+from synthetic_combat_log import generate_dataset
+
+
+def _windows(parser, data_dir):
+    index_df = parser._clean_timestamps_in_df(pd.read_csv(data_dir / 'master_index_enhanced.csv'))
+    log_files = find_combat_logs(data_dir / 'Logs')
+    windows = []
+    for _, match in index_df.iterrows():
+        log_file = parser.find_combat_log_for_match(match, log_files)
+        windows.append((log_file, parser.prepare_match_window(match, log_file, 30)))
+    return windows
+
+
+def test_single_pass_matches_per_window_passes(tmp_path):
+    generate_dataset(tmp_path, size_mb=1, arenas=6, logs=2)
+    parser = EnhancedProductionCombatParser(str(tmp_path))
+
+    together = _windows(parser, tmp_path)
+    for log_file in {log_file for log_file, _ in together}:
+        assert parser.extract_windows_single_pass(log_file, [w for f, w in together if f == log_file])
+
+    alone = _windows(parser, tmp_path)
+    for log_file, window in alone:
+        assert parser.extract_windows_single_pass(log_file, [window])
+
+    def row(window):
+        return {column: window['features'][column] for column in parser.feature_columns}
+
+    assert len(together) == 6
+    for (_, joint), (_, single) in zip(together, alone):
+        assert row(joint) == row(single)
+        assert row(joint)['cast_success_own'] > 0
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_single_pass_matches_per_window_passes(Path(tmp_dir))
+    print("Single-pass extraction tests passed")